@@ -0,0 +1,18 @@
+"""
+Benchmarks of the Phonebook.
+
+    * suite:
+        - hot paths at several phonebook sizes, JSON results
+        and comparison with a saved baseline;
+    * generator:
+        - deterministic synthetic phonebooks for benchmarks;
+    * bench_* modules:
+        - micro-benchmarks of single components,
+        checked against reference implementations;
+    * check_startup:
+        - import time budget of the entry points and `main.py` keys,
+        optionally compared with a saved baseline.
+
+Run as modules from the project directory:
+    $ python -m benchmarks.suite --sizes 1000 10000 --output results.json
+"""
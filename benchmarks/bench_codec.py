@@ -0,0 +1,117 @@
+"""
+Benchmark of the binary record format against pickles.
+
+Encodes random contacts as pickled Contact models (format of
+earlier versions), pickled record tuples and binary records,
+then reports the decode throughput of every format, the average
+value size and the size of a dbm file with all the values.
+Every binary record is checked to decode to the record it was
+encoded from.
+
+Usage:
+    $ python -m benchmarks.bench_codec [--records N]
+"""
+import argparse
+import dbm.dumb
+import os
+import pickle
+import random
+import sys
+import tempfile
+import time
+
+from phonebook import codec
+from phonebook.models import FIELDS, Contact, ContactRecord
+
+
+ALPHABET: str = 'abcdefghijklmnopqrstuvwxyzАБВГДЕЖЗабвгдежз +-()0123456789'
+
+
+def random_contact(rnd: random.Random, number: int) -> Contact:
+    """Return contact with random values, some fields left unset."""
+    contact: Contact = Contact(
+        **{
+            field: (
+                None if rnd.random() < 0.1
+                else ''.join(rnd.choices(ALPHABET, k=rnd.randint(0, 16)))
+            )
+            for field in FIELDS
+            if rnd.random() < 0.8
+        }
+    )
+    contact._id = f'contact-{number}'
+    return contact
+
+
+def dbm_size(values: list[bytes]) -> int:
+    """Return size in bytes of dbm files with the values."""
+    with tempfile.TemporaryDirectory() as directory:
+        filename: str = os.path.join(directory, 'contacts')
+        with dbm.dumb.open(filename, 'c') as db:
+            for i, value in enumerate(values):
+                db[str(i)] = value
+
+        return sum(
+            os.path.getsize(os.path.join(directory, name))
+            for name in os.listdir(directory)
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--records', type=int, default=100000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rnd = random.Random(args.seed)
+    contacts: list[Contact] = [
+        random_contact(rnd, i) for i in range(args.records)
+    ]
+    records: list[ContactRecord] = [
+        ContactRecord.from_contact(contact) for contact in contacts
+    ]
+
+    formats: dict = {
+        'pickled Contact': (
+            [pickle.dumps(contact) for contact in contacts],
+            pickle.loads,
+        ),
+        'pickled tuple': (
+            [pickle.dumps(record.astuple()) for record in records],
+            lambda value: ContactRecord.from_tuple(pickle.loads(value)),
+        ),
+        f'binary v{codec.VERSION}': (
+            [codec.encode(record) for record in records],
+            codec.decode,
+        ),
+    }
+
+    print(f'{args.records} contacts')
+    print(
+        f'{"format":<16} {"decode, rec/s":>14} '
+        f'{"value, B":>9} {"dbm file, MB":>13}'
+    )
+    for name, (values, decode) in formats.items():
+        started: float = time.perf_counter()
+        for value in values:
+            decode(value)
+        elapsed: float = time.perf_counter() - started
+
+        print(
+            f'{name:<16} {len(values) / elapsed:>14,.0f} '
+            f'{sum(map(len, values)) / len(values):>9.1f} '
+            f'{dbm_size(values) / 2**20:>13.1f}'
+        )
+
+    mismatches: int = sum(
+        decoded.astuple() != record.astuple()
+        for record, decoded in zip(
+            records, map(codec.decode, map(codec.encode, records))
+        )
+    )
+    print(f'round trip check: {mismatches} mismatches')
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == '__main__':
+    main()
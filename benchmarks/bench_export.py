@@ -0,0 +1,104 @@
+"""
+Benchmark of the streaming export.
+
+Uploads synthetic phonebooks (see `benchmarks.generator`)
+of every size into a temporary `PHONEBOOK_HOME` and exports
+them in every format, plain and gzip-compressed, and with a query.
+
+Reports the export time and the peak memory allocated
+during the export. Peak memory must not grow with the size
+of the phonebook. Checks that every export has all contacts.
+
+Usage:
+    $ python -m benchmarks.bench_export [--sizes N [N ...]]
+"""
+import argparse
+import gzip
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from benchmarks.generator import iter_rows
+
+
+def count_contacts(filename: Path, file_format: str) -> int:
+    """Return the number of contacts in the export file."""
+    opener = gzip.open if filename.suffix == '.gz' else open
+    with opener(filename, 'rt', encoding='utf-8', newline='') as file:
+        if file_format == 'vcf':
+            return sum(line == 'BEGIN:VCARD\r\n' for line in file)
+        return sum(1 for _ in file) - (file_format == 'csv')
+
+
+def bench(size: int, seed: int) -> int:
+    """Print export times and memory, return the number of mismatches."""
+    from phonebook.config import files_init
+    from phonebook.constants import BASE_DIR, CONTACTS_DIR, DB_DIR
+    from phonebook.constants import EXPORT_FORMATS
+    from phonebook.storages import PhoneBook
+
+    for path in (CONTACTS_DIR, DB_DIR):
+        shutil.rmtree(path, ignore_errors=True)
+    files_init()
+    PhoneBook._cache.clear()
+    PhoneBook().bulk_save(iter_rows(size, seed=seed))
+    total: int = PhoneBook().count()
+
+    mismatches: int = 0
+    for file_format in EXPORT_FORMATS:
+        for suffix in ('', '.gz'):
+            filename: Path = BASE_DIR / f'export.{file_format}{suffix}'
+            tracemalloc.start()
+            started: float = time.perf_counter()
+            exported: int = PhoneBook().export_to(filename)
+            elapsed: float = time.perf_counter() - started
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            mismatches += exported != total
+            mismatches += count_contacts(filename, file_format) != total
+            print(
+                f'{size:>8} {file_format + suffix:<10} {elapsed:>9.2f} '
+                f'{filename.stat().st_size / 2 ** 20:>8.1f} '
+                f'{peak / 2 ** 20:>8.1f}'
+            )
+            os.remove(filename)
+
+    filename = BASE_DIR / 'query.csv'
+    started = time.perf_counter()
+    found: int = PhoneBook().export_to(filename, pattern='acme')
+    elapsed = time.perf_counter() - started
+    mismatches += count_contacts(filename, 'csv') != found
+    print(f'{size:>8} {"query":<10} {elapsed:>9.2f} {found:>8} contacts')
+
+    return mismatches
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument(
+        '--sizes', type=int, nargs='+', default=[10000, 100000]
+    )
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    mismatches: int = 0
+    with tempfile.TemporaryDirectory() as home:
+        os.environ['PHONEBOOK_HOME'] = home
+        print(
+            f'{"size":>8} {"format":<10} {"time, s":>9} '
+            f'{"file, MB":>8} {"peak, MB":>8}'
+        )
+        for size in args.sizes:
+            mismatches += bench(size, args.seed)
+
+    print(f'export check: {mismatches} mismatches')
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,128 @@
+"""
+Benchmark of typo-tolerant search over the name vocabulary.
+
+For every vocabulary size builds a BK-tree of random surnames,
+checks its results against a brute-force scan of the vocabulary
+and reports the query latency of both and the share of the
+vocabulary the BK-tree compares the query with.
+
+Usage:
+    $ python -m benchmarks.bench_fuzzy [--sizes N [N ...]] [--distance K]
+"""
+import argparse
+import random
+import sys
+import time
+
+from phonebook import indexes
+from phonebook.indexes import BKTree
+
+
+SYLLABLES: tuple = (
+    'iv', 'an', 'ov', 'pe', 'tr', 'sm', 'it', 'ku', 'zn', 'ets',
+    'si', 'do', 'ro', 'va', 'ol', 'ga', 'mi', 'kh', 'ai', 'lo',
+)
+
+
+def random_word(rnd: random.Random) -> str:
+    """Return random surname-like word."""
+    return ''.join(rnd.choices(SYLLABLES, k=rnd.randint(2, 5)))
+
+
+def misspell(rnd: random.Random, word: str) -> str:
+    """Return word with one random typo."""
+    i: int = rnd.randrange(len(word))
+    typo: str = rnd.choice('abcdefghijklmnopqrstuvwxyz')
+    return rnd.choice(
+        (
+            word[:i] + word[i + 1:],
+            word[:i] + typo + word[i + 1:],
+            word[:i] + typo + word[i:],
+        )
+    )
+
+
+def brute_force(
+    vocabulary: list[str],
+    word: str,
+    max_distance: int
+) -> list[tuple[int, str]]:
+    """Compare the query with every word of the vocabulary."""
+    return sorted(
+        (distance, token) for token in vocabulary
+        if (distance := indexes.levenshtein(word, token)) <= max_distance
+    )
+
+
+def bench(size: int, queries: int, max_distance: int, seed: int) -> dict:
+    """Return latency report for one vocabulary size."""
+    rnd = random.Random(seed)
+    vocabulary: list[str] = sorted({random_word(rnd) for _ in range(size)})
+    tree = BKTree(vocabulary)
+    words: list[str] = [
+        misspell(rnd, rnd.choice(vocabulary)) for _ in range(queries)
+    ]
+
+    calls: int = 0
+    levenshtein = indexes.levenshtein
+
+    def counting(first: str, second: str) -> int:
+        nonlocal calls
+        calls += 1
+        return levenshtein(first, second)
+
+    indexes.levenshtein = counting
+    try:
+        started: float = time.perf_counter()
+        results: list = [tree.search(word, max_distance) for word in words]
+        tree_time: float = time.perf_counter() - started
+    finally:
+        indexes.levenshtein = levenshtein
+
+    brute_queries: list[str] = words[:max(1, queries // 10)]
+    started = time.perf_counter()
+    expected: list = [
+        brute_force(vocabulary, word, max_distance) for word in brute_queries
+    ]
+    brute_time: float = time.perf_counter() - started
+
+    return {
+        'vocabulary': len(vocabulary),
+        'bktree_ms': tree_time / len(words) * 1e3,
+        'brute_force_ms': brute_time / len(brute_queries) * 1e3,
+        'compared': calls / len(words) / len(vocabulary),
+        'mismatches': sum(
+            got != want for got, want in zip(results, expected)
+        ),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument(
+        '--sizes', type=int, nargs='+', default=[1000, 10000, 100000]
+    )
+    parser.add_argument('--distance', type=int, default=2)
+    parser.add_argument('--queries', type=int, default=100)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    print(
+        f'{"vocabulary":>10} {"bk-tree, ms":>12} '
+        f'{"scan, ms":>10} {"compared":>9} {"mismatches":>10}'
+    )
+    mismatches: int = 0
+    for size in args.sizes:
+        report: dict = bench(size, args.queries, args.distance, args.seed)
+        mismatches += report['mismatches']
+        print(
+            f'{report["vocabulary"]:>10} {report["bktree_ms"]:>12.3f} '
+            f'{report["brute_force_ms"]:>10.3f} {report["compared"]:>9.1%} '
+            f'{report["mismatches"]:>10}'
+        )
+
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == '__main__':
+    main()
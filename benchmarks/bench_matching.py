@@ -0,0 +1,140 @@
+"""
+Micro-benchmark of contact substring matching.
+
+Checks the matcher against a brute-force oracle on random records
+and queries, then reports the per-record cost of the matcher
+and of the legacy sorted binary search.
+
+Usage:
+    $ python -m benchmarks.bench_matching [--records N] [--queries N]
+"""
+import argparse
+import random
+import string
+import sys
+import timeit
+
+from phonebook.matching import Matcher, record_text
+from phonebook.models import Contact
+
+
+ALPHABET: str = string.ascii_letters + 'АБВГДЕЖЗабвгдежзßẞ' + ' -+()'
+
+
+def random_contact(rnd: random.Random) -> Contact:
+    """Return contact with random values, some fields left empty."""
+    return Contact(
+        **{
+            field: ''.join(rnd.choices(ALPHABET, k=rnd.randint(1, 12)))
+            for field in Contact.model_fields
+            if rnd.random() < 0.8
+        }
+    )
+
+
+def random_query(rnd: random.Random, contacts: list[Contact]) -> str:
+    """Return a substring of a random field or random text."""
+    values: list[str] = [
+        value for value in rnd.choice(contacts).model_dump().values()
+        if value
+    ]
+    if not values or rnd.random() < 0.3:
+        return ''.join(rnd.choices(ALPHABET, k=rnd.randint(1, 3)))
+
+    value: str = rnd.choice(values)
+    begin: int = rnd.randrange(len(value))
+    query: str = value[begin:rnd.randint(begin + 1, len(value))]
+    return query.swapcase() if rnd.random() < 0.5 else query
+
+
+def oracle(contact: Contact, query: str) -> bool:
+    """Brute-force check: any field contains the query ignoring case."""
+    return any(
+        query.casefold() in value.casefold()
+        for value in contact.model_dump().values()
+        if value
+    )
+
+
+def legacy_contains(elements: list[str], target: str) -> bool:
+    """Sorted binary search used by the former `utils.contains`."""
+    elements = sorted(element for element in elements if element)
+    left, right = 0, len(elements) - 1
+    while left <= right:
+        middle: int = (left + right) // 2
+        element: str = elements[middle].lower()
+        if target in element:
+            return True
+        if target > element:
+            left = middle + 1
+        else:
+            right = middle - 1
+    return False
+
+
+def check(contacts: list[Contact], queries: list[str]) -> int:
+    """Compare matcher with oracle, return the number of mismatches."""
+    texts: list[str] = [record_text(contact) for contact in contacts]
+    mismatches: int = 0
+    for query in queries:
+        matcher: Matcher = Matcher(query)
+        for contact, text in zip(contacts, texts):
+            if matcher(text) != oracle(contact, query):
+                mismatches += 1
+    return mismatches
+
+
+def bench(contacts: list[Contact], queries: list[str]) -> dict[str, float]:
+    """Return nanoseconds per record of every matching approach."""
+    texts: list[str] = [record_text(contact) for contact in contacts]
+    values: list[list[str]] = [
+        [*contact.model_dump().values()] for contact in contacts
+    ]
+    matchers: list[Matcher] = [Matcher(query) for query in queries]
+    calls: int = len(contacts) * len(queries)
+
+    cases: dict = {
+        'matcher (precompiled text)': lambda: [
+            matcher(text) for matcher in matchers for text in texts
+        ],
+        'matcher (text per call)': lambda: [
+            matcher.match(contact)
+            for matcher in matchers for contact in contacts
+        ],
+        'legacy contains': lambda: [
+            legacy_contains(record, query)
+            for query in queries for record in values
+        ],
+    }
+    return {
+        name: min(timeit.repeat(case, number=1, repeat=3)) / calls * 1e9
+        for name, case in cases.items()
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--records', type=int, default=2000)
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rnd = random.Random(args.seed)
+    contacts: list[Contact] = [
+        random_contact(rnd) for _ in range(args.records)
+    ]
+    queries: list[str] = [
+        random_query(rnd, contacts) for _ in range(args.queries)
+    ]
+
+    mismatches: int = check(contacts, queries)
+    print(f'oracle check: {mismatches} mismatches')
+
+    for name, cost in bench(contacts, queries).items():
+        print(f'{name:<28} {cost:8.1f} ns/record')
+
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == '__main__':
+    main()
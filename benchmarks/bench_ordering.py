@@ -0,0 +1,188 @@
+"""
+Benchmark of the contact list ordered by name.
+
+For every collection size compares the plain list the handlers
+used before (`append` to insert, a filtered copy of the list
+to remove, a slice for a page) with the collation table
+of the search index (see `indexes.ContactIndex`):
+    * insert, remove:
+        - a row of the collation table, one B-tree update each;
+    * page:
+        - the next page after a key from the middle of the list,
+        as the menu reads it (`ContactIndex.after`);
+    * offset page:
+        - the same page by position (`ContactIndex.collation_page`),
+        its cost grows with the position.
+
+Only the collation table is filled, so building an index
+of a million contacts takes seconds. Checks the pages
+of the index against a sorted copy of the keys.
+
+Usage:
+    $ python -m benchmarks.bench_ordering [--sizes N [N ...]] [--ops N]
+"""
+import argparse
+import gc
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from phonebook.constants import PAGE_SIZE
+from phonebook.indexes import ContactIndex
+from phonebook.models import Contact
+from phonebook.ordering import collation_key
+
+
+NAMES: tuple = (
+    'Ivan', 'Petr', 'Anna', 'Olga', 'Sergey', 'Maria', 'Alexey', 'Elena',
+)
+SURNAMES: tuple = (
+    'Ivanov', 'Petrov', 'Smirnov', 'Kuznetsov', 'Popov', 'Sokolov',
+    'Lebedev', 'Kozlov', 'Novikov', 'Morozov',
+)
+
+
+def random_contact(rnd: random.Random, number: int) -> Contact:
+    """Return contact with random name and unique ID."""
+    contact: Contact = Contact.model_construct(
+        first_name=rnd.choice(NAMES),
+        last_name=f'{rnd.choice(SURNAMES)}{rnd.randrange(1000)}',
+        company=f'Company {rnd.randrange(100)}',
+    )
+    contact._id = f'{number:08x}'
+    return contact
+
+
+def remove_item(items: list, value: Contact) -> list:
+    """Removal used by the handlers before the ordered list."""
+    return [item for item in items if item is not value]
+
+
+def timed(func, repeat: int) -> float:
+    """Return microseconds per call, garbage collector disabled."""
+    gc.disable()
+    try:
+        started: float = time.perf_counter()
+        for _ in range(repeat):
+            func()
+        return (time.perf_counter() - started) / repeat * 1e6
+    finally:
+        gc.enable()
+
+
+def bench(size: int, ops: int, seed: int, directory: str) -> dict:
+    """Return timings report for one collection size."""
+    rnd = random.Random(seed)
+    contacts: list[Contact] = [random_contact(rnd, i) for i in range(size)]
+    extra: list[Contact] = [
+        random_contact(rnd, size + i) for i in range(ops)
+    ]
+    middle: int = size // 2
+
+    plain: list[Contact] = list(contacts)
+    list_ops: int = max(1, min(ops, 10_000_000 // size))
+    inserts = iter(extra)
+    removes = iter(extra)
+
+    def list_remove() -> None:
+        nonlocal plain
+        plain = remove_item(plain, next(removes))
+
+    report: dict = {
+        'size': size,
+        'list_insert_us': timed(lambda: plain.append(next(inserts)), ops),
+        'list_remove_us': timed(list_remove, list_ops),
+        'list_page_us': timed(
+            lambda: plain[middle:middle + PAGE_SIZE], ops
+        ),
+    }
+
+    keys: list[tuple[str, ...]] = sorted(map(collation_key, contacts))
+    index: ContactIndex = ContactIndex(Path(directory) / f'{size}.sqlite3')
+    with index:
+        started: float = time.perf_counter()
+        index._db.executemany(
+            'INSERT INTO collation VALUES (?, ?, ?, ?)', keys
+        )
+        index.commit()
+        report['build_ms'] = (time.perf_counter() - started) * 1e3
+
+        inserts = iter(map(collation_key, extra))
+        removes = iter(contact._id for contact in extra)
+        report.update(
+            {
+                'insert_us': timed(
+                    lambda: index._db.execute(
+                        'INSERT INTO collation VALUES (?, ?, ?, ?)',
+                        next(inserts)
+                    ),
+                    ops
+                ),
+                'remove_us': timed(
+                    lambda: index._db.execute(
+                        'DELETE FROM collation WHERE contact_id = ?',
+                        (next(removes),)
+                    ),
+                    ops
+                ),
+                'page_us': timed(
+                    lambda: index.after(keys[middle - 1], PAGE_SIZE), ops
+                ),
+                'offset_us': timed(
+                    lambda: index.collation_page(middle, PAGE_SIZE), ops
+                ),
+            }
+        )
+
+        expected: list[tuple] = keys[middle:middle + PAGE_SIZE]
+        report['mismatches'] = sum((
+            index.after(keys[middle - 1], PAGE_SIZE) != expected,
+            index.before(keys[middle + PAGE_SIZE], PAGE_SIZE) != expected,
+            index.collation_page(middle, PAGE_SIZE) != expected,
+        ))
+
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument(
+        '--sizes', type=int, nargs='+', default=[10000, 100000, 1000000]
+    )
+    parser.add_argument('--ops', type=int, default=1000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    print(
+        f'{"size":>8} {"build, ms":>10} '
+        f'{"insert, us":>16} {"remove, us":>18} {"page, us":>14} '
+        f'{"offset, us":>10} {"mismatches":>10}'
+    )
+    print(
+        f'{"":>8} {"":>10} {"list / index":>16} '
+        f'{"list / index":>18} {"list / index":>14}'
+    )
+    mismatches: int = 0
+    with tempfile.TemporaryDirectory() as directory:
+        for size in args.sizes:
+            report: dict = bench(size, args.ops, args.seed, directory)
+            mismatches += report['mismatches']
+            print(
+                f'{report["size"]:>8} {report["build_ms"]:>10.1f} '
+                f'{report["list_insert_us"]:>7.2f} / '
+                f'{report["insert_us"]:<6.2f} '
+                f'{report["list_remove_us"]:>9.1f} / '
+                f'{report["remove_us"]:<6.2f} '
+                f'{report["list_page_us"]:>5.2f} / '
+                f'{report["page_us"]:<6.2f} '
+                f'{report["offset_us"]:>10.1f} '
+                f'{report["mismatches"]:>10}'
+            )
+
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,115 @@
+"""
+Benchmark of loading contacts as models and as records.
+
+Pickles random contacts the way the shelve storage keeps them:
+Contact models, as stored by earlier versions, and record tuples.
+Then loads them back as Contact models and as ContactRecord
+objects and reports the load time and the memory held by
+the loaded contacts. Every record is checked to convert
+to the same Contact model it was made from.
+
+Usage:
+    $ python -m benchmarks.bench_records [--records N]
+"""
+import argparse
+import gc
+import pickle
+import random
+import string
+import sys
+import time
+import tracemalloc
+
+from phonebook.models import FIELDS, Contact, ContactRecord
+
+
+ALPHABET: str = string.ascii_letters + string.digits
+
+
+def random_contact(rnd: random.Random, number: int) -> Contact:
+    """Return contact with random values, some fields left unset."""
+    contact: Contact = Contact(
+        **{
+            field: ''.join(rnd.choices(ALPHABET, k=rnd.randint(4, 12)))
+            for field in FIELDS
+            if rnd.random() < 0.8
+        }
+    )
+    contact._id = str(number)
+    return contact
+
+
+def measure(load, blobs: list[bytes]) -> tuple[float, float]:
+    """
+    Return seconds to load the contacts and megabytes they hold.
+    Memory is traced in a separate pass, tracing slows loading down.
+    """
+    gc.collect()
+    started: float = time.perf_counter()
+    contacts: list = [load(blob) for blob in blobs]
+    elapsed: float = time.perf_counter() - started
+    del contacts
+
+    gc.collect()
+    tracemalloc.start()
+    contacts = [load(blob) for blob in blobs]
+    held, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del contacts
+    return elapsed, held / 2**20
+
+
+def is_lossless(record: ContactRecord, contact: Contact) -> bool:
+    """Checking that record converts back to the same model."""
+    converted: Contact = record.to_contact()
+    return (
+        converted._id == contact._id
+        and converted.model_dump() == contact.model_dump()
+        and converted.model_fields_set == contact.model_fields_set
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--records', type=int, default=1000000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rnd = random.Random(args.seed)
+    sample: list[Contact] = [random_contact(rnd, i) for i in range(1000)]
+    model_blobs: list[bytes] = [
+        pickle.dumps(sample[i % len(sample)]) for i in range(args.records)
+    ]
+    record_blobs: list[bytes] = [
+        pickle.dumps(ContactRecord.from_contact(contact).astuple())
+        for contact in sample
+    ] * (args.records // len(sample) + 1)
+    del record_blobs[args.records:]
+
+    print(f'{args.records} contacts')
+    print(f'{"representation":<16} {"load, s":>8} {"memory, MB":>11}')
+
+    cases: dict = {
+        'Contact model': pickle.loads,
+        'ContactRecord': lambda blob: ContactRecord.from_tuple(
+            pickle.loads(blob)
+        ),
+    }
+    blobs: dict = {
+        'Contact model': model_blobs,
+        'ContactRecord': record_blobs,
+    }
+    for name, load in cases.items():
+        elapsed, held = measure(load, blobs[name])
+        print(f'{name:<16} {elapsed:>8.2f} {held:>11.1f}')
+
+    mismatches: int = sum(
+        not is_lossless(ContactRecord.from_contact(contact), contact)
+        for contact in sample
+    )
+    print(f'lossless check: {mismatches} mismatches')
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,279 @@
+"""
+Benchmark of screen rendering.
+
+Renders the application screens with synthetic contacts
+(see `benchmarks.generator`) to a pseudo-terminal:
+    * legacy:
+        - `clear` subprocess and a print per written line,
+        as in earlier versions;
+    * buffered:
+        - frame composed in a buffer and drawn by `ConsoleIO.flush`
+        in a single write, only changed rows are rewritten.
+
+Screens follow a session: paging through the contact list,
+contact detail, contact edit, a report after a save and
+a redraw of an unchanged list.
+
+Reports the latency and the output size per rendered screen.
+Checks with a minimal terminal emulator that every buffered
+frame leaves the same screen as a full redraw.
+
+Usage:
+    $ python -m benchmarks.bench_render [--rounds N] [--size COLSxROWS]
+"""
+import argparse
+import fcntl
+import os
+import pty
+import re
+import struct
+import sys
+import termios
+import threading
+import time
+
+from benchmarks.generator import iter_rows
+
+
+ESCAPE = re.compile(r'\x1b\[([\d;]*)([A-Za-z])')
+
+PROMPT: str = (
+    'Select action or type h (or help) to display available commands: '
+)
+
+
+class Terminal:
+    """
+    Minimal terminal emulator: printable chars, line feeds,
+    cursor position, erase in line and erase in display.
+    Colors are ignored.
+    """
+
+    def __init__(self, columns: int, lines: int) -> None:
+        self.columns = columns
+        self.lines = lines
+        self.cells: list[list[str]] = [[' '] * columns for _ in range(lines)]
+        self.row: int = 0
+        self.column: int = 0
+
+    def feed(self, output: str) -> None:
+        """Apply output written to the terminal."""
+        pos: int = 0
+        for match in ESCAPE.finditer(output):
+            self._text(output[pos:match.start()])
+            self._escape(match.group(1), match.group(2))
+            pos = match.end()
+        self._text(output[pos:])
+
+    def screen(self) -> list[str]:
+        """Return rows of the screen without trailing spaces."""
+        return [''.join(cells).rstrip() for cells in self.cells]
+
+    def _text(self, text: str) -> None:
+        for char in text:
+            if char == '\n':
+                self._line_feed()
+                self.column = 0
+            elif char == '\r':
+                self.column = 0
+            else:
+                if self.column == self.columns:
+                    self._line_feed()
+                    self.column = 0
+                self.cells[self.row][self.column] = char
+                self.column += 1
+
+    def _line_feed(self) -> None:
+        if self.row == self.lines - 1:
+            self.cells = [*self.cells[1:], [' '] * self.columns]
+        else:
+            self.row += 1
+
+    def _escape(self, params: str, command: str) -> None:
+        if command == 'H':
+            row, column = (
+                *(int(param) for param in params.split(';') if param), 1, 1
+            )[:2]
+            self.row, self.column = row - 1, column - 1
+        elif command == 'K':
+            row: list[str] = self.cells[self.row]
+            row[self.column:] = [' '] * (self.columns - self.column)
+        elif command == 'J':
+            if params == '2':
+                self.cells = [[' '] * self.columns for _ in self.cells]
+                return
+            self._escape('', 'K')
+            for row in range(self.row + 1, self.lines):
+                self.cells[row] = [' '] * self.columns
+
+
+def session_screens(contacts: list) -> list[tuple[str, object, dict]]:
+    """Return kind, handler and render data of every screen."""
+    from phonebook.constants import PAGE_SIZE
+    from phonebook.handlers import contact_detail, edit_contact, main_menu
+    from phonebook.messages import ReportState
+
+    total_pages: int = -(-len(contacts) // PAGE_SIZE)
+    pages: list[dict] = [
+        {
+            'page': page,
+            'total_pages': total_pages,
+            'contacts': contacts[(page - 1) * PAGE_SIZE:page * PAGE_SIZE],
+            'pending': page % 2,
+        }
+        for page in range(1, total_pages + 1)
+    ]
+    screens: list = [('page', main_menu, data) for data in pages]
+    screens += [
+        ('same', main_menu, pages[-1]),
+        ('detail', contact_detail, {'contact': contacts[0]}),
+        ('edit', edit_contact, {'contact': contacts[0]}),
+        ('report', main_menu, {**pages[0], 'state': ReportState.ACCEPT}),
+    ]
+    return screens
+
+
+def render_screen(handler, data: dict) -> None:
+    """Render the screen as handlers do, with the report under it."""
+    from phonebook.managers import render
+    from phonebook.messages import print_report
+
+    render(handler, data)
+    if 'state' in data:
+        print_report(data['state'])
+
+
+def check_frames(screens: list, columns: int, lines: int) -> int:
+    """
+    Draw the screens twice, as diffs and as full redraws,
+    and return the number of screens that differ.
+    Prompt and input of the previous screen are under every frame.
+    """
+    from phonebook.ioworkers import Screen, console
+
+    mismatches: int = 0
+    size: os.terminal_size = os.terminal_size((columns, lines))
+    screen: Screen = Screen()
+    terminal: Terminal = Terminal(columns, lines)
+    for _ in range(2):
+        for _, handler, data in screens:
+            console.clear()
+            render_screen(handler, data)
+            text: str = ''.join(console._frame)
+            console._frame = None
+
+            terminal.feed(screen.draw(text, size))
+            expected: Terminal = Terminal(columns, lines)
+            expected.feed(text)
+            mismatches += terminal.screen() != expected.screen()
+
+            terminal.feed(PROMPT + 'n\n')
+            screen.below += 1
+
+    return mismatches
+
+
+def bench(screens: list, rounds: int, columns: int, lines: int) -> None:
+    """Print latency and output size per screen of both renderers."""
+    from phonebook.ioworkers import console
+
+    master, slave = pty.openpty()
+    fcntl.ioctl(
+        slave, termios.TIOCSWINSZ, struct.pack('HHHH', lines, columns, 0, 0)
+    )
+    received: list[int] = [0]
+
+    def drain() -> None:
+        while True:
+            try:
+                received[0] += len(os.read(master, 65536))
+            except OSError:
+                return
+
+    reader = threading.Thread(target=drain, daemon=True)
+    reader.start()
+
+    results: list[tuple] = []
+    stdout: int = os.dup(1)
+    sys.stdout.flush()
+    os.dup2(slave, 1)
+    try:
+        for case in ('legacy', 'buffered'):
+            timings: dict[str, list[float]] = {}
+            time.sleep(0.1)
+            received_before: int = received[0]
+            for _ in range(rounds):
+                for kind, handler, data in screens:
+                    started: float = time.perf_counter()
+                    if case == 'legacy':
+                        os.system('clear')
+                        render_screen(handler, data)
+                        sys.stdout.flush()
+                    else:
+                        console.clear()
+                        render_screen(handler, data)
+                        console.flush()
+                    elapsed: float = time.perf_counter() - started
+                    timings.setdefault(kind, []).append(elapsed)
+
+                    sys.stdout.write(PROMPT + 'n\r\n')
+                    sys.stdout.flush()
+                    console.screen.below += 1
+
+            time.sleep(0.1)
+            received_bytes: int = received[0] - received_before
+            results.append((case, timings, received_bytes))
+    finally:
+        sys.stdout.flush()
+        os.dup2(stdout, 1)
+        os.close(stdout)
+        os.close(slave)
+        reader.join(1)
+        os.close(master)
+
+    screens_drawn: int = rounds * len(screens)
+    print(f'{len(screens)} screens, {rounds} rounds, {columns}x{lines}')
+    print(
+        f'{"case":<10} {"screen":<8} {"ms/screen":>10} '
+        f'{"max, ms":>8} {"bytes/screen":>13}'
+    )
+    for case, timings, received_bytes in results:
+        total: float = 0.0
+        for kind, latencies in timings.items():
+            total += sum(latencies)
+            print(
+                f'{case:<10} {kind:<8} '
+                f'{sum(latencies) / len(latencies) * 1e3:>10.2f} '
+                f'{max(latencies) * 1e3:>8.2f}'
+            )
+        print(
+            f'{case:<10} {"all":<8} {total / screens_drawn * 1e3:>10.2f} '
+            f'{"":>8} {received_bytes / screens_drawn:>13.0f}'
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--rounds', type=int, default=20)
+    parser.add_argument('--size', default='80x30')
+    parser.add_argument('--contacts', type=int, default=60)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    from phonebook.models import Contact
+
+    os.environ.setdefault('TERM', 'xterm')
+    columns, lines = map(int, args.size.split('x'))
+    contacts: list = [
+        Contact(**row) for row in iter_rows(args.contacts, seed=args.seed)
+    ]
+    screens: list = session_screens(contacts)
+
+    bench(screens, args.rounds, columns, lines)
+    mismatches: int = check_frames(screens, columns, lines)
+    print(f'screen check: {mismatches} mismatches')
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == '__main__':
+    main()
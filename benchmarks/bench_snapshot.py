@@ -0,0 +1,128 @@
+"""
+Benchmark of the memory-mapped snapshot.
+
+Writes random contact records to a snapshot file, then compares
+startup (number of contacts and the first page sorted by name)
+and substring search of the snapshot with decoding every record
+from the binary format the shelve storage keeps them in.
+Every page and every search result of the snapshot is checked
+against a sorted copy of the records and a linear scan.
+
+Usage:
+    $ python -m benchmarks.bench_snapshot [--records N]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+from phonebook import codec
+from phonebook.constants import PAGE_SIZE
+from phonebook.matching import Matcher
+from phonebook.models import FIELDS, ContactRecord
+from phonebook.ordering import collation_key
+from phonebook.snapshot import Snapshot
+
+
+ALPHABET: str = 'abcdefghijklmnopqrstuvwxyzАБВГДЕЖЗабвгдежз +-()0123456789'
+
+PATTERNS: tuple = ('ab', 'ива', '12', 'zzz', 'д', '(9')
+
+
+def random_record(rnd: random.Random, number: int) -> ContactRecord:
+    """Return record with random values, some fields missing."""
+    return ContactRecord(
+        f'contact-{number}',
+        [
+            ''.join(rnd.choices(ALPHABET, k=rnd.randint(1, 16)))
+            if rnd.random() < 0.8 else None
+            for _ in FIELDS
+        ]
+    )
+
+
+def timed(func) -> tuple[float, object]:
+    """Return milliseconds of the call and its result."""
+    started: float = time.perf_counter()
+    result = func()
+    return (time.perf_counter() - started) * 1e3, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--records', type=int, default=100000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rnd = random.Random(args.seed)
+    records: list[ContactRecord] = [
+        random_record(rnd, i) for i in range(args.records)
+    ]
+    values: list[bytes] = [codec.encode(record) for record in records]
+    expected: list[tuple] = [
+        record.astuple() for record in sorted(records, key=collation_key)
+    ]
+
+    with tempfile.TemporaryDirectory() as directory:
+        snapshot: Snapshot = Snapshot(os.path.join(directory, 'snap.bin'))
+        write_ms, _ = timed(
+            lambda: snapshot.write(
+                records, 'bench', token=snapshot.stale_token()
+            )
+        )
+
+        def decode_startup() -> list[ContactRecord]:
+            decoded: list[ContactRecord] = sorted(
+                map(codec.decode, values), key=collation_key
+            )
+            return decoded[:PAGE_SIZE]
+
+        def snapshot_startup() -> list[ContactRecord]:
+            with snapshot:
+                len(snapshot)
+                return snapshot.page(0, PAGE_SIZE)
+
+        decode_ms, _ = timed(decode_startup)
+        startup_ms, _ = timed(snapshot_startup)
+
+        def decode_search() -> list[int]:
+            matchers: list[Matcher] = [Matcher(p) for p in PATTERNS]
+            decoded: list[ContactRecord] = list(map(codec.decode, values))
+            return [
+                sum(map(matcher.match, decoded)) for matcher in matchers
+            ]
+
+        def snapshot_search() -> list[int]:
+            with snapshot:
+                return [len(snapshot.find_all(p)) for p in PATTERNS]
+
+        scan_ms, scan_counts = timed(decode_search)
+        search_ms, search_counts = timed(snapshot_search)
+
+        mismatches: int = sum(
+            got != want for got, want in zip(scan_counts, search_counts)
+        )
+        with snapshot:
+            for offset in range(0, args.records, max(1, args.records // 50)):
+                mismatches += [
+                    record.astuple()
+                    for record in snapshot.page(offset, PAGE_SIZE)
+                ] != expected[offset:offset + PAGE_SIZE]
+        file_mb: float = os.path.getsize(snapshot.filename) / 2**20
+
+    print(f'{args.records} contacts, snapshot {file_mb:.1f} MB')
+    print(f'write snapshot: {write_ms:.0f} ms')
+    print(f'{"":<10} {"decode all, ms":>15} {"snapshot, ms":>13}')
+    print(f'{"startup":<10} {decode_ms:>15.1f} {startup_ms:>13.2f}')
+    print(
+        f'{"search":<10} {scan_ms / len(PATTERNS):>15.1f} '
+        f'{search_ms / len(PATTERNS):>13.2f}'
+    )
+    print(f'snapshot check: {mismatches} mismatches')
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == '__main__':
+    main()
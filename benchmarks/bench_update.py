@@ -0,0 +1,130 @@
+"""
+Benchmark of contact edits.
+
+Uploads a synthetic phonebook (see `benchmarks.generator`)
+into a temporary `PHONEBOOK_HOME`, then edits contacts:
+    * legacy:
+        - `update` of earlier versions: find, remove and save,
+        every step opens DB on its own;
+    * update:
+        - journaled `update`, a single transaction and DB session;
+    * transaction:
+        - all edits in a single `transaction` block;
+    * write_behind:
+        - edits queued to the writer thread, as in the application:
+        contacts are read with `find` before the edit, like the shown
+        contact, the latency doesn't include writing them.
+
+Reports the latency of an edit and checks that DB has every
+edit and that the text file mirror has the same rows as DB.
+
+Usage:
+    $ python -m benchmarks.bench_update [--records N] [--edits N]
+"""
+import argparse
+import csv
+import os
+import random
+import sys
+import tempfile
+import time
+
+from benchmarks.generator import iter_rows
+
+
+def legacy_update(phone_book) -> None:
+    """`PhoneBook.update` of earlier versions."""
+    old_contact = phone_book.find(phone_book._contact._id)
+    phone_book.remove(contact_id=old_contact._id)
+    phone_book.save()
+
+
+def read_rows(filename: str) -> list[list[str]]:
+    """Return sorted rows of csv file without header."""
+    with open(filename, encoding='utf-8', newline='') as file:
+        return sorted(list(csv.reader(file))[1:])
+
+
+def bench(records: int, edits: int, seed: int) -> int:
+    """Print edit latencies and return the number of mismatches."""
+    from phonebook.config import files_init
+    from phonebook.constants import CONTACTS_FILE
+    from phonebook.mirror import CsvMirror
+    from phonebook.storages import PhoneBook
+
+    files_init()
+    PhoneBook().bulk_save(iter_rows(records, seed=seed))
+
+    rnd = random.Random(seed)
+    sample: list = rnd.sample(PhoneBook().load(), 4 * edits)
+    cases: dict = {
+        'legacy': sample[:edits],
+        'update': sample[edits:2 * edits],
+        'transaction': sample[2 * edits:3 * edits],
+        'write_behind': sample[3 * edits:],
+    }
+    expected: set[str] = set()
+
+    print(f'{records} contacts, {edits} edits per case')
+    print(f'{"case":<12} {"edit, ms":>9}')
+    for name, records_to_edit in cases.items():
+        contacts: list = []
+        for number, record in enumerate(records_to_edit):
+            if name == 'write_behind':
+                record = PhoneBook().find(record._id)
+            contact = record.to_contact()
+            contact.company = f'{name} {number}'
+            contacts.append(contact)
+            expected.add(contact.company)
+
+        started: float = time.perf_counter()
+        if name == 'legacy':
+            for contact in contacts:
+                legacy_update(PhoneBook(contact))
+        elif name == 'update':
+            for contact in contacts:
+                PhoneBook(contact).update()
+        elif name == 'transaction':
+            with PhoneBook().transaction():
+                for contact in contacts:
+                    PhoneBook(contact).update()
+        else:
+            PhoneBook().write_behind()
+            started = time.perf_counter()
+            for contact in contacts:
+                PhoneBook(contact).update()
+        elapsed: float = time.perf_counter() - started
+        print(f'{name:<12} {elapsed / edits * 1e3:>9.2f}')
+
+    PhoneBook().stop_write_behind()
+
+    stored: list = PhoneBook().load()
+    mismatches: int = len(expected - {c.company for c in stored})
+
+    mirror: CsvMirror = CsvMirror()
+    mirror.compact()
+    rebuilt: str = str(CONTACTS_FILE) + '.check'
+    CsvMirror(rebuilt).rebuild(stored)
+    mismatches += read_rows(CONTACTS_FILE) != read_rows(rebuilt)
+    os.remove(rebuilt)
+
+    print(f'edits and mirror check: {mismatches} mismatches')
+    return mismatches
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--records', type=int, default=10000)
+    parser.add_argument('--edits', type=int, default=100)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as home:
+        os.environ['PHONEBOOK_HOME'] = home
+        mismatches: int = bench(args.records, args.edits, args.seed)
+
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == '__main__':
+    main()
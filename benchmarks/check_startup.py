@@ -0,0 +1,193 @@
+"""
+Startup time budget check of the entry points.
+
+Runs every entry point in a fresh interpreter with
+`python -X importtime` and reads the list of imported modules
+and their cumulative import times from its report:
+    * modules:
+        - `import` of the module of the entry point;
+    * command line:
+        - `main.py` with a key, as scripts run it,
+        in a temporary initialized `PHONEBOOK_HOME`.
+
+Import time of an entry point is the sum of cumulative times
+of its top-level imports less the same sum of an empty run,
+the best of several runs is taken.
+
+Fails if an entry point imports a module it must not use
+or exceeds its budget. Budgets leave room for slower machines
+and noise, so they catch only gross regressions. For a tighter
+check write the times of a known good tree with `--output`
+and compare with them on the same machine with `--baseline`.
+
+Usage:
+    $ python -m benchmarks.check_startup [--runs N] [--scale FACTOR]
+    $ python -m benchmarks.check_startup --output PATH
+    $ python -m benchmarks.check_startup --baseline PATH [--threshold R]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+
+ROOT: Path = Path(__file__).resolve().parent.parent
+
+HEAVY: tuple = ('tqdm', 'multiprocessing', 'concurrent.futures')
+
+WITHOUT_CONTACTS: tuple = (
+    *HEAVY,
+    'pydantic',
+    'sqlite3',
+    'colorama',
+    'phonebook.storages',
+    'phonebook.handlers',
+)
+
+WITHOUT_APPLICATION: tuple = (*HEAVY, 'colorama', 'phonebook.handlers')
+
+ENTRY_POINTS: dict[str, tuple[tuple, float, tuple]] = {
+    'config module': (
+        ('-c', 'import phonebook.config'),
+        200.0,
+        WITHOUT_CONTACTS,
+    ),
+    'storages module': (
+        ('-c', 'import phonebook.storages'),
+        1000.0,
+        (*HEAVY, 'argparse', 'colorama'),
+    ),
+    'handlers module': (
+        ('-c', 'import phonebook.handlers'),
+        1200.0,
+        (*HEAVY, 'argparse'),
+    ),
+    'main.py --init': (
+        ('main.py', '--init'),
+        200.0,
+        WITHOUT_CONTACTS,
+    ),
+    'main.py --find-phone': (
+        ('main.py', '--find-phone', '+7 999 123-45-67'),
+        1000.0,
+        WITHOUT_APPLICATION,
+    ),
+    'main.py --export': (
+        ('main.py', '--export', 'contacts.jsonl'),
+        1000.0,
+        WITHOUT_APPLICATION,
+    ),
+}
+
+EMPTY_RUN: tuple = ('-c', 'pass')
+
+
+def import_report(args: tuple, home: str) -> tuple[float, set[str]]:
+    """
+    Return milliseconds of top-level imports of the interpreter
+    run with the arguments and names of all imported modules.
+    """
+    if args[0] == 'main.py':
+        args = (str(ROOT / 'main.py'), *args[1:])
+
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', *args],
+        cwd=home,
+        env={**os.environ, 'PHONEBOOK_HOME': home, 'PYTHONPATH': str(ROOT)},
+        capture_output=True,
+        text=True
+    )
+    elapsed: float = 0.0
+    imported: set[str] = set()
+    for line in completed.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+
+        _, cumulative, name = line.split('|')
+        imported.add(name.strip())
+        if len(name) - len(name.lstrip()) == 1:
+            elapsed += int(cumulative) / 1e3
+
+    return elapsed, imported
+
+
+def best_report(args: tuple, home: str, runs: int) -> tuple[float, set]:
+    """Return the best time of several runs and imported modules."""
+    reports: list = [import_report(args, home) for _ in range(runs)]
+    return min(report[0] for report in reports), reports[0][1]
+
+
+def is_submodule(name: str, package: str) -> bool:
+    """Checking that module is the package or its submodule."""
+    return name == package or name.startswith(f'{package}.')
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument(
+        '--scale',
+        type=float,
+        default=1.0,
+        help='multiply budgets by factor on slower machines'
+    )
+    parser.add_argument(
+        '--output', type=Path, help='write import times to JSON file'
+    )
+    parser.add_argument(
+        '--baseline',
+        type=Path,
+        help='compare with import times written by --output'
+    )
+    parser.add_argument(
+        '--threshold',
+        type=float,
+        default=0.3,
+        help='allowed slowdown against baseline (default: 0.3)'
+    )
+    args = parser.parse_args()
+
+    baseline: dict = (
+        json.loads(args.baseline.read_text()) if args.baseline else {}
+    )
+    times: dict[str, float] = {}
+    print(
+        f'{"entry point":<22} {"import, ms":>11} {"limit, ms":>10}  status'
+    )
+    failures: int = 0
+    with tempfile.TemporaryDirectory() as home:
+        import_report(('main.py', '--init'), home)
+        empty, _ = best_report(EMPTY_RUN, home, args.runs)
+
+        for title, (command, budget, forbidden) in ENTRY_POINTS.items():
+            elapsed, imported = best_report(command, home, args.runs)
+            elapsed = max(0.0, elapsed - empty)
+            times[title] = elapsed
+
+            limit: float = budget * args.scale
+            if title in baseline:
+                limit = min(limit, baseline[title] * (1 + args.threshold))
+            unexpected: list[str] = [
+                package for package in forbidden
+                if any(is_submodule(name, package) for name in imported)
+            ]
+
+            status: str = 'ok'
+            if elapsed > limit:
+                status = 'over limit'
+            if unexpected:
+                status = f'imports {", ".join(unexpected)}'
+            failures += status != 'ok'
+            print(f'{title:<22} {elapsed:>11.1f} {limit:>10.1f}  {status}')
+
+    if args.output:
+        args.output.write_text(json.dumps(times, indent=2) + '\n')
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
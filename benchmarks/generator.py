@@ -0,0 +1,191 @@
+"""
+Deterministic generator of synthetic phonebooks.
+
+Rows are dicts of contact fields, as read from upload files:
+    * names:
+        - Latin and Cyrillic first and last names, a few names
+        are much more common than the rest (Zipf distribution);
+        - Cyrillic contacts mostly have a patronymic as surname.
+    * companies:
+        - Zipf distributed, missing for a third of contacts.
+    * phones:
+        - Russian mobile numbers in the formats people type them;
+        - city work numbers for half of contacts.
+    * duplicates:
+        - a share of rows repeats an earlier row, half of them
+        in another letter case.
+
+The same seed always gives the same rows.
+"""
+import csv
+import json
+import random
+from itertools import accumulate
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from phonebook.models import FIELDS, ContactRecord
+
+
+LATIN_FIRST_NAMES: tuple = (
+    'John', 'Mary', 'James', 'Anna', 'Robert', 'Linda', 'Michael',
+    'Sarah', 'David', 'Emma', 'Daniel', 'Laura', 'Thomas', 'Julia',
+    'Peter', 'Alice', 'George', 'Helen', 'Victor', 'Irene',
+)
+
+LATIN_LAST_NAMES: tuple = (
+    'Smith', 'Johnson', 'Brown', 'Taylor', 'Miller', 'Wilson', 'Moore',
+    'Clark', 'Walker', 'Young', 'King', 'Wright', 'Scott', 'Green',
+    'Baker', 'Adams', 'Nelson', 'Hill', 'Campbell', 'Mitchell',
+    'Roberts', 'Carter', 'Phillips', 'Evans', 'Turner', 'Parker',
+)
+
+CYRILLIC_FIRST_NAMES: tuple = (
+    'Александр', 'Елена', 'Сергей', 'Ольга', 'Дмитрий', 'Наталья',
+    'Андрей', 'Татьяна', 'Алексей', 'Ирина', 'Максим', 'Светлана',
+    'Иван', 'Мария', 'Михаил', 'Анна', 'Николай', 'Юлия',
+)
+
+CYRILLIC_LAST_NAMES: tuple = (
+    'Иванов', 'Смирнов', 'Кузнецов', 'Попов', 'Васильев', 'Петров',
+    'Соколов', 'Михайлов', 'Новиков', 'Фёдоров', 'Морозов', 'Волков',
+    'Алексеев', 'Лебедев', 'Семёнов', 'Егоров', 'Павлов', 'Козлов',
+    'Степанов', 'Николаев', 'Орлов', 'Андреев', 'Макаров', 'Зайцев',
+)
+
+PATRONYMICS: tuple = (
+    'Александрович', 'Сергеевич', 'Дмитриевич', 'Андреевич',
+    'Алексеевич', 'Иванович', 'Михайлович', 'Николаевич',
+)
+
+COMPANIES: tuple = (
+    'Acme', 'Globex', 'Initech', 'Umbrella', 'Hooli', 'Stark Industries',
+    'Рога и копыта', 'Вектор', 'Гранит', 'Север', 'Альфа-Строй',
+    'Техносфера', 'Wayne Enterprises', 'Soylent', 'Cyberdyne',
+)
+
+MOBILE_FORMATS: tuple = (
+    '+7 ({code}) {a}-{b}-{c}',
+    '8{code}{a}{b}{c}',
+    '+7{code}{a}{b}{c}',
+    '8 {code} {a} {b} {c}',
+)
+
+CITY_CODES: tuple = ('495', '499', '812', '343', '383')
+
+
+def zipf_weights(size: int) -> list[float]:
+    """Return cumulative weights of ranks, rank N is N times rarer."""
+    return list(accumulate(1 / rank for rank in range(1, size + 1)))
+
+
+def iter_rows(
+    count: int,
+    *,
+    seed: int = 0,
+    duplicates: float = 0.05,
+    cyrillic: float = 0.5
+) -> Iterator[dict]:
+    """
+    Yield rows of synthetic contacts.
+
+    Args:
+        - **count**: number of rows;
+        - **seed**: key argument - seed of the random generator;
+        - **duplicates**: key argument - share of rows
+        repeating an earlier row;
+        - **cyrillic**: key argument - share of contacts
+        with Cyrillic names.
+    """
+    rnd = random.Random(seed)
+    weights: dict[tuple, list[float]] = {
+        pool: zipf_weights(len(pool))
+        for pool in (
+            LATIN_FIRST_NAMES, LATIN_LAST_NAMES, CYRILLIC_FIRST_NAMES,
+            CYRILLIC_LAST_NAMES, PATRONYMICS, COMPANIES,
+        )
+    }
+
+    def pick(pool: tuple) -> str:
+        return rnd.choices(pool, cum_weights=weights[pool])[0]
+
+    recent: list[dict] = []
+    for _ in range(count):
+        if recent and rnd.random() < duplicates:
+            row: dict = dict(rnd.choice(recent))
+            if rnd.random() < 0.5:
+                row = {
+                    field: value.upper() if value else value
+                    for field, value in row.items()
+                }
+            yield row
+            continue
+
+        if rnd.random() < cyrillic:
+            first_name: str = pick(CYRILLIC_FIRST_NAMES)
+            last_name: str = pick(CYRILLIC_LAST_NAMES)
+            surname: str = pick(PATRONYMICS) if rnd.random() < 0.8 else ''
+        else:
+            first_name = pick(LATIN_FIRST_NAMES)
+            last_name = pick(LATIN_LAST_NAMES)
+            surname = ''
+
+        row = {
+            'first_name': first_name,
+            'last_name': last_name,
+            'surname': surname,
+            'company': pick(COMPANIES) if rnd.random() < 0.67 else '',
+            'mobile': rnd.choice(MOBILE_FORMATS).format(
+                code=f'9{rnd.randrange(100):02}',
+                a=f'{rnd.randrange(1000):03}',
+                b=f'{rnd.randrange(100):02}',
+                c=f'{rnd.randrange(100):02}',
+            ),
+            'work': (
+                f'+7 ({rnd.choice(CITY_CODES)}) {rnd.randrange(1000):03}-'
+                f'{rnd.randrange(100):02}-{rnd.randrange(100):02}'
+                if rnd.random() < 0.5 else ''
+            ),
+        }
+        if len(recent) < 10000:
+            recent.append(row)
+        else:
+            recent[rnd.randrange(len(recent))] = row
+        yield row
+
+
+def write_csv(filename: str | Path, rows: Iterable[dict]) -> None:
+    """Write rows to csv file with header."""
+    with open(filename, 'w', newline='', encoding='utf-8') as file:
+        writer = csv.DictWriter(file, fieldnames=FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def write_json(filename: str | Path, rows: Iterable[dict]) -> None:
+    """Write rows to json file as array, one row per line."""
+    with open(filename, 'w', encoding='utf-8') as file:
+        file.write('[\n')
+        for number, row in enumerate(rows):
+            if number:
+                file.write(',\n')
+            file.write(json.dumps(row, ensure_ascii=False))
+        file.write('\n]\n')
+
+
+def write_vcf(filename: str | Path, rows: Iterable[dict]) -> None:
+    """
+    Write rows to vCard file, a card per row.
+    Exporters are imported here: they read the paths
+    of `PHONEBOOK_HOME`, benchmarks set it after imports.
+    """
+    from phonebook.exporters import export
+
+    export(
+        (
+            ContactRecord(values=tuple(row.get(field) for field in FIELDS))
+            for row in rows
+        ),
+        filename,
+        file_format='vcf'
+    )
@@ -0,0 +1,345 @@
+"""
+Benchmark suite of the Phonebook hot paths.
+
+For every phonebook size generates synthetic contacts
+(see `benchmarks.generator`) and measures:
+    * upload_csv, upload_json, upload_vcf:
+        - `upload_from` of the whole phonebook into an empty DB;
+    * load:
+        - loading all contacts from DB;
+    * find_all:
+        - search by name, company and phone number fragments;
+    * save_flush, update, remove:
+        - single contact writes with text file mirror updates;
+    * eq, short_view:
+        - `ContactBaseModel.__eq__` and `Contact.short_view`
+        called once per contact of the phonebook.
+
+Every size runs in its own process with a temporary
+`PHONEBOOK_HOME`, so the project DB isn't touched.
+Results are written as JSON. With a baseline file the results
+are compared with it and the exit status is 1 if any case
+is slower than the threshold allows.
+
+Usage:
+    $ python -m benchmarks.suite [--sizes N [N ...]] [--output PATH]
+    $ python -m benchmarks.suite --baseline PATH [--threshold RATIO]
+    $ python -m benchmarks.suite --results PATH --baseline PATH
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from itertools import product
+from pathlib import Path
+
+from benchmarks.generator import iter_rows, write_csv, write_json, write_vcf
+
+
+ROOT: Path = Path(__file__).resolve().parent.parent
+
+MODEL_SAMPLE: int = 10000
+
+
+def run_size(size: int, ops: int, seed: int) -> list[dict]:
+    """
+    Run all cases for one phonebook size in the current process.
+    `PHONEBOOK_HOME` must be set before the phonebook is imported.
+    """
+    from phonebook.config import files_init
+    from phonebook.constants import CONTACTS_DIR, DB_DIR
+    from phonebook.models import Contact
+    from phonebook.storages import PhoneBook
+
+    results: list[dict] = []
+
+    def measure(case: str, count: int, func) -> None:
+        started: float = time.perf_counter()
+        func()
+        seconds: float = time.perf_counter() - started
+        results.append(
+            {
+                'case': case,
+                'size': size,
+                'ops': count,
+                'seconds': seconds,
+                'per_op_us': seconds / count * 1e6,
+            }
+        )
+
+    def reset() -> None:
+        for path in (CONTACTS_DIR, DB_DIR):
+            shutil.rmtree(path, ignore_errors=True)
+        files_init()
+        PhoneBook._cache.clear()
+
+    home: Path = Path(os.environ['PHONEBOOK_HOME'])
+    rows: list[dict] = list(iter_rows(size, seed=seed))
+    write_csv(home / 'rows.csv', rows)
+    write_json(home / 'rows.json', rows)
+    write_vcf(home / 'rows.vcf', rows)
+
+    reset()
+    measure(
+        'upload_csv', size,
+        lambda: PhoneBook().upload_from(home / 'rows.csv')
+    )
+    reset()
+    measure(
+        'upload_json', size,
+        lambda: PhoneBook().upload_from(home / 'rows.json')
+    )
+    reset()
+    measure(
+        'upload_vcf', size,
+        lambda: PhoneBook().upload_from(home / 'rows.vcf')
+    )
+
+    contacts: list = []
+    measure('load', size, lambda: contacts.extend(PhoneBook().load()))
+
+    rnd = random.Random(seed)
+    ops = min(ops, len(contacts) // 2)
+    queries: list[str] = [
+        rnd.choice(
+            (
+                (contact.last_name or '')[:4],
+                contact.company or '',
+                (contact.mobile or '')[-5:],
+            )
+        ) or 'a'
+        for contact in rnd.sample(contacts, ops)
+    ]
+    measure(
+        'find_all', ops,
+        lambda: [PhoneBook().find_all(query) for query in queries]
+    )
+
+    new: list[Contact] = [
+        Contact(**row) for row in iter_rows(ops, seed=seed + 1)
+    ]
+    measure(
+        'save_flush', ops,
+        lambda: [PhoneBook(contact).save() for contact in new]
+    )
+
+    changed: list[Contact] = []
+    removed: list[str] = []
+    for number, record in enumerate(rnd.sample(contacts, 2 * ops)):
+        if number < ops:
+            contact: Contact = record.to_contact()
+            contact.company = f'Updated {number}'
+            changed.append(contact)
+        else:
+            removed.append(record._id)
+    measure(
+        'update', ops,
+        lambda: [PhoneBook(contact).update() for contact in changed]
+    )
+    measure(
+        'remove', ops,
+        lambda: [PhoneBook().remove(contact_id=key) for key in removed]
+    )
+
+    models: list[Contact] = [
+        Contact(**row) for row in rows[:MODEL_SAMPLE]
+    ]
+    pairs: list[tuple[Contact, Contact]] = [
+        (models[i % len(models)], models[(i + 1) % len(models)])
+        for i in range(min(size, MODEL_SAMPLE))
+    ]
+    repeat: int = -(-size // len(pairs))
+    measure(
+        'eq', repeat * len(pairs),
+        lambda: [
+            first == second for _ in range(repeat)
+            for first, second in pairs
+        ]
+    )
+    measure(
+        'short_view', repeat * len(models),
+        lambda: [
+            model.short_view for _ in range(repeat) for model in models
+        ]
+    )
+    return results
+
+
+def run(
+    sizes: list[int],
+    ops: int,
+    seed: int,
+    backend: str,
+    repeat: int
+) -> dict:
+    """
+    Run every size in a separate process and return report.
+    Every case keeps the best of `repeat` runs.
+    """
+    best: dict[tuple, dict] = {}
+    for size, number in product(sizes, range(repeat)):
+        print(
+            f'size {size}, run {number + 1}/{repeat}...',
+            file=sys.stderr,
+            flush=True
+        )
+        with tempfile.TemporaryDirectory() as home:
+            result_file: Path = Path(home) / 'result.json'
+            completed = subprocess.run(
+                [
+                    sys.executable, '-m', 'benchmarks.suite',
+                    '--run-size', str(size),
+                    '--ops', str(ops),
+                    '--seed', str(seed),
+                    '--result-file', str(result_file),
+                ],
+                cwd=ROOT,
+                env=dict(
+                    os.environ,
+                    PHONEBOOK_HOME=home,
+                    PHONEBOOK_STORAGE=backend,
+                ),
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+                text=True
+            )
+            if completed.returncode:
+                sys.exit(f'size {size} failed:\n{completed.stderr}')
+
+            for result in json.loads(result_file.read_text()):
+                key: tuple = (result['case'], result['size'])
+                if (
+                    key not in best
+                    or result['per_op_us'] < best[key]['per_op_us']
+                ):
+                    best[key] = result
+
+    return {
+        'meta': {
+            'created': datetime.now(timezone.utc).isoformat(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'backend': backend,
+            'seed': seed,
+            'ops': ops,
+            'repeat': repeat,
+        },
+        'results': list(best.values()),
+    }
+
+
+def compare(report: dict, baseline: dict, threshold: float) -> int:
+    """
+    Print comparison of report with baseline to stderr,
+    stdout is left for the JSON report.
+    Return the number of cases slower than baseline by more
+    than the threshold.
+    """
+    base: dict[tuple, dict] = {
+        (result['case'], result['size']): result
+        for result in baseline['results']
+    }
+    regressions: int = 0
+    print(
+        f'{"case":<12} {"size":>8} {"baseline, us":>13} '
+        f'{"current, us":>12} {"ratio":>6}  status',
+        file=sys.stderr
+    )
+    for result in report['results']:
+        before: dict | None = base.get((result['case'], result['size']))
+        if before is None:
+            continue
+
+        ratio: float = result['per_op_us'] / before['per_op_us']
+        status: str = 'ok'
+        if ratio > 1 + threshold:
+            status = 'REGRESSION'
+            regressions += 1
+        elif ratio < 1 - threshold:
+            status = 'faster'
+        print(
+            f'{result["case"]:<12} {result["size"]:>8} '
+            f'{before["per_op_us"]:>13.2f} {result["per_op_us"]:>12.2f} '
+            f'{ratio:>6.2f}  {status}',
+            file=sys.stderr
+        )
+
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument(
+        '--sizes',
+        type=int,
+        nargs='+',
+        default=[1000, 10000, 100000, 1000000]
+    )
+    parser.add_argument(
+        '--ops',
+        type=int,
+        default=100,
+        help='number of searches and single contact writes per size'
+    )
+    parser.add_argument(
+        '--repeat',
+        type=int,
+        default=1,
+        help='runs per size, the best run of every case is kept'
+    )
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument(
+        '--backend',
+        choices=('shelve', 'sqlite'),
+        default=os.environ.get('PHONEBOOK_STORAGE', 'shelve')
+    )
+    parser.add_argument(
+        '--output', type=Path, help='write results to file, not stdout'
+    )
+    parser.add_argument(
+        '--results', type=Path, help='compare saved results, do not run'
+    )
+    parser.add_argument('--baseline', type=Path)
+    parser.add_argument(
+        '--threshold',
+        type=float,
+        default=0.2,
+        help='allowed slowdown against baseline (default: 0.2)'
+    )
+    parser.add_argument('--run-size', type=int, help=argparse.SUPPRESS)
+    parser.add_argument('--result-file', type=Path, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_size:
+        args.result_file.write_text(
+            json.dumps(run_size(args.run_size, args.ops, args.seed))
+        )
+        return
+
+    if args.results:
+        report: dict = json.loads(args.results.read_text())
+    else:
+        report = run(
+            args.sizes, args.ops, args.seed, args.backend, args.repeat
+        )
+        output: str = json.dumps(report, indent=2)
+        if args.output:
+            args.output.write_text(output + '\n')
+        else:
+            print(output)
+
+    if args.baseline:
+        baseline: dict = json.loads(args.baseline.read_text())
+        regressions: int = compare(report, baseline, args.threshold)
+        sys.exit(1 if regressions else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,10 +1,11 @@
 import sys
 
-from phonebook import argument_parser, FILE_INIT_KEY
-from phonebook import run_app
+from phonebook.constants import FILE_INIT_KEY
 
 
 def main():
+    from phonebook.handlers import run_app
+
     try:
         run_app()
     except OSError as exc:
@@ -31,6 +32,9 @@ if __name__ == '__main__':
         sys.exit()
 
     if len(sys.argv) > 1:
-        argument_parser()
+        from phonebook.config import argument_parser
+
+        if not argument_parser():
+            sys.exit()
 
     main()
@@ -1,8 +1,28 @@
-from .config import argument_parser, FILE_INIT_KEY
-from .handlers import run_app
+"""
+Phonebook package.
+
+Package attributes are imported on first access,
+so importing a single module of the package doesn't load
+the whole application.
+"""
+from importlib import import_module
+
+
+_ATTRIBUTES: dict[str, str] = {
+    'FILE_INIT_KEY': '.constants',
+    'argument_parser': '.config',
+    'run_app': '.handlers',
+}
 
 __all__ = [
     'FILE_INIT_KEY',
     'argument_parser',
     'run_app',
 ]
+
+
+def __getattr__(name: str):
+    if name not in _ATTRIBUTES:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+    return getattr(import_module(_ATTRIBUTES[name], __name__), name)
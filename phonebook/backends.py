@@ -0,0 +1,404 @@
+"""
+Storage backends of the Phonebook.
+
+Backend is selected by the `STORAGE_BACKEND` constant
+(or `PHONEBOOK_STORAGE` environment variable):
+    * shelve:
+        - binary contact records (see `codec` module)
+        in a dbm file, pickles of earlier versions are still read;
+        - lookups other than by ID are full scans.
+    * sqlite:
+        - one row per contact in a SQLite table (WAL mode);
+        - indexes on the name, company and phone columns.
+
+Backends accept Contact models or records
+and return ContactRecord objects.
+
+Every backend method opens the store on its own.
+Use the backend as a context manager to run many
+operations in a single session.
+"""
+import dbm
+import pickle
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from itertools import islice
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from . import codec
+from .constants import (
+    DB_PATH,
+    SQLITE_DB_PATH,
+    STORAGE_BACKEND,
+    UPLOAD_BATCH_SIZE,
+)
+from .matching import Matcher, search_text
+from .models import (
+    FIELDS,
+    AnyContact,
+    Contact,
+    ContactRecord,
+    to_record,
+)
+from .stats import timed
+
+
+class Session(ABC):
+    """
+    Store opened on demand.
+    Use as a context manager to keep the store opened
+    for many operations.
+    """
+
+    def __init__(self, filename: str | Path) -> None:
+        self.filename = str(filename)
+        self._db = None
+        self._depth: int = 0
+
+    def __enter__(self) -> 'Session':
+        if not self._depth:
+            self._db = self._open()
+        self._depth += 1
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._depth -= 1
+        if not self._depth:
+            db, self._db = self._db, None
+            self._close(db)
+
+    @contextmanager
+    def _session(self) -> Iterator:
+        """Use the opened store or open it for a single operation."""
+        if self._db is not None:
+            yield self._db
+            return
+
+        db = self._open()
+        try:
+            yield db
+        finally:
+            self._close(db)
+
+    @abstractmethod
+    def _open(self):
+        """Open the store."""
+
+    @abstractmethod
+    def _close(self, db) -> None:
+        """Commit changes and close the store."""
+
+    @abstractmethod
+    def commit(self) -> None:
+        """Commit changes of the current session."""
+
+
+class StorageBackend(Session):
+    """Storage backend interface."""
+
+    name: str = ''
+
+    @property
+    def uri(self) -> str:
+        """Backend name and path to the store."""
+        return f'{self.name}:{self.filename}'
+
+    @abstractmethod
+    def save(self, contact: AnyContact) -> ContactRecord | None:
+        """Save contact, return the replaced contact if any."""
+
+    @abstractmethod
+    def save_many(self, contacts: Iterable[AnyContact]) -> None:
+        """Save contacts without reading replaced ones."""
+
+    @abstractmethod
+    def find(self, contact_id: str) -> ContactRecord | None:
+        """Return contact by ID."""
+
+    @abstractmethod
+    def remove(self, contact_id: str) -> ContactRecord | None:
+        """Remove contact by ID, return the removed contact if any."""
+
+    @abstractmethod
+    def load(self) -> Iterator[ContactRecord]:
+        """Iterate over all contacts."""
+
+    @abstractmethod
+    def find_all(self, pattern: str) -> list[ContactRecord]:
+        """Return contacts with any field containing pattern."""
+
+    @abstractmethod
+    def iter_page(self, page: int, per_page: int) -> list[ContactRecord]:
+        """Return contacts of the page, pages start from 1."""
+
+    def upgrade(self) -> int:
+        """
+        Rewrite contacts stored in a format of earlier versions.
+        Return the number of rewritten contacts.
+        """
+        return 0
+
+    @abstractmethod
+    def __len__(self) -> int:
+        """Return the number of contacts."""
+
+
+class ShelveStorage(StorageBackend):
+    """
+    Storage of binary contact records (see `codec` module)
+    in the dbm file of shelve.
+    Pickled values written by earlier versions are still read,
+    `upgrade` rewrites them as binary records.
+    The dbm file isn't safe for concurrent sessions,
+    sessions of all threads are serialized by a lock.
+    """
+
+    name: str = 'shelve'
+
+    _lock: threading.RLock = threading.RLock()
+
+    @timed('shelve.open')
+    def _open(self):
+        self._lock.acquire()
+        try:
+            return dbm.open(self.filename, 'c')
+        except BaseException:
+            self._lock.release()
+            raise
+
+    def _close(self, db) -> None:
+        try:
+            db.close()
+        finally:
+            self._lock.release()
+
+    def commit(self) -> None:
+        if self._db is not None and hasattr(self._db, 'sync'):
+            self._db.sync()
+
+    def save(self, contact: AnyContact) -> ContactRecord | None:
+        with self._session() as db:
+            replaced: ContactRecord | None = _from_value(db.get(contact._id))
+            db[contact._id] = codec.encode(to_record(contact))
+        return replaced
+
+    def save_many(self, contacts: Iterable[AnyContact]) -> None:
+        with self._session() as db:
+            for contact in contacts:
+                db[contact._id] = codec.encode(to_record(contact))
+
+    def find(self, contact_id: str) -> ContactRecord | None:
+        with self._session() as db:
+            return _from_value(db.get(contact_id))
+
+    def remove(self, contact_id: str) -> ContactRecord | None:
+        with self._session() as db:
+            removed: ContactRecord | None = _from_value(db.get(contact_id))
+            if removed is not None:
+                del db[contact_id]
+        return removed
+
+    def load(self) -> Iterator[ContactRecord]:
+        with self._session() as db:
+            for key in db.keys():
+                yield _from_value(db[key])
+
+    def find_all(self, pattern: str) -> list[ContactRecord]:
+        matcher: Matcher = Matcher(pattern)
+        return [contact for contact in self.load() if matcher.match(contact)]
+
+    def iter_page(self, page: int, per_page: int) -> list[ContactRecord]:
+        begin: int = (page - 1) * per_page
+        return list(islice(self.load(), begin, begin + per_page))
+
+    def upgrade(self) -> int:
+        with self._session() as db:
+            upgraded: int = 0
+            for key in db.keys():
+                value: bytes = db[key]
+                if not codec.is_encoded(value):
+                    db[key] = codec.encode(_from_value(value))
+                    upgraded += 1
+            return upgraded
+
+    def __len__(self) -> int:
+        with self._session() as db:
+            return len(db)
+
+
+class SQLiteStorage(StorageBackend):
+    """Storage of contacts in indexed SQLite table."""
+
+    name: str = 'sqlite'
+
+    _schema: str = f"""
+        CREATE TABLE IF NOT EXISTS contacts (
+            id TEXT PRIMARY KEY,
+            {', '.join(f'{field} TEXT' for field in FIELDS)},
+            search TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS contacts_name ON contacts (
+            last_name COLLATE NOCASE, first_name COLLATE NOCASE
+        );
+        CREATE INDEX IF NOT EXISTS contacts_surname
+            ON contacts (surname COLLATE NOCASE);
+        CREATE INDEX IF NOT EXISTS contacts_company
+            ON contacts (company COLLATE NOCASE);
+        CREATE INDEX IF NOT EXISTS contacts_mobile ON contacts (mobile);
+        CREATE INDEX IF NOT EXISTS contacts_work ON contacts (work);
+    """
+    _columns: str = ', '.join(('id', *FIELDS))
+    _insert: str = (
+        f'INSERT OR REPLACE INTO contacts ({_columns}, search) '
+        f'VALUES ({", ".join("?" * (len(FIELDS) + 2))})'
+    )
+    _select: str = f'SELECT {_columns} FROM contacts'
+
+    @timed('sqlite.open')
+    def _open(self) -> sqlite3.Connection:
+        db = sqlite3.connect(self.filename)
+        db.execute('PRAGMA journal_mode=WAL')
+        db.execute('PRAGMA synchronous=NORMAL')
+        db.executescript(self._schema)
+        return db
+
+    def _close(self, db: sqlite3.Connection) -> None:
+        db.commit()
+        db.close()
+
+    def commit(self) -> None:
+        if self._db is not None:
+            self._db.commit()
+
+    def save(self, contact: AnyContact) -> ContactRecord | None:
+        with self._session() as db:
+            replaced: ContactRecord | None = self._fetch_one(db, contact._id)
+            db.execute(self._insert, _to_row(contact))
+        return replaced
+
+    def save_many(self, contacts: Iterable[AnyContact]) -> None:
+        with self._session() as db:
+            db.executemany(self._insert, map(_to_row, contacts))
+
+    def find(self, contact_id: str) -> ContactRecord | None:
+        with self._session() as db:
+            return self._fetch_one(db, contact_id)
+
+    def remove(self, contact_id: str) -> ContactRecord | None:
+        with self._session() as db:
+            removed: ContactRecord | None = self._fetch_one(db, contact_id)
+            db.execute('DELETE FROM contacts WHERE id = ?', (contact_id,))
+        return removed
+
+    def load(self) -> Iterator[ContactRecord]:
+        with self._session() as db:
+            yield from map(_from_row, db.execute(self._select))
+
+    def find_all(self, pattern: str) -> list[ContactRecord]:
+        with self._session() as db:
+            rows = db.execute(
+                f'{self._select} WHERE instr(search, ?) > 0',
+                (Matcher(pattern).pattern,)
+            )
+            return [*map(_from_row, rows)]
+
+    def iter_page(self, page: int, per_page: int) -> list[ContactRecord]:
+        with self._session() as db:
+            rows = db.execute(
+                f'{self._select} ORDER BY rowid LIMIT ? OFFSET ?',
+                (per_page, (page - 1) * per_page)
+            )
+            return [*map(_from_row, rows)]
+
+    def __len__(self) -> int:
+        with self._session() as db:
+            return db.execute('SELECT count(*) FROM contacts').fetchone()[0]
+
+    def _fetch_one(
+        self,
+        db: sqlite3.Connection,
+        contact_id: str
+    ) -> ContactRecord | None:
+        row = db.execute(
+            f'{self._select} WHERE id = ?', (contact_id,)
+        ).fetchone()
+        return _from_row(row) if row else None
+
+
+BACKENDS: dict[str, tuple[type[StorageBackend], str]] = {
+    'shelve': (ShelveStorage, DB_PATH),
+    'sqlite': (SQLiteStorage, SQLITE_DB_PATH),
+}
+
+
+def get_storage(backend: str = STORAGE_BACKEND) -> StorageBackend:
+    """Return storage backend selected in config."""
+    if backend not in BACKENDS:
+        raise ValueError(
+            f'Unknown storage backend: {backend}. '
+            f'Available: {", ".join(BACKENDS)}'
+        )
+
+    storage_class, filename = BACKENDS[backend]
+    return storage_class(filename)
+
+
+def migrate(
+    source: StorageBackend,
+    target: StorageBackend,
+    *,
+    batch_size: int = UPLOAD_BATCH_SIZE
+) -> int:
+    """
+    Copy all contacts from one storage to another in batches.
+    Return the number of copied contacts.
+
+    Args:
+        - **source**: storage to read contacts from;
+        - **target**: storage to write contacts to;
+        - **batch_size**: key argument - number of contacts
+        written per commit.
+    """
+    total: int = 0
+    with source, target:
+        contacts: Iterator[Contact] = source.load()
+        while batch := list(islice(contacts, batch_size)):
+            target.save_many(batch)
+            target.commit()
+            total += len(batch)
+
+    return total
+
+
+def _from_value(value: bytes | None) -> ContactRecord | None:
+    """
+    Return record from dbm value: binary record
+    or pickled record tuple or Contact model of earlier versions.
+    """
+    if value is None:
+        return None
+    if codec.is_encoded(value):
+        return codec.decode(value)
+
+    legacy: tuple | Contact = pickle.loads(value)
+    if isinstance(legacy, tuple):
+        return ContactRecord.from_tuple(legacy)
+    return ContactRecord.from_contact(legacy)
+
+
+def _to_row(contact: AnyContact) -> tuple:
+    """Return contact as SQLite table row."""
+    values: list = [getattr(contact, field) for field in FIELDS]
+    return contact._id, *values, search_text(values)
+
+
+def _from_row(row: tuple) -> ContactRecord:
+    """
+    Return record from SQLite table row.
+    Fields with a value are taken as set.
+    """
+    contact_id, *values = row
+    return ContactRecord(contact_id, values)
@@ -0,0 +1,98 @@
+"""
+Binary encoding of contact records.
+
+Record layout, version 1 (little-endian):
+    * header:
+        - version: 1 byte;
+        - set fields mask: 1 byte (see `ContactRecord`);
+        - present values mask: 1 byte, bit 0 is the ID,
+        bits 1-6 are the fields in the Contact fields order;
+        - lengths: 7 unsigned 2-byte ints, the number of characters
+        of the ID and of every field, 0 for missing values.
+    * payload:
+        - the ID and the field values as one UTF-8 string,
+        separated by NUL characters, missing values are empty.
+
+Decoding splits the payload by the separators with a single call.
+Lengths are used only if a value contains NUL itself.
+
+The first byte of a pickle (protocol 2 and above) is 0x80,
+so encoded records and pickles of earlier versions
+are told apart by the first byte.
+"""
+import struct
+
+from .models import FIELDS, ContactRecord
+
+
+VERSION: int = 1
+
+HEADER: struct.Struct = struct.Struct(f'<BBB{len(FIELDS) + 1}H')
+
+MAX_LENGTH: int = 0xFFFF
+
+SEPARATOR: str = '\0'
+
+MISSING: list[tuple[int, ...]] = [
+    tuple(i for i in range(len(FIELDS) + 1) if not present >> i & 1)
+    for present in range(1 << len(FIELDS) + 1)
+]
+
+
+def encode(record: ContactRecord) -> bytes:
+    """Return binary encoding of the record."""
+    values: tuple = (record._id, *record.values)
+    present: int = 0
+    lengths: list[int] = []
+    for i, value in enumerate(values):
+        if value is None:
+            lengths.append(0)
+            continue
+
+        if len(value) > MAX_LENGTH:
+            raise ValueError(
+                f'Value longer than {MAX_LENGTH} characters '
+                f'can\'t be encoded: {value[:20]}...'
+            )
+        present |= 1 << i
+        lengths.append(len(value))
+
+    header: bytes = HEADER.pack(
+        VERSION, record._fields_set, present, *lengths
+    )
+    payload: str = SEPARATOR.join(
+        '' if value is None else value for value in values
+    )
+    return header + payload.encode()
+
+
+def decode(data: bytes) -> ContactRecord:
+    """Return record from its binary encoding."""
+    version, fields_set, present = data[0], data[1], data[2]
+    if version != VERSION:
+        raise ValueError(f'Unsupported record version: {version}')
+
+    payload: str = data[HEADER.size:].decode()
+    values: list[str | None] = payload.split(SEPARATOR)
+    if len(values) != len(FIELDS) + 1:
+        values = _split(payload, HEADER.unpack_from(data)[3:])
+
+    for i in MISSING[present]:
+        values[i] = None
+
+    return ContactRecord(values[0], values[1:], fields_set)
+
+
+def _split(payload: str, lengths: tuple[int, ...]) -> list[str]:
+    """Split payload with separators inside values by lengths."""
+    values: list[str] = []
+    begin: int = 0
+    for length in lengths:
+        values.append(payload[begin:begin + length])
+        begin += length + len(SEPARATOR)
+    return values
+
+
+def is_encoded(data: bytes) -> bool:
+    """Checking that data is an encoded record, not a pickle."""
+    return data[:1] == bytes((VERSION,))
@@ -1,9 +1,51 @@
+"""
+Command line interface of the Phonebook.
+
+Keys doing a job (`--init`, `--upload`, `--export` etc.) exit
+when it's done, the application starts without them.
+Keys are used from scripts, so modules are imported on demand:
+    * parsing arguments and `--init`:
+        - constants and the standard library only;
+    * keys working with contacts:
+        - storages and its dependencies (pydantic, sqlite3)
+        on the first use, see `phone_book`.
+"""
 import argparse
 import os
+import sys
 from pathlib import Path
+from typing import TYPE_CHECKING
+
+from .constants import (
+    BATCH_SIZE_KEY,
+    BUILD_SNAPSHOT_KEY,
+    CONTACTS_DIR,
+    DB_DIR,
+    EXPORT_FIELDS_KEY,
+    EXPORT_FORMAT_KEY,
+    EXPORT_FORMATS,
+    EXPORT_KEY,
+    EXPORT_QUERY_KEY,
+    FILE_INIT_KEY,
+    FIND_PHONE_KEY,
+    JOURNAL_PATH,
+    MIGRATE_KEY,
+    PHONE_SUFFIX_KEY,
+    REBUILD_MIRROR_KEY,
+    REINDEX_KEY,
+    STATS_FILE_KEY,
+    STATS_KEY,
+    STORAGE_BACKEND,
+    STORAGE_BACKENDS,
+    UPLOAD_BATCH_SIZE,
+    UPGRADE_DB_KEY,
+    UPLOAD_FILE_KEY,
+    WORKERS_KEY,
+)
+from .ioworkers import console
 
-from .constants import CONTACTS_DIR, DB_DIR, FILE_INIT_KEY, UPLOAD_FILE_KEY
-from .storages import PhoneBook
+if TYPE_CHECKING:
+    from .storages import PhoneBook
 
 
 def files_init() -> None:
@@ -24,8 +66,60 @@ def dir_is_exists(path: str | Path) -> bool:
     return os.path.isdir(path)
 
 
-def argument_parser() -> None:
-    """Parse command line arguments."""
+def phone_book() -> 'PhoneBook':
+    """Return the Phonebook, storages are imported on first call."""
+    from .storages import PhoneBook
+
+    return PhoneBook()
+
+
+def find_phone(number: str, suffix: int | None = None) -> None:
+    """
+    Print contacts with the phone number and exit.
+    Exit status is 1 if nothing was found.
+    """
+    contacts: list = phone_book().find_by_phone(number, suffix=suffix)
+    for contact in contacts:
+        console.write(contact.card_view)
+        console.write('')
+
+    sys.exit(0 if contacts else 1)
+
+
+def positive_int(value: str) -> int:
+    """Argument type: integer greater than 0."""
+    return _int_at_least(value, 1)
+
+
+def non_negative_int(value: str) -> int:
+    """Argument type: integer greater than or equal to 0."""
+    return _int_at_least(value, 0)
+
+
+def _int_at_least(value: str, minimum: int) -> int:
+    """
+    Return integer of the argument value.
+    Raise ArgumentTypeError if it isn't an integer or less than minimum.
+    """
+    try:
+        number: int = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f'invalid int value: {value!r}')
+
+    if number < minimum:
+        raise argparse.ArgumentTypeError(
+            f'must be at least {minimum}, got {number}'
+        )
+    return number
+
+
+def argument_parser() -> bool:
+    """
+    Parse command line arguments and run the keys.
+    Return True if the application should start:
+    no key doing a job was passed, only keys tuning
+    the session like `--stats`.
+    """
     parser = argparse.ArgumentParser(
         description='Contact management application'
     )
@@ -38,13 +132,200 @@ def argument_parser() -> None:
         UPLOAD_FILE_KEY,
         type=Path,
         metavar='PATH',
-        help='loading contacts data from file'
+        help='loading contacts data from .csv, .json, .jsonl or .vcf file'
+    )
+    parser.add_argument(
+        BATCH_SIZE_KEY,
+        type=positive_int,
+        default=UPLOAD_BATCH_SIZE,
+        metavar='N',
+        help=(
+            'number of rows written to the database per commit '
+            f'on upload (default: {UPLOAD_BATCH_SIZE})'
+        )
+    )
+    parser.add_argument(
+        WORKERS_KEY,
+        type=non_negative_int,
+        default=1,
+        metavar='N',
+        help=(
+            'number of processes that parse and validate rows '
+            'on upload, 0 to use all CPUs (default: 1)'
+        )
+    )
+    parser.add_argument(
+        EXPORT_KEY,
+        type=Path,
+        metavar='PATH',
+        help=(
+            'export contacts to file, gzip-compressed '
+            'if the file name ends with .gz'
+        )
+    )
+    parser.add_argument(
+        EXPORT_FORMAT_KEY,
+        choices=EXPORT_FORMATS,
+        help=(
+            f'format of {EXPORT_KEY} file ({"|".join(EXPORT_FORMATS)}), '
+            'guessed from the file name by default'
+        )
+    )
+    parser.add_argument(
+        EXPORT_FIELDS_KEY,
+        type=lambda value: tuple(filter(None, value.split(','))),
+        metavar='FIELD,...',
+        help=f'comma separated contact fields to {EXPORT_KEY}'
+    )
+    parser.add_argument(
+        EXPORT_QUERY_KEY,
+        metavar='TEXT',
+        help=f'{EXPORT_KEY} only contacts containing the text'
+    )
+    parser.add_argument(
+        REBUILD_MIRROR_KEY,
+        action='store_true',
+        help='regenerate contacts text file from the database'
+    )
+    parser.add_argument(
+        MIGRATE_KEY,
+        choices=STORAGE_BACKENDS,
+        metavar='BACKEND',
+        help=(
+            'copy contacts from another storage backend '
+            f'({"|".join(STORAGE_BACKENDS)}) to the configured one '
+            f'(current: {STORAGE_BACKEND})'
+        )
+    )
+    parser.add_argument(
+        REINDEX_KEY,
+        action='store_true',
+        help='rebuild search indexes from the database'
+    )
+    parser.add_argument(
+        UPGRADE_DB_KEY,
+        action='store_true',
+        help=(
+            'rewrite contacts pickled by earlier versions '
+            'in the binary record format and replace their IDs '
+            'made of the contact fields with surrogate IDs'
+        )
+    )
+    parser.add_argument(
+        BUILD_SNAPSHOT_KEY,
+        action='store_true',
+        help='write snapshot of the database for fast startup and search'
+    )
+    parser.add_argument(
+        STATS_KEY,
+        action='store_true',
+        help='print call counts and latencies of hot paths on exit'
+    )
+    parser.add_argument(
+        STATS_FILE_KEY,
+        type=Path,
+        metavar='PATH',
+        help=f'write {STATS_KEY} report to JSON file instead'
+    )
+    parser.add_argument(
+        FIND_PHONE_KEY,
+        metavar='NUMBER',
+        help='print contacts with the phone number and exit'
+    )
+    parser.add_argument(
+        PHONE_SUFFIX_KEY,
+        type=positive_int,
+        metavar='N',
+        help=f'compare only the last N digits of {FIND_PHONE_KEY} number'
     )
 
     args = parser.parse_args()
 
+    if args.suffix is not None and args.find_phone is None:
+        parser.error(f'{PHONE_SUFFIX_KEY} requires {FIND_PHONE_KEY}')
+
+    if args.migrate == STORAGE_BACKEND:
+        parser.error(f'storage backend is already {STORAGE_BACKEND}')
+
+    if args.upload:
+        from .loaders import get_load_handler
+
+        try:
+            get_load_handler(args.upload)
+        except ValueError as exc:
+            parser.error(str(exc))
+
+    if args.fields:
+        from .models import FIELDS
+
+        unknown: set[str] = set(args.fields) - set(FIELDS)
+        if unknown:
+            parser.error(
+                f'unknown fields: {", ".join(sorted(unknown))} '
+                f'(available: {",".join(FIELDS)})'
+            )
+
+    if args.stats or args.stats_file:
+        from .stats import enable
+
+        enable(args.stats_file)
+
     if args.init:
         files_init()
 
+    if os.path.isfile(JOURNAL_PATH):
+        recovered: int = phone_book().recover()
+        console.write(f'Recovered {recovered} journaled changes')
+
+    if args.upgrade_db:
+        upgraded, replaced = phone_book().upgrade_db()
+        console.write(
+            f'Upgraded {upgraded} contacts, replaced {replaced} legacy IDs'
+        )
+
+    if args.migrate:
+        phone_book().migrate_from(args.migrate)
+
     if args.upload:
-        PhoneBook().upload_from(args.upload)
+        try:
+            phone_book().upload_from(
+                args.upload,
+                batch_size=args.batch_size,
+                workers=args.workers
+            )
+        except ValueError as exc:
+            sys.exit(f'Upload stopped, rows before the error are saved: {exc}')
+
+    if args.export:
+        phone_book().export_to(
+            args.export,
+            file_format=args.format,
+            fields=args.fields,
+            pattern=args.query
+        )
+
+    if args.rebuild_mirror:
+        phone_book().flush()
+
+    if args.reindex:
+        phone_book().reindex()
+
+    if args.build_snapshot:
+        written: int = phone_book().build_snapshot()
+        console.write(f'Snapshot of {written} contacts written')
+
+    if args.find_phone:
+        find_phone(args.find_phone, args.suffix)
+
+    return not any(
+        (
+            args.init,
+            args.upgrade_db,
+            args.migrate,
+            args.upload,
+            args.export,
+            args.rebuild_mirror,
+            args.reindex,
+            args.build_snapshot,
+        )
+    )
@@ -1,33 +1,103 @@
-import colorama
+import os
 from pathlib import Path
 
-from .models import TOTAL_FIELDS
 
-
-BASE_DIR: Path = Path(__file__).resolve().parent.parent
+BASE_DIR: Path = Path(
+    os.environ.get('PHONEBOOK_HOME') or Path(__file__).resolve().parent.parent
+)
 
 CONTACTS_DIR: Path = BASE_DIR / 'files'
 
 CONTACTS_FILE: Path = CONTACTS_DIR / 'contacts.csv'
 
+MIRROR_COMPACT_THRESHOLD: int = 1000
+
 DB_DIR: Path = BASE_DIR / 'data'
 
 DB_PATH: str = str(DB_DIR / 'contacts.db')
 
+SQLITE_DB_PATH: str = str(DB_DIR / 'contacts.sqlite3')
+
+INDEX_PATH: str = str(DB_DIR / 'index.sqlite3')
+
+SNAPSHOT_PATH: str = str(DB_DIR / 'snapshot.bin')
+
+JOURNAL_PATH: str = str(DB_DIR / 'journal.jsonl')
+
+USE_SNAPSHOT: bool = os.environ.get('PHONEBOOK_SNAPSHOT') == '1'
+
+SNAPSHOT_DEBOUNCE: float = 2.0
+
+TRIGRAM_SIZE: int = 3
+
+PREFIX_LIMIT: int = 5
+
+FUZZY_PREFIX: str = '~'
+
+FUZZY_DISTANCE: int = 2
+
+STORAGE_BACKENDS: tuple = ('shelve', 'sqlite')
+
+STORAGE_BACKEND: str = os.environ.get('PHONEBOOK_STORAGE', 'shelve')
+
+EXPORT_FORMATS: tuple = ('csv', 'jsonl', 'vcf')
+
 FILE_INIT_KEY: str = '--init'
 
 UPLOAD_FILE_KEY: str = '--upload'
 
+EXPORT_KEY: str = '--export'
+
+EXPORT_FORMAT_KEY: str = '--format'
+
+EXPORT_FIELDS_KEY: str = '--fields'
+
+EXPORT_QUERY_KEY: str = '--query'
+
+BATCH_SIZE_KEY: str = '--batch-size'
+
+WORKERS_KEY: str = '--workers'
+
+REBUILD_MIRROR_KEY: str = '--rebuild-mirror'
+
+MIGRATE_KEY: str = '--migrate'
+
+REINDEX_KEY: str = '--reindex'
+
+UPGRADE_DB_KEY: str = '--upgrade-db'
+
+BUILD_SNAPSHOT_KEY: str = '--build-snapshot'
+
+STATS_KEY: str = '--stats'
+
+STATS_FILE_KEY: str = '--stats-file'
+
+FIND_PHONE_KEY: str = '--find-phone'
+
+PHONE_SUFFIX_KEY: str = '--suffix'
+
+UPLOAD_BATCH_SIZE: int = 1000
+
+WRITE_BEHIND_BATCH_SIZE: int = 100
+
+READ_CHUNK_SIZE: int = 64 * 1024
+
 PAGE_SIZE: int = 6
 
+ORDER_BY_NAME: str = 'name'
+
+CONTACT_CACHE_SIZE: int = 256
+
+CONTACT_ID_SIZE: int = 8
+
+STATS_SAMPLE_SIZE: int = 10000
+
 FRAME_DESIGN: str = '#'
 
 FRAME_SIZE: int = 80
 
 FIRST, *_, LAST = range(PAGE_SIZE)
 
-FIRST_FIELD, *_, LAST_FIELD = range(1, TOTAL_FIELDS + 1)
-
 
 class Button:
     """Availible key buttons."""
@@ -43,29 +113,3 @@ class Button:
     PREV: str = 'p'
     QUIT: str = 'q'
     SAVE: str = 's'
-
-
-class ReportState:
-    """Operation report state."""
-
-    DECLINE: str = ''.join(
-        (
-            colorama.Fore.RED,
-            'CHANGES DECLINED',
-            colorama.Fore.RESET,
-        )
-    )
-    ACCEPT: str = ''.join(
-        (
-            colorama.Fore.GREEN,
-            'CHANGES ACCEPTED',
-            colorama.Fore.RESET,
-        )
-    )
-    DONOTHING: str = ''.join(
-        (
-            colorama.Fore.YELLOW,
-            'NO CHANGES APPLIED',
-            colorama.Fore.RESET,
-        )
-    )
@@ -0,0 +1,215 @@
+"""
+Streaming export of contacts.
+
+Contacts flow from DB to the output file through a chain
+of generators, only the current contact is kept in memory:
+    * source:
+        - all contacts of DB or contacts matching a query,
+        see `PhoneBook.iter_contacts`;
+    * projection:
+        - only the selected fields are written, in the given order;
+    * format:
+        - `csv`: header and a row per contact, like the text file mirror;
+        - `jsonl`: JSON object per line (JSON Lines);
+        - `vcf`: vCard 3.0 card per contact;
+    * output:
+        - text is gzip-compressed if the file name ends with `.gz`;
+        - it's written to a temporary file next to the output one,
+        which is replaced only when the export is complete.
+"""
+import csv
+import gzip
+import json
+import os
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, TextIO
+
+from .constants import EXPORT_FORMATS
+from .models import FIELDS, AnyContact
+
+
+GZIP_SUFFIX: str = '.gz'
+
+VCARD_LINE_LENGTH: int = 75
+
+VCARD_ESCAPES: dict = str.maketrans(
+    {'\\': '\\\\', ';': '\\;', ',': '\\,', '\n': '\\n'}
+)
+
+
+def export(
+    contacts: Iterable[AnyContact],
+    filename: str | Path,
+    *,
+    file_format: str | None = None,
+    fields: Iterable[str] = FIELDS
+) -> int:
+    """
+    Write contacts to file, return the number of written contacts.
+
+    Args:
+        - **contacts**: iterable of contacts;
+        - **filename**: name of file or path to file;
+        - **file_format**: key argument - one of `EXPORT_FORMATS`,
+        guessed from the file name if None;
+        - **fields**: key argument - contact fields to write.
+    """
+    file_format = file_format or guess_format(filename)
+    if file_format not in EXPORT_FORMATS:
+        raise ValueError(f'Unknown export format: {file_format}')
+
+    fields = tuple(fields)
+    unknown: set[str] = set(fields) - set(FIELDS)
+    if unknown:
+        raise ValueError(f'Unknown fields: {", ".join(sorted(unknown))}')
+
+    total: int = 0
+
+    def counted() -> Iterator[AnyContact]:
+        nonlocal total
+        for contact in contacts:
+            total += 1
+            yield contact
+
+    filename = Path(filename)
+    temp: Path = filename.with_name(filename.name + '.tmp')
+    try:
+        with _open(temp, gzipped=filename.suffix == GZIP_SUFFIX) as file:
+            WRITERS[file_format](file, counted(), fields)
+        os.replace(temp, filename)
+    finally:
+        temp.unlink(missing_ok=True)
+
+    return total
+
+
+def guess_format(filename: str | Path) -> str:
+    """
+    Return export format by the file extension,
+    `.gz` is skipped, csv by default.
+    """
+    path: Path = Path(filename)
+    if path.suffix == GZIP_SUFFIX:
+        path = path.with_suffix('')
+
+    file_format: str = path.suffix.lstrip('.').lower()
+    return file_format if file_format in EXPORT_FORMATS else 'csv'
+
+
+def _open(filename: Path, gzipped: bool) -> TextIO:
+    """Open text file for writing, gzip-compressed if required."""
+    if gzipped:
+        return gzip.open(filename, 'wt', encoding='utf-8', newline='')
+    return open(filename, 'w', encoding='utf-8', newline='')
+
+
+def _project(contact: AnyContact, fields: tuple) -> list[str | None]:
+    """Return values of the fields."""
+    return [getattr(contact, field) for field in fields]
+
+
+def write_csv(
+    file: TextIO,
+    contacts: Iterable[AnyContact],
+    fields: tuple
+) -> None:
+    """Write header and contacts as csv rows."""
+    writer = csv.writer(file)
+    writer.writerow(fields)
+    writer.writerows(
+        [
+            '' if value is None else value
+            for value in _project(contact, fields)
+        ]
+        for contact in contacts
+    )
+
+
+def write_jsonl(
+    file: TextIO,
+    contacts: Iterable[AnyContact],
+    fields: tuple
+) -> None:
+    """Write contacts as JSON objects, one per line."""
+    file.writelines(
+        json.dumps(
+            dict(zip(fields, _project(contact, fields))), ensure_ascii=False
+        ) + '\n'
+        for contact in contacts
+    )
+
+
+def write_vcf(
+    file: TextIO,
+    contacts: Iterable[AnyContact],
+    fields: tuple
+) -> None:
+    """Write contacts as vCard 3.0 cards."""
+    file.writelines(
+        line + '\r\n'
+        for contact in contacts
+        for line in vcard_lines(contact, fields)
+    )
+
+
+def vcard_lines(contact: AnyContact, fields: tuple) -> Iterator[str]:
+    """
+    Yield folded content lines of the contact card.
+    Name properties (N, FN) are required and always written,
+    with values of the selected fields only.
+    """
+    def value(field: str) -> str:
+        if field not in fields:
+            return ''
+        return (getattr(contact, field) or '').translate(VCARD_ESCAPES)
+
+    names: list[str] = [
+        name for name in map(value, ('first_name', 'surname', 'last_name'))
+        if name
+    ]
+    lines: list[str] = [
+        'BEGIN:VCARD',
+        'VERSION:3.0',
+        f'N:{value("last_name")};{value("first_name")};'
+        f'{value("surname")};;',
+        f'FN:{" ".join(names) or value("company")}',
+    ]
+    if value('company'):
+        lines.append(f'ORG:{value("company")}')
+    if value('mobile'):
+        lines.append(f'TEL;TYPE=CELL:{value("mobile")}')
+    if value('work'):
+        lines.append(f'TEL;TYPE=WORK:{value("work")}')
+    lines.append('END:VCARD')
+
+    for line in lines:
+        yield from _fold(line)
+
+
+def _fold(line: str) -> Iterator[str]:
+    """
+    Split content line into parts of at most `VCARD_LINE_LENGTH`
+    UTF-8 bytes, continuation parts start with a space.
+    """
+    if len(line.encode()) <= VCARD_LINE_LENGTH:
+        yield line
+        return
+
+    part: str = ''
+    size: int = 0
+    for char in line:
+        char_size: int = len(char.encode())
+        if size + char_size > VCARD_LINE_LENGTH:
+            yield part
+            part, size = ' ', 1
+        part += char
+        size += char_size
+
+    yield part
+
+
+WRITERS: dict[str, Callable] = {
+    'csv': write_csv,
+    'jsonl': write_jsonl,
+    'vcf': write_vcf,
+}
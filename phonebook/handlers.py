@@ -9,13 +9,15 @@ Context content:
     * callback:
         - meaning: value that led into the handler;
         - type: str.
-    * contact_list:
-        - meaning: list of Contact models;
-        - type: list[Contact].
+    * total:
+        - meaning: number of contacts in DB,
+        maintained on every add and delete;
+        - type: int.
     * Contact model:
         > contact:
-            - meaning: Contact model;
-            - type: Contact.
+            - meaning: selected contact, record from DB
+            is replaced by the Contact model for editing;
+            - type: Contact | ContactRecord.
         > old_contact:
             - meaning: Contact model before update;
             - type: Contact.
@@ -26,12 +28,16 @@ Context content:
             - meaning: value for Contact field;
             - type: depends on the Contact field type.
     * searching:
+        > prefix_index:
+            - meaning: in-memory index of name prefixes
+            for search-as-you-type, built on the first search;
+            - type: PrefixIndex.
         > search_result:
-            - meaning: list of found Contact models;
-            - type: list[Contact]
+            - meaning: found contact records, sorted by name
+            unless searched with typos;
+            - type: list[ContactRecord] | ContactList.
         > query:
-            - meaning: query string to find a contact
-            in contact list;
+            - meaning: query string to find a contact;
             - type: str.
     * state:
         - meaning: report on the operation of add,
@@ -48,16 +54,29 @@ Context content:
 """
 from typing import Callable
 
-from .constants import PAGE_SIZE, Button, ReportState
+from .constants import (
+    FUZZY_PREFIX,
+    ORDER_BY_NAME,
+    PAGE_SIZE,
+    USE_SNAPSHOT,
+    Button,
+)
 from .ioworkers import console
 from .managers import get_allowed_options, render
-from .messages import help_message, request_action, print_report
-from .models import Contact, TOTAL_FIELDS
+from .indexes import PrefixIndex
+from .messages import (
+    ReportState,
+    help_message,
+    print_report,
+    request_action,
+    search_hint,
+)
+from .models import Contact, ContactRecord, TOTAL_FIELDS
+from .ordering import ContactList
 from .storages import PhoneBook
 from .utils import (
     calc_total_pages,
     get_paginate_bound,
-    remove_item,
     remove_keys_from_dict,
 )
 from .validators import validate_field
@@ -66,7 +85,8 @@ from .validators import validate_field
 def main_menu(context: dict) -> None:
     """
     Main menu handler.
-    Display a list contacts sorted by name.
+    Display a list contacts sorted by name,
+    only contacts of the current page are loaded from DB.
 
     Available:
         - pagination contacts;
@@ -78,15 +98,15 @@ def main_menu(context: dict) -> None:
     console.clear()
 
     context['handler'] = main_menu
-    contacts: list[Contact] = context.get('contact_list')
     options: dict = get_allowed_options(main_menu)
 
-    begin, end = get_paginate_bound(
-        page=context.get('page'),
-        per_page=context.get('per_page'),
-        total_pages=context.get('total_pages')
+    page: int = context.get('page')
+    if not 1 <= page <= context.get('total_pages'):
+        page = 1
+
+    contacts_per_page: list = PhoneBook().iter_page(
+        page, context.get('per_page'), order=ORDER_BY_NAME
     )
-    contacts_per_page: list = contacts[begin:end]
     options.update(
         **dict.fromkeys(
             (str(i) for i in range(1, len(contacts_per_page) + 1)),
@@ -97,7 +117,8 @@ def main_menu(context: dict) -> None:
     render_data: dict = {
         'page': context.get('page'),
         'total_pages': context.get('total_pages'),
-        'contacts': contacts_per_page
+        'contacts': contacts_per_page,
+        'pending': PhoneBook().pending_writes(),
     }
     render(main_menu, render_data)
 
@@ -161,9 +182,8 @@ def create_update_contact(context: dict) -> None:
     else:
         context['contact'] = contact
 
-    contacts: list = context.get('contact_list')
     context['total_pages'] = calc_total_pages(
-        contacts, context.get('per_page')
+        context.get('total'), context.get('per_page')
     )
 
     console.clear()
@@ -191,6 +211,10 @@ def edit_contact(context: dict) -> None:
         - delete contact;
         - cancel operation.
     """
+    contact: Contact | ContactRecord = context.get('contact')
+    if isinstance(contact, ContactRecord):
+        context['contact'] = contact.to_contact()
+
     context['handler'] = edit_contact
     create_update_contact(context)
 
@@ -226,11 +250,17 @@ def search_query(context: dict) -> None:
     """Request a search string."""
     console.clear()
 
-    search_string: str = console.read('Enter a search string: ')
+    if 'prefix_index' not in context:
+        context['prefix_index'] = PhoneBook().prefix_index()
+
+    prefix_index: PrefixIndex = context.get('prefix_index')
+    search_string: str = console.read_live(
+        'Enter a search string: ',
+        lambda text: search_hint(prefix_index, text)
+    )
     if not search_string:
-        contacts: list = context.get('contact_list')
         context['total_pages'] = calc_total_pages(
-            contacts, context.get('per_page')
+            context.get('total'), context.get('per_page')
         )
         main_menu(context)
 
@@ -241,6 +271,8 @@ def search_query(context: dict) -> None:
 def find_contacts(context: dict) -> None:
     """
     Handler for searching contacts.
+    Query starting with `FUZZY_PREFIX` searches names
+    and companies with typos.
 
     Available:
         - pagination contacts;
@@ -256,9 +288,19 @@ def find_contacts(context: dict) -> None:
     phone_book: PhoneBook = PhoneBook()
 
     if 'search_result' in context:
-        contacts: list[Contact] = context.get('search_result')
+        contacts: list[ContactRecord] | ContactList = context.get(
+            'search_result'
+        )
+    elif search_string.startswith(FUZZY_PREFIX):
+        contacts: list[ContactRecord] = phone_book.find_similar(
+            search_string.removeprefix(FUZZY_PREFIX),
+            prefix_index=context.get('prefix_index')
+        )
+        context['search_result'] = contacts
     else:
-        contacts: list[Contact] = phone_book.find_all(search_string)
+        contacts: ContactList = ContactList(
+            phone_book.find_all(search_string)
+        )
         context['search_result'] = contacts
 
     begin, end = get_paginate_bound(
@@ -268,13 +310,16 @@ def find_contacts(context: dict) -> None:
     )
     contacts_per_page: list = contacts[begin:end]
 
-    total_pages: int = calc_total_pages(contacts, context.get('per_page'))
+    total_pages: int = calc_total_pages(
+        len(contacts), context.get('per_page')
+    )
     context['total_pages'] = total_pages
 
     render_data: dict = {
         'page': context.get('page'),
         'total_pages': total_pages,
         'contacts': contacts_per_page,
+        'pending': phone_book.pending_writes(),
     }
     render(find_contacts, render_data)
 
@@ -294,12 +339,11 @@ def find_contacts(context: dict) -> None:
         if action in (Button.CANCEL, Button.FIND):
             context.pop('search_result')
 
-        contacts: list = context.get('contact_list')
         context.update(
             {
                 'page': 1,
                 'total_pages': calc_total_pages(
-                    contacts, context.get('per_page')
+                    context.get('total'), context.get('per_page')
                 ),
                 'callback': find_contacts.__name__
             }
@@ -381,9 +425,12 @@ def connect_database(context: dict, mode: str) -> None:
     """
     Connects to the database and applies operations
     depending on the selected mode.
+    Changes are written to DB by the writer thread,
+    see `PhoneBook.write_behind`.
     """
     contact: Contact = context.get('contact')
-    contacts: list[Contact] = context.get('contact_list')
+    total: int = context.get('total')
+    prefix_index: PrefixIndex | None = context.get('prefix_index')
     old_contact: Contact | None = None
     state: str = ReportState.DONOTHING
 
@@ -397,27 +444,30 @@ def connect_database(context: dict, mode: str) -> None:
 
     phone_book: PhoneBook = PhoneBook(contact)
 
-    if mode.startswith('save') and contact not in contacts:
+    if mode.startswith('save') and not phone_book.has_duplicate():
         phone_book.save()
-        contacts.append(contact)
+        total += 1
         state = ReportState.ACCEPT
 
+        if prefix_index is not None:
+            prefix_index.add(contact)
+
     elif mode.startswith('update') and old_contact:
         phone_book.update()
-        contacts = remove_item(contacts, old_contact)
-        contacts.append(contact)
         state = ReportState.ACCEPT
 
+        if prefix_index is not None:
+            prefix_index.discard(old_contact)
+            prefix_index.add(contact)
+
     elif mode.startswith('remove'):
         phone_book.remove()
-
-        if old_contact:
-            contacts = remove_item(contacts, old_contact)
-        else:
-            contacts = remove_item(contacts, contact)
-
+        total -= 1
         state = ReportState.ACCEPT
 
+        if prefix_index is not None:
+            prefix_index.discard(old_contact or contact)
+
     keys_to_remove: tuple = (
         'callback',
         'field',
@@ -430,11 +480,9 @@ def connect_database(context: dict, mode: str) -> None:
     context.update(
         {
             'contact': Contact(),
-            'contact_list': contacts,
+            'total': total,
             'page': 1,
-            'total_pages': calc_total_pages(
-                contacts, context.get('per_page')
-            ),
+            'total_pages': calc_total_pages(total, context.get('per_page')),
             'state': state,
         }
     )
@@ -442,12 +490,18 @@ def connect_database(context: dict, mode: str) -> None:
 
 def run_app():
     """Running application in cycle."""
-    contacts: list[Contact] = PhoneBook().load()
+    phone_book: PhoneBook = PhoneBook()
+    phone_book.recover()
+    if USE_SNAPSHOT and not phone_book.snapshot_is_fresh():
+        phone_book.refresh_snapshot()
+    phone_book.write_behind()
+
+    total: int = phone_book.count()
     context: dict = {
             'page': 1,
             'per_page': PAGE_SIZE,
-            'total_pages': calc_total_pages(contacts, PAGE_SIZE),
-            'contact_list': contacts,
+            'total_pages': calc_total_pages(total, PAGE_SIZE),
+            'total': total,
     }
 
     while True:
@@ -455,5 +509,16 @@ def run_app():
 
 
 def quit_app(context: dict | None = None):
-    """Escape from application."""
+    """
+    Escape from application.
+    Pending changes are written to disk before exit,
+    then text file mirror is compacted, so it has no stale rows.
+    """
+    phone_book: PhoneBook = PhoneBook()
+    pending: int = phone_book.pending_writes()
+    if pending:
+        console.write(f'Writing {pending} pending changes...')
+        console.flush()
+    phone_book.stop_write_behind()
+    phone_book.compact_mirror()
     console.exit()
@@ -0,0 +1,921 @@
+"""
+Persistent search indexes of the Phonebook.
+
+Indexes live in a SQLite file next to the contacts DB
+and are kept up to date by every write of the Phonebook.
+
+Trigram index:
+    - every contact is stored as a document - its precompiled
+    search text (see `matching` module);
+    - posting lists map each trigram (3 chars) of the documents
+    to the contact IDs containing it;
+    - a substring query intersects the posting lists
+    of its trigrams, candidates are verified against documents;
+    - queries shorter than 3 chars can't be answered by posting lists,
+    search falls back to the single pass over all documents.
+
+Phone index:
+    - mobile and work numbers are normalized to digits only
+    (see `validators.normalize_phone`) and stored reversed;
+    - exact lookup is an equality match, lookup by the last N digits
+    is a prefix range scan of the reversed numbers,
+    both use the B-tree of the table.
+
+Name tokens:
+    - case-folded words of the name and company fields
+    (see `matching.name_tokens`) with their contact IDs;
+    - loaded into the in-memory `PrefixIndex` for search-as-you-type
+    and typo-tolerant search.
+
+Fingerprints:
+    - every contact is stored with the bit mask of its fields
+    with a value and the fingerprint of these fields
+    (see `matching.fingerprint`);
+    - a contact is a duplicate of an indexed one if its fingerprint
+    over the indexed mask is the same: unset fields of the indexed
+    contact act as wildcards, like in `ContactBaseModel.__eq__`;
+    - distinct masks are counted in their own table, updated
+    with the fingerprints, so they are read without a scan;
+    - a check is one hash lookup per distinct mask, at most 2**6.
+
+Natural keys:
+    - natural key of every contact (see `matching.natural_key`)
+    with its contact ID;
+    - contact IDs are surrogate and don't change on edits,
+    the natural key finds the saved contact with the same values.
+
+Collation:
+    - collation key of every contact: case-folded last name,
+    first name and company with the contact ID
+    (see `ordering.collation_key`);
+    - the B-tree of the table keeps contacts sorted by name,
+    a page of the contact list is a range of the B-tree
+    that starts after a key (keyset pagination), so paging costs
+    the same at any position, only contacts of the page
+    are loaded from DB.
+"""
+import sqlite3
+from bisect import bisect_left, insort
+from collections import Counter
+from itertools import islice
+from pathlib import Path
+from typing import Collection, Iterable, Iterator
+
+from .backends import Session
+from .constants import (
+    FUZZY_DISTANCE,
+    INDEX_PATH,
+    PREFIX_LIMIT,
+    TRIGRAM_SIZE,
+    UPLOAD_BATCH_SIZE,
+)
+from .matching import (
+    FIELD_SEPARATOR,
+    Matcher,
+    field_mask,
+    fingerprint,
+    name_tokens,
+    natural_key,
+    record_text,
+)
+from .models import AnyContact
+from .ordering import collation_key
+from .stats import stats
+from .validators import normalize_phone
+
+
+DIGITS_END: str = chr(ord('9') + 1)
+
+
+class ContactIndex(Session):
+    """
+    Sidecar SQLite file with search indexes of contacts.
+    Index is rebuilt if it was built by another `version`.
+    """
+
+    version: int = 9
+
+    _schema: str = """
+        CREATE TABLE IF NOT EXISTS meta (
+            key TEXT PRIMARY KEY,
+            value TEXT
+        );
+        CREATE TABLE IF NOT EXISTS documents (
+            contact_id TEXT PRIMARY KEY,
+            document TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS trigrams (
+            trigram TEXT,
+            contact_id TEXT,
+            PRIMARY KEY (trigram, contact_id)
+        ) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS phones (
+            reversed_digits TEXT,
+            contact_id TEXT,
+            PRIMARY KEY (reversed_digits, contact_id)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS phones_contact ON phones (contact_id);
+        CREATE TABLE IF NOT EXISTS tokens (
+            token TEXT,
+            contact_id TEXT,
+            PRIMARY KEY (token, contact_id)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS tokens_contact ON tokens (contact_id);
+        CREATE TABLE IF NOT EXISTS fingerprints (
+            mask INTEGER,
+            fingerprint TEXT,
+            contact_id TEXT,
+            PRIMARY KEY (mask, fingerprint, contact_id)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS fingerprints_contact
+            ON fingerprints (contact_id);
+        CREATE TABLE IF NOT EXISTS masks (
+            mask INTEGER PRIMARY KEY,
+            refs INTEGER NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS collation (
+            last_name TEXT,
+            first_name TEXT,
+            company TEXT,
+            contact_id TEXT,
+            PRIMARY KEY (last_name, first_name, company, contact_id)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS collation_contact
+            ON collation (contact_id);
+        CREATE TABLE IF NOT EXISTS natural_keys (
+            natural_key TEXT,
+            contact_id TEXT,
+            PRIMARY KEY (natural_key, contact_id)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS natural_keys_contact
+            ON natural_keys (contact_id);
+    """
+    _tables: tuple = (
+        'documents',
+        'trigrams',
+        'phones',
+        'tokens',
+        'fingerprints',
+        'masks',
+        'collation',
+        'natural_keys',
+    )
+
+    def __init__(self, filename: str | Path = INDEX_PATH) -> None:
+        super().__init__(filename)
+
+    def __contains__(self, contact_id: str) -> bool:
+        with self._session() as db:
+            return db.execute(
+                'SELECT 1 FROM documents WHERE contact_id = ?', (contact_id,)
+            ).fetchone() is not None
+
+    def _open(self) -> sqlite3.Connection:
+        db = sqlite3.connect(self.filename)
+        db.execute('PRAGMA journal_mode=WAL')
+        db.execute('PRAGMA synchronous=NORMAL')
+        db.executescript(self._schema)
+        return db
+
+    def _close(self, db: sqlite3.Connection) -> None:
+        db.commit()
+        db.close()
+
+    def commit(self) -> None:
+        if self._db is not None:
+            self._db.commit()
+
+    def is_built_for(self, storage_uri: str) -> bool:
+        """Checking that index was built from the given storage."""
+        with self._session() as db:
+            row = db.execute(
+                'SELECT value FROM meta WHERE key = ?', ('storage',)
+            ).fetchone()
+        return row is not None and row[0] == self._stamp(storage_uri)
+
+    def rebuild(
+        self,
+        contacts: Iterable[AnyContact],
+        storage_uri: str
+    ) -> None:
+        """
+        Drop all indexed data and index contacts from scratch.
+
+        Args:
+            - **contacts**: all contacts of the storage;
+            - **storage_uri**: backend name and path of the storage.
+        """
+        contacts = iter(contacts)
+        with self:
+            for table in self._tables:
+                self._db.execute(f'DELETE FROM {table}')
+
+            while batch := list(islice(contacts, UPLOAD_BATCH_SIZE)):
+                self.add(batch)
+
+            self._db.execute(
+                'INSERT OR REPLACE INTO meta VALUES (?, ?)',
+                ('storage', self._stamp(storage_uri))
+            )
+
+    def add(self, contacts: Iterable[AnyContact]) -> None:
+        """Index contacts, replacing already indexed ones."""
+        contacts: dict[str, AnyContact] = {
+            contact._id: contact for contact in contacts
+        }
+        if not contacts:
+            return
+
+        documents: dict[str, str] = {
+            contact_id: record_text(contact)
+            for contact_id, contact in contacts.items()
+        }
+        with self._session() as db:
+            self._discard(db, contacts)
+            db.executemany(
+                'INSERT INTO documents VALUES (?, ?)', documents.items()
+            )
+            db.executemany(
+                'INSERT OR IGNORE INTO phones VALUES (?, ?)',
+                (
+                    (digits[::-1], contact_id)
+                    for contact_id, contact in contacts.items()
+                    for digits in map(
+                        normalize_phone, (contact.mobile, contact.work)
+                    )
+                    if digits
+                )
+            )
+            db.executemany(
+                'INSERT INTO tokens VALUES (?, ?)',
+                (
+                    (token, contact_id)
+                    for contact_id, contact in contacts.items()
+                    for token in name_tokens(contact)
+                )
+            )
+            masks: dict[str, int] = {
+                contact_id: field_mask(contact)
+                for contact_id, contact in contacts.items()
+            }
+            db.executemany(
+                'INSERT INTO fingerprints VALUES (?, ?, ?)',
+                (
+                    (mask, fingerprint(contacts[contact_id], mask), contact_id)
+                    for contact_id, mask in masks.items()
+                )
+            )
+            db.executemany(
+                'INSERT INTO masks VALUES (?, ?) '
+                'ON CONFLICT (mask) DO UPDATE SET refs = refs + excluded.refs',
+                Counter(masks.values()).items()
+            )
+            db.executemany(
+                'INSERT INTO collation VALUES (?, ?, ?, ?)',
+                map(collation_key, contacts.values())
+            )
+            db.executemany(
+                'INSERT INTO natural_keys VALUES (?, ?)',
+                (
+                    (natural_key(contact), contact_id)
+                    for contact_id, contact in contacts.items()
+                )
+            )
+            db.executemany(
+                'INSERT INTO trigrams VALUES (?, ?)',
+                (
+                    (trigram, contact_id)
+                    for contact_id, document in documents.items()
+                    for trigram in trigrams(document)
+                )
+            )
+
+    def discard(self, contact_ids: Iterable[str]) -> None:
+        """Remove contacts from index."""
+        with self._session() as db:
+            self._discard(db, contact_ids)
+
+    def search(self, pattern: str) -> list[str]:
+        """
+        Return IDs of contacts containing pattern.
+
+        Args:
+            - **pattern**: substring to search.
+        """
+        matcher: Matcher = Matcher(pattern)
+        query_trigrams: set[str] = trigrams(matcher.pattern)
+
+        with self._session() as db:
+            if not query_trigrams:
+                found: list[str] = []
+                scanned: int = 0
+                for contact_id, document in db.execute(
+                    'SELECT contact_id, document FROM documents '
+                    'ORDER BY contact_id'
+                ):
+                    scanned += 1
+                    if matcher(document):
+                        found.append(contact_id)
+                stats.count('index.scanned', scanned)
+                return found
+
+            postings: list[set[str]] = []
+            for trigram in query_trigrams:
+                posting: set[str] = {
+                    contact_id for contact_id, in db.execute(
+                        'SELECT contact_id FROM trigrams WHERE trigram = ?',
+                        (trigram,)
+                    )
+                }
+                if not posting:
+                    return []
+                postings.append(posting)
+
+            postings.sort(key=len)
+            candidates: list[str] = sorted(set.intersection(*postings))
+            stats.count('index.scanned', len(candidates))
+
+            return [
+                contact_id for contact_id, document in _fetch_documents(
+                    db, candidates
+                )
+                if matcher(document)
+            ]
+
+    def find_phone(
+        self,
+        number: str,
+        *,
+        suffix: int | None = None
+    ) -> list[str]:
+        """
+        Return IDs of contacts with the phone number.
+
+        Args:
+            - **number**: phone number in any format;
+            - **suffix**: key argument - compare only
+            the last `suffix` digits of the number.
+        """
+        reversed_digits: str = phone_key(number, suffix)
+        if not reversed_digits:
+            return []
+
+        with self._session() as db:
+            if suffix is None:
+                rows = db.execute(
+                    'SELECT contact_id FROM phones '
+                    'WHERE reversed_digits = ?',
+                    (reversed_digits,)
+                )
+            else:
+                rows = db.execute(
+                    'SELECT DISTINCT contact_id FROM phones '
+                    'WHERE reversed_digits >= ? AND reversed_digits < ?',
+                    (reversed_digits, reversed_digits + DIGITS_END)
+                )
+            return sorted({contact_id for contact_id, in rows})
+
+    def masks(self) -> set[int]:
+        """Return distinct field masks of indexed contacts."""
+        with self._session() as db:
+            return {
+                mask for mask, in db.execute(
+                    'SELECT mask FROM masks'
+                )
+            }
+
+    def find_duplicate(
+        self,
+        contact: AnyContact,
+        masks: Iterable[int],
+        exclude: Collection[str] = ()
+    ) -> str | None:
+        """
+        Return ID of an indexed contact equal to the contact.
+
+        Args:
+            - **contact**: contact to check;
+            - **masks**: field masks of indexed contacts,
+            see `masks` method;
+            - **exclude**: IDs of contacts to skip.
+        """
+        with self._session() as db:
+            for mask in masks:
+                for contact_id, in db.execute(
+                    'SELECT contact_id FROM fingerprints '
+                    'WHERE mask = ? AND fingerprint = ?',
+                    (mask, fingerprint(contact, mask))
+                ):
+                    if contact_id not in exclude:
+                        return contact_id
+
+        return None
+
+    def find_key(
+        self,
+        contact: AnyContact,
+        exclude: Collection[str] = ()
+    ) -> str | None:
+        """
+        Return ID of an indexed contact with the same natural key.
+
+        Args:
+            - **contact**: contact to find;
+            - **exclude**: IDs of contacts to skip.
+        """
+        with self._session() as db:
+            for contact_id, in db.execute(
+                'SELECT contact_id FROM natural_keys WHERE natural_key = ?',
+                (natural_key(contact),)
+            ):
+                if contact_id not in exclude:
+                    return contact_id
+
+        return None
+
+    def after(
+        self,
+        key: tuple[str, ...] | None,
+        limit: int,
+        exclude: Collection[str] = (),
+        *,
+        inclusive: bool = False
+    ) -> list[tuple[str, ...]]:
+        """
+        Return collation keys of contacts sorted by name
+        that follow the key, see `ordering.collation_key`.
+        Seeks the B-tree of the collation table,
+        so the cost doesn't depend on the position of the key.
+
+        Args:
+            - **key**: collation key, first contacts if None;
+            - **limit**: maximum number of keys;
+            - **exclude**: IDs of contacts to skip;
+            - **inclusive**: key argument - boolean flag
+            to return the key itself too.
+        """
+        return self._seek(
+            key, '>=' if inclusive else '>', 'ASC', limit, exclude
+        )
+
+    def before(
+        self,
+        key: tuple[str, ...],
+        limit: int,
+        exclude: Collection[str] = ()
+    ) -> list[tuple[str, ...]]:
+        """
+        Return collation keys of contacts sorted by name
+        that precede the key, the closest `limit` ones.
+
+        Args:
+            - **key**: collation key, see `ordering.collation_key`;
+            - **limit**: maximum number of keys;
+            - **exclude**: IDs of contacts to skip.
+        """
+        return self._seek(key, '<', 'DESC', limit, exclude)[::-1]
+
+    def collation_page(
+        self,
+        offset: int,
+        limit: int,
+        exclude: Collection[str] = ()
+    ) -> list[tuple[str, ...]]:
+        """
+        Return collation keys of contacts sorted by name
+        by position. Skipped contacts are read,
+        prefer `after` and `before` for neighbouring pages.
+
+        Args:
+            - **offset**: number of contacts to skip;
+            - **limit**: maximum number of keys;
+            - **exclude**: IDs of contacts to skip,
+            they aren't counted in offset.
+        """
+        with self._session() as db:
+            return db.execute(
+                'SELECT last_name, first_name, company, contact_id '
+                'FROM collation '
+                f'WHERE contact_id NOT IN ({_placeholders(exclude)}) '
+                'ORDER BY last_name, first_name, company, contact_id '
+                'LIMIT ? OFFSET ?',
+                (*exclude, limit, offset)
+            ).fetchall()
+
+    def name_tokens(self) -> Iterator[tuple[str, str]]:
+        """Yield name tokens with contact IDs ordered by token."""
+        with self._session() as db:
+            yield from db.execute(
+                'SELECT token, contact_id FROM tokens ORDER BY token'
+            )
+
+    def _seek(
+        self,
+        key: tuple[str, ...] | None,
+        operator: str,
+        direction: str,
+        limit: int,
+        exclude: Collection[str]
+    ) -> list[tuple[str, ...]]:
+        """Return collation keys compared with the key by operator."""
+        condition: str = ''
+        if key is not None:
+            condition = (
+                f'(last_name, first_name, company, contact_id) {operator} '
+                '(?, ?, ?, ?) AND '
+            )
+        with self._session() as db:
+            return db.execute(
+                'SELECT last_name, first_name, company, contact_id '
+                f'FROM collation WHERE {condition}'
+                f'contact_id NOT IN ({_placeholders(exclude)}) '
+                f'ORDER BY last_name {direction}, first_name {direction}, '
+                f'company {direction}, contact_id {direction} '
+                'LIMIT ?',
+                (*(key or ()), *exclude, limit)
+            ).fetchall()
+
+    def _stamp(self, storage_uri: str) -> str:
+        """Return stamp of the indexed storage and index version."""
+        return f'{storage_uri}#{self.version}'
+
+    def _discard(
+        self,
+        db: sqlite3.Connection,
+        contact_ids: Iterable[str]
+    ) -> None:
+        """Remove documents and their trigrams from index."""
+        old_documents: list[tuple[str, str]] = [
+            *_fetch_documents(db, contact_ids)
+        ]
+        db.executemany(
+            'DELETE FROM trigrams WHERE trigram = ? AND contact_id = ?',
+            (
+                (trigram, contact_id)
+                for contact_id, document in old_documents
+                for trigram in trigrams(document)
+            )
+        )
+        db.executemany(
+            'DELETE FROM documents WHERE contact_id = ?',
+            ((contact_id,) for contact_id, _ in old_documents)
+        )
+        old_masks: Counter = Counter(
+            mask for contact_id, _ in old_documents
+            for mask, in db.execute(
+                'SELECT mask FROM fingerprints WHERE contact_id = ?',
+                (contact_id,)
+            )
+        )
+        db.executemany(
+            'UPDATE masks SET refs = refs - ? WHERE mask = ?',
+            ((refs, mask) for mask, refs in old_masks.items())
+        )
+        if old_masks:
+            db.execute('DELETE FROM masks WHERE refs <= 0')
+        for table in (
+            'phones', 'tokens', 'fingerprints', 'collation', 'natural_keys'
+        ):
+            db.executemany(
+                f'DELETE FROM {table} WHERE contact_id = ?',
+                ((contact_id,) for contact_id, _ in old_documents)
+            )
+
+
+def trigrams(text: str) -> set[str]:
+    """Return all trigrams of the text that don't cross field bounds."""
+    return {
+        text[i:i + TRIGRAM_SIZE]
+        for i in range(len(text) - TRIGRAM_SIZE + 1)
+        if FIELD_SEPARATOR not in text[i:i + TRIGRAM_SIZE]
+    }
+
+
+def phone_key(number: str | None, suffix: int | None = None) -> str:
+    """
+    Return reversed digits of the phone number as stored in index,
+    only the last `suffix` digits if it's passed.
+    """
+    reversed_digits: str = normalize_phone(number)[::-1]
+    if suffix is not None:
+        reversed_digits = reversed_digits[:suffix]
+    return reversed_digits
+
+
+def has_phone(
+    contact: AnyContact,
+    number: str,
+    suffix: int | None = None
+) -> bool:
+    """
+    Checking that mobile or work phone of the contact is the number,
+    compares only the last `suffix` digits if it's passed.
+    """
+    reversed_digits: str = phone_key(number, suffix)
+    if not reversed_digits:
+        return False
+
+    return any(
+        phone_key(phone) == reversed_digits if suffix is None
+        else phone_key(phone).startswith(reversed_digits)
+        for phone in (contact.mobile, contact.work)
+    )
+
+
+def _placeholders(values: Collection) -> str:
+    """Return SQL placeholders of the values."""
+    return ', '.join('?' * len(values))
+
+
+def _fetch_documents(
+    db: sqlite3.Connection,
+    contact_ids: Iterable[str]
+) -> Iterator[tuple[str, str]]:
+    """Yield ID and document of indexed contacts."""
+    for contact_id in contact_ids:
+        row = db.execute(
+            'SELECT document FROM documents WHERE contact_id = ?',
+            (contact_id,)
+        ).fetchone()
+        if row:
+            yield contact_id, row[0]
+
+
+class DuplicateIndex:
+    """
+    In-memory hash index of contact fingerprints.
+
+    Every contact is keyed by its field mask and the fingerprint
+    of the fields in the mask. Checking a contact looks up
+    its fingerprint over each distinct mask of indexed contacts,
+    the mask with all fields first, so the unset fields
+    of indexed contacts act as wildcards like in `__eq__`.
+    """
+
+    def __init__(self, contacts: Iterable[AnyContact] = ()) -> None:
+        self._keys: dict[tuple[int, str], set[str | None]] = {}
+        self._masks: Counter = Counter()
+        for contact in contacts:
+            self.add(contact)
+
+    def __contains__(self, contact: AnyContact) -> bool:
+        return any(
+            (mask, fingerprint(contact, mask)) in self._keys
+            for mask in sorted(self._masks, reverse=True)
+        )
+
+    def add(self, contact: AnyContact) -> None:
+        """Insert contact fingerprint."""
+        mask: int = field_mask(contact)
+        key: tuple[int, str] = (mask, fingerprint(contact, mask))
+        contact_ids: set = self._keys.setdefault(key, set())
+        if contact._id not in contact_ids:
+            contact_ids.add(contact._id)
+            self._masks[mask] += 1
+
+    def discard(self, contact: AnyContact) -> None:
+        """Delete contact fingerprint."""
+        mask: int = field_mask(contact)
+        key: tuple[int, str] = (mask, fingerprint(contact, mask))
+        contact_ids: set | None = self._keys.get(key)
+        if not contact_ids or contact._id not in contact_ids:
+            return
+
+        contact_ids.discard(contact._id)
+        if not contact_ids:
+            del self._keys[key]
+
+        self._masks[mask] -= 1
+        if not self._masks[mask]:
+            del self._masks[mask]
+
+
+class BKTree:
+    """
+    Burkhard-Keller tree of words by Levenshtein distance.
+
+    Children of a node are keyed by their distance to the node,
+    so by the triangle inequality a search within `max_distance`
+    visits only children keyed from d - max_distance
+    to d + max_distance and skips the rest of the vocabulary.
+    Words can't be deleted, callers filter out stale ones.
+    """
+
+    def __init__(self, words: Iterable[str] = ()) -> None:
+        self._root: tuple[str, dict] | None = None
+        for word in words:
+            self.add(word)
+
+    def add(self, word: str) -> None:
+        """Insert word into the tree."""
+        if self._root is None:
+            self._root = (word, {})
+            return
+
+        node_word, children = self._root
+        while True:
+            distance: int = levenshtein(word, node_word)
+            if not distance:
+                return
+
+            if distance not in children:
+                children[distance] = (word, {})
+                return
+
+            node_word, children = children[distance]
+
+    def search(self, word: str, max_distance: int) -> list[tuple[int, str]]:
+        """Return pairs of distance and word within `max_distance`."""
+        if self._root is None:
+            return []
+
+        found: list[tuple[int, str]] = []
+        nodes: list[tuple[str, dict]] = [self._root]
+        while nodes:
+            node_word, children = nodes.pop()
+            distance: int = levenshtein(word, node_word)
+            if distance <= max_distance:
+                found.append((distance, node_word))
+
+            nodes.extend(
+                child for key, child in children.items()
+                if distance - max_distance <= key <= distance + max_distance
+            )
+
+        return sorted(found)
+
+
+class PrefixIndex:
+    """
+    In-memory prefix index of name tokens for search-as-you-type.
+
+    Distinct tokens are kept in a sorted list, so all tokens
+    with a prefix are a contiguous range found by bisect.
+    Every token maps to the set of IDs of contacts containing it.
+    Contacts are inserted and deleted incrementally.
+
+    Typo-tolerant search uses a `BKTree` over the same tokens,
+    built on the first fuzzy query.
+    """
+
+    def __init__(self, entries: Iterable[tuple[str, str]] = ()) -> None:
+        """
+        Args:
+            - **entries**: pairs of token and contact ID
+            ordered by token.
+        """
+        self._tokens: list[str] = []
+        self._postings: dict[str, set[str]] = {}
+        self._bktree: BKTree | None = None
+
+        for token, contact_id in entries:
+            if token not in self._postings:
+                self._tokens.append(token)
+                self._postings[token] = set()
+            self._postings[token].add(contact_id)
+
+    def __len__(self) -> int:
+        return len(self._tokens)
+
+    def add(self, contact: AnyContact) -> None:
+        """Insert name tokens of the contact."""
+        for token in name_tokens(contact):
+            if token not in self._postings:
+                insort(self._tokens, token)
+                self._postings[token] = set()
+                if self._bktree is not None:
+                    self._bktree.add(token)
+            self._postings[token].add(contact._id)
+
+    def discard(self, contact: AnyContact) -> None:
+        """Delete name tokens of the contact."""
+        for token in name_tokens(contact):
+            contact_ids: set[str] | None = self._postings.get(token)
+            if contact_ids is None:
+                continue
+
+            contact_ids.discard(contact._id)
+            if not contact_ids:
+                del self._postings[token]
+                del self._tokens[bisect_left(self._tokens, token)]
+
+    def complete(self, prefix: str, limit: int = PREFIX_LIMIT) -> list[str]:
+        """Return first `limit` tokens starting with prefix."""
+        return list(islice(self._iter_range(prefix), limit))
+
+    def find(self, prefix: str, limit: int | None = None) -> list[str]:
+        """Return IDs of contacts with a token starting with prefix."""
+        contact_ids: set[str] = set()
+        for token in self._iter_range(prefix):
+            if limit is None:
+                contact_ids |= self._postings[token]
+                continue
+
+            for contact_id in self._postings[token]:
+                contact_ids.add(contact_id)
+                if len(contact_ids) >= limit:
+                    return sorted(contact_ids)
+
+        return sorted(contact_ids)
+
+    def similar(
+        self,
+        word: str,
+        max_distance: int = FUZZY_DISTANCE
+    ) -> list[tuple[int, str]]:
+        """
+        Return pairs of distance and token within `max_distance`
+        edits of the word, closest first.
+        """
+        if self._bktree is None:
+            self._bktree = BKTree(self._tokens)
+
+        return [
+            (distance, token)
+            for distance, token in self._bktree.search(
+                word.casefold(), max_distance
+            )
+            if token in self._postings
+        ]
+
+    def find_similar(
+        self,
+        text: str,
+        max_distance: int = FUZZY_DISTANCE
+    ) -> list[str]:
+        """
+        Return IDs of contacts that have a token within
+        `max_distance` edits of every word of the text,
+        ranked by the total distance.
+        """
+        scores: dict[str, int] | None = None
+        for word in text.split():
+            distances: dict[str, int] = {}
+            for distance, token in self.similar(word, max_distance):
+                for contact_id in self._postings[token]:
+                    distances.setdefault(contact_id, distance)
+
+            if scores is None:
+                scores = distances
+            else:
+                scores = {
+                    contact_id: score + distances[contact_id]
+                    for contact_id, score in scores.items()
+                    if contact_id in distances
+                }
+
+        return sorted(scores or (), key=lambda key: (scores[key], key))
+
+    def _iter_range(self, prefix: str) -> Iterator[str]:
+        """Yield tokens starting with prefix in sorted order."""
+        prefix = prefix.casefold()
+        if not prefix:
+            return
+
+        for i in range(bisect_left(self._tokens, prefix), len(self._tokens)):
+            token: str = self._tokens[i]
+            if not token.startswith(prefix):
+                return
+            yield token
+
+
+def levenshtein(first: str, second: str) -> int:
+    """
+    Return edit distance between two strings.
+    Bit-parallel algorithm of Myers: one column of the distance
+    matrix is a pair of bit vectors updated per char of the longer string.
+    """
+    if len(first) < len(second):
+        first, second = second, first
+
+    if not second:
+        return len(first)
+
+    positions: dict[str, int] = {}
+    for i, char in enumerate(second):
+        positions[char] = positions.get(char, 0) | 1 << i
+
+    mask: int = (1 << len(second)) - 1
+    last: int = 1 << (len(second) - 1)
+    plus: int = mask
+    minus: int = 0
+    distance: int = len(second)
+
+    for char in first:
+        equal: int = positions.get(char, 0)
+        vertical: int = equal | minus
+        horizontal: int = (((equal & plus) + plus) ^ plus) | equal
+        h_plus: int = minus | ~(horizontal | plus)
+        h_minus: int = plus & horizontal
+
+        if h_plus & last:
+            distance += 1
+        elif h_minus & last:
+            distance -= 1
+
+        h_plus = (h_plus << 1) | 1
+        h_minus <<= 1
+        plus = (h_minus | ~(vertical | h_plus)) & mask
+        minus = h_plus & vertical
+
+    return distance
@@ -1,34 +1,209 @@
+"""
+Console I/O of the Phonebook.
+
+Screens are drawn as frames:
+    * frame:
+        - `clear` starts a frame, following writes are composed
+        in a buffer instead of being printed one by one;
+        - the frame is drawn by `flush` in a single write,
+        reads flush it before the prompt;
+    * drawing (see `Screen`):
+        - ANSI escape codes are used instead of a `clear`
+        subprocess;
+        - only rows changed since the previous frame are rewritten.
+
+Writes outside of a frame are printed at once, as before.
+"""
 import os
 import sys
-from typing import Any
+from typing import Any, Callable
 
 
 FIELD_SEP_LENGTH: int = 30
 
+CLEAR_SCREEN: str = '\x1b[H\x1b[2J'
+
+DEFAULT_TERMINAL_SIZE: os.terminal_size = os.terminal_size((80, 24))
+
+
+class Screen:
+    """
+    Rows of the terminal screen drawn by the last frame.
+
+    Frame is drawn over the previous one in one of two ways:
+        - full redraw: screen is cleared and the whole frame
+        is written, if rows on the screen are unknown (first frame,
+        terminal is resized or output below the frame may have
+        scrolled the screen);
+        - diff: changed rows are rewritten in place, rows below
+        the frame (prompts and input of the previous screen) are erased.
+    """
+
+    def __init__(self) -> None:
+        self.rows: list[str] | None = None
+        self.below: int = 0
+        self.size: os.terminal_size | None = None
+
+    def invalidate(self) -> None:
+        """Forget the rows, the next frame is fully redrawn."""
+        self.rows = None
+
+    def draw(self, text: str, size: os.terminal_size) -> str:
+        """
+        Return output drawing the frame over the previous one
+        and remember the frame rows.
+        Cursor is left after the frame, as if the text was printed.
+
+        Args:
+            - **text**: frame text;
+            - **size**: terminal size.
+        """
+        *rows, last_row = text.split('\n')
+        if (
+            self.rows is None
+            or size != self.size
+            or len(self.rows) + self.below >= size.lines
+        ):
+            output: str = CLEAR_SCREEN + text
+        else:
+            changed: list[str] = [
+                f'\x1b[{number};1H\x1b[K{row}'
+                for number, row in enumerate(rows, start=1)
+                if number > len(self.rows) or row != self.rows[number - 1]
+            ]
+            output: str = ''.join(
+                (*changed, f'\x1b[{len(rows) + 1};1H\x1b[J', last_row)
+            )
+
+        is_wrapped: bool = any(len(row) > size.columns for row in rows)
+        self.rows = None if is_wrapped else rows
+        self.size = size
+        self.below = 0
+        return output
+
 
 class ConsoleIO:
     """Interacts with console I/O."""
 
+    def __init__(self) -> None:
+        self.screen: Screen = Screen()
+        self._frame: list[str] | None = None
+
     def clear(self) -> None:
-        """Clearing the terminal."""
+        """
+        Start a new frame, the previous one is replaced
+        when the new one is drawn by `flush`.
+        """
+        self._frame = []
+
+    def flush(self) -> None:
+        """Draw the buffered frame in a single write."""
+        if self._frame is None:
+            return
+
+        text: str = ''.join(self._frame)
+        self._frame = None
+        try:
+            size: os.terminal_size = os.get_terminal_size(
+                sys.stdout.fileno()
+            )
+        except (OSError, ValueError):
+            size = DEFAULT_TERMINAL_SIZE
+            self.screen.invalidate()
+
         if os.name == 'nt':
-            _ = os.system('cls')
-        else:
-            _ = os.system('clear')
+            import colorama
+            colorama.just_fix_windows_console()
+
+        sys.stdout.write(self.screen.draw(text, size))
+        sys.stdout.flush()
 
     def exit(self) -> None:
         """Terminate the program."""
-        self.clear()
+        self._frame = None
+        sys.stdout.write(CLEAR_SCREEN)
+        sys.stdout.flush()
         sys.exit()
 
     def write(self, data: Any) -> None:
-        """Write the data to a stream."""
+        """Write the data to the frame or to a stream."""
+        if self._frame is not None:
+            self._frame.append(f'{data}\n')
+            return
+
         print(data)
+        self.screen.below += str(data).count('\n') + 1
 
     def read(self, prompt: str = '') -> str:
-        """Read a string from input."""
+        """Draw the frame and read a string from input."""
+        self.flush()
+        self.screen.below += 1
         return input(prompt)
 
+    def read_live(
+        self,
+        prompt: str,
+        on_change: Callable[[str], str]
+    ) -> str:
+        """
+        Read a string key by key and print the hint
+        returned by `on_change` below the input after every key.
+        Fall back to the line input if stdin is not a terminal.
+
+        Args:
+            - **prompt**: text before the input;
+            - **on_change**: callable that gets the current input
+            and returns the hint text.
+        """
+        if not sys.stdin.isatty():
+            return self.read(prompt)
+
+        self.flush()
+        self.screen.below += 1
+        text: str = ''
+        while True:
+            hint: str = on_change(text)
+            sys.stdout.write(
+                f'\r\x1b[J{prompt}{text}\n{hint}'
+                f'\x1b[{hint.count(chr(10)) + 1}A'
+                f'\r\x1b[{len(prompt) + len(text)}C'
+            )
+            sys.stdout.flush()
+
+            key: str = self.getch()
+            if key in ('\r', '\n'):
+                sys.stdout.write('\r\x1b[J' + prompt + text + '\n')
+                return text
+
+            if key == '\x03':
+                raise KeyboardInterrupt
+
+            if key in ('\x7f', '\x08'):
+                text = text[:-1]
+            elif key.isprintable():
+                text += key
+
+    def getch(self) -> str:
+        """Read a single key from terminal without echo."""
+        if os.name == 'nt':
+            import msvcrt
+            return msvcrt.getwch()
+
+        import termios
+        import tty
+
+        fd: int = sys.stdin.fileno()
+        settings: list = termios.tcgetattr(fd)
+        try:
+            tty.setraw(fd)
+            key: str = sys.stdin.read(1)
+            if key == '\x1b':
+                sys.stdin.read(2)
+                return ''
+            return key
+        finally:
+            termios.tcsetattr(fd, termios.TCSADRAIN, settings)
+
     def click(self, continue_key: str = 'Press ENTER to continue ') -> None:
         """
         Print a message from argument `continue_key`
@@ -0,0 +1,99 @@
+"""
+Write-ahead journal of Phonebook transactions.
+
+Transaction commit:
+    * journal:
+        - all operations of the transaction and a commit line
+        with their number are written to the journal file
+        and synced to disk;
+    * apply:
+        - operations are applied to the storage, the search index
+        and the text file mirror;
+    * clear:
+        - the journal file is removed.
+
+Journal left by a crash is read on the next start:
+    * committed (ends with a valid commit line):
+        - operations are applied again, saving and removing
+        by ID are idempotent;
+    * torn (crash while writing the journal):
+        - the transaction never committed and is dropped.
+
+Journal is a JSON Lines file, records are stored
+as `ContactRecord.astuple()` lists.
+"""
+import json
+import os
+from pathlib import Path
+
+from .constants import JOURNAL_PATH
+from .models import ContactRecord
+
+
+SAVE: str = 'save'
+
+REMOVE: str = 'remove'
+
+COMMIT: str = 'commit'
+
+
+class Journal:
+    """Journal file of the last transaction."""
+
+    def __init__(self, filename: str | Path = JOURNAL_PATH) -> None:
+        self.filename: Path = Path(filename)
+
+    @property
+    def exists(self) -> bool:
+        """Checking if the journal file exists."""
+        return self.filename.is_file()
+
+    def write(self, operations: list[tuple[str, object]]) -> None:
+        """
+        Write operations and commit line, return after
+        the journal is on disk.
+
+        Args:
+            - **operations**: pairs of `SAVE` and a record
+            or `REMOVE` and a contact ID.
+        """
+        with open(self.filename, 'w', encoding='utf-8') as file:
+            for operation, value in operations:
+                if operation == SAVE:
+                    value = value.astuple()
+                file.write(json.dumps([operation, value], ensure_ascii=False))
+                file.write('\n')
+
+            file.write(json.dumps([COMMIT, len(operations)]))
+            file.write('\n')
+            file.flush()
+            os.fsync(file.fileno())
+
+    def read(self) -> list[tuple[str, object]] | None:
+        """
+        Return operations of committed transaction,
+        None if there is no journal or it's torn.
+        """
+        if not self.exists:
+            return None
+
+        operations: list[tuple[str, object]] = []
+        with open(self.filename, encoding='utf-8') as file:
+            for line in file:
+                try:
+                    operation, value = json.loads(line)
+                except ValueError:
+                    return None
+
+                if operation == COMMIT:
+                    return operations if value == len(operations) else None
+
+                if operation == SAVE:
+                    value = ContactRecord.from_tuple(value)
+                operations.append((operation, value))
+
+        return None
+
+    def clear(self) -> None:
+        """Remove the journal file."""
+        self.filename.unlink(missing_ok=True)
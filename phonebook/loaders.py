@@ -0,0 +1,384 @@
+"""
+Streaming loaders of upload files.
+
+Loaders are registered for file extensions with the `load_handler`
+decorator, `upload_from` picks one with `get_load_handler`:
+    * `.csv`:
+        - rows with a header;
+    * `.json`, `.jsonl`:
+        - top-level array or JSON Lines of objects;
+    * `.vcf`, `.vcard`:
+        - vCard 3.0/4.0 cards, mapped to the contact fields.
+
+Every loader yields dicts of contact fields one by one,
+only the current entry and a read chunk are kept in memory.
+"""
+import codecs
+import csv
+import json
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, BinaryIO, Callable, Iterator
+
+from .constants import READ_CHUNK_SIZE
+
+if TYPE_CHECKING:
+    from tqdm import tqdm
+
+
+LOAD_HANDLERS: dict[str, Callable[[str | Path], Iterator]] = {}
+
+VCARD_SKIPPED_TYPES: set = {'fax', 'pager'}
+
+JSON_MAX_TOKEN: int = len('\\uXXXX')
+
+
+def load_handler(*extensions: str) -> Callable:
+    """
+    Decorator registering the function as loader of files
+    with the extensions, the function is returned as is.
+
+    Args:
+        - **extensions**: file extensions with a leading dot.
+    """
+    def decorator(func: Callable) -> Callable:
+        for extension in extensions:
+            LOAD_HANDLERS[extension.lower()] = func
+        return func
+
+    return decorator
+
+
+def get_load_handler(filename: str | Path) -> Callable:
+    """
+    Return loader registered for the file extension.
+    Raise ValueError if the extension has no loader.
+    """
+    extension: str = Path(filename).suffix.lower()
+    if extension not in LOAD_HANDLERS:
+        raise ValueError(
+            f'Unsupported file format: {extension or filename}, '
+            f'supported: {", ".join(sorted(LOAD_HANDLERS))}'
+        )
+
+    return LOAD_HANDLERS[extension]
+
+
+@load_handler('.csv')
+def iter_csv(filename: str | Path) -> Iterator[dict]:
+    """
+    Stream rows from csv file one by one.
+    Progress is driven by the number of bytes consumed.
+
+    Args:
+        - **filename**: name of file or path to file.
+    """
+    with open(filename, 'rb') as file, _progress(filename) as progress:
+        yield from csv.DictReader(_iter_lines(file, progress))
+
+
+@load_handler('.json', '.jsonl')
+def iter_json(filename: str | Path) -> Iterator[Any]:
+    """
+    Stream entries from json file one by one.
+    Supports both a top-level array and JSON Lines.
+    Progress is driven by the number of bytes consumed.
+
+    Args:
+        - **filename**: name of file or path to file.
+    """
+    with open(filename, 'rb') as file, _progress(filename) as progress:
+        yield from _iter_json_values(_iter_chunks(file, progress))
+
+
+@load_handler('.vcf', '.vcard')
+def iter_vcf(filename: str | Path) -> Iterator[dict]:
+    """
+    Stream contacts from vCard 3.0/4.0 file one by one.
+    Folded lines are joined, N, FN, ORG and TEL properties
+    are mapped to the contact fields (see `_card_row`),
+    other properties are skipped.
+    Progress is driven by the number of bytes consumed.
+
+    Args:
+        - **filename**: name of file or path to file.
+    """
+    with open(filename, 'rb') as file, _progress(filename) as progress:
+        yield from _iter_cards(_unfold(_iter_lines(file, progress)))
+
+
+def _progress(filename: str | Path) -> 'tqdm':
+    """
+    Return progress bar sized by file length in bytes.
+    tqdm is imported here, only uploads need it.
+    """
+    from tqdm import tqdm
+
+    return tqdm(
+        total=os.path.getsize(filename),
+        unit='B',
+        unit_scale=True,
+        unit_divisor=1024
+    )
+
+
+def _iter_lines(file: BinaryIO, progress: 'tqdm') -> Iterator[str]:
+    """Yield decoded lines of binary file and update progress."""
+    for line in file:
+        progress.update(len(line))
+        yield line.decode('utf-8')
+
+
+def _iter_chunks(file: BinaryIO, progress: 'tqdm') -> Iterator[str]:
+    """Yield decoded chunks of binary file and update progress."""
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    while chunk := file.read(READ_CHUNK_SIZE):
+        progress.update(len(chunk))
+        yield decoder.decode(chunk)
+
+    yield decoder.decode(b'', final=True)
+
+
+def _iter_json_values(chunks: Iterator[str]) -> Iterator[Any]:
+    """
+    Incremental json parser.
+    Only the current value and the unread tail of the last chunk
+    are kept in memory.
+
+    If the first value is an array its items are yielded,
+    otherwise values separated by whitespace (JSON Lines) are yielded.
+    A value is read further only if it may be cut by the chunk end,
+    malformed json raises `ValueError` with its byte offset at once.
+    """
+    decoder = json.JSONDecoder()
+    buffer: str = ''
+    pos: int = 0
+    offset: int = 0
+    eof: bool = False
+    is_array: bool | None = None
+
+    while True:
+        while pos < len(buffer) and buffer[pos].isspace():
+            pos += 1
+
+        if pos == len(buffer):
+            if eof:
+                if is_array:
+                    raise ValueError(
+                        f'Unexpected end of json array at byte {offset}'
+                    )
+                return
+
+            offset += len(buffer[:pos].encode())
+            buffer, pos = buffer[pos:], 0
+            chunk: str | None = next(chunks, None)
+            eof = chunk is None
+            buffer += chunk or ''
+            continue
+
+        char: str = buffer[pos]
+        if is_array is None:
+            is_array = char == '['
+            if is_array:
+                pos += 1
+                continue
+
+        if is_array and char in ',]':
+            pos += 1
+            if char == ']':
+                return
+            continue
+
+        try:
+            value, end = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError as exc:
+            if eof or not _is_cut(exc):
+                raise ValueError(
+                    f'Malformed json at byte '
+                    f'{offset + len(buffer[:exc.pos].encode())}: {exc.msg}'
+                ) from None
+            end = len(buffer)
+
+        if end == len(buffer) and not eof:
+            offset += len(buffer[:pos].encode())
+            buffer, pos = buffer[pos:], 0
+            chunk: str | None = next(chunks, None)
+            eof = chunk is None
+            buffer += chunk or ''
+            continue
+
+        pos = end
+        yield value
+
+
+def _is_cut(error: json.JSONDecodeError) -> bool:
+    """
+    Checking that json decoding failed because the value
+    is cut by the end of the buffer: an unterminated string
+    or an error within the longest token (`\\uXXXX`) of the end.
+    """
+    return (
+        error.msg.startswith('Unterminated string')
+        or error.pos >= len(error.doc) - JSON_MAX_TOKEN
+    )
+
+
+def _unfold(lines: Iterator[str]) -> Iterator[str]:
+    """
+    Join folded vCard lines: a line starting with a space or a tab
+    continues the previous one.
+    """
+    current: str | None = None
+    for line in lines:
+        line = line.rstrip('\r\n')
+        if current is not None and line.startswith((' ', '\t')):
+            current += line[1:]
+            continue
+
+        if current is not None:
+            yield current
+        current = line
+
+    if current is not None:
+        yield current
+
+
+def _iter_cards(lines: Iterator[str]) -> Iterator[dict]:
+    """
+    Yield contact fields of every card.
+    Only properties of the current card are kept in memory.
+    """
+    card: list[tuple[str, set[str], str]] | None = None
+    for line in lines:
+        content: tuple[str, set[str], str] | None = _parse_line(line)
+        if content is None:
+            continue
+
+        name, types, value = content
+        if name == 'BEGIN' and value.upper() == 'VCARD':
+            card = []
+        elif card is None:
+            continue
+        elif name == 'END' and value.upper() == 'VCARD':
+            yield _card_row(card)
+            card = None
+        elif name in ('N', 'FN', 'ORG', 'TEL'):
+            card.append(content)
+
+
+def _parse_line(line: str) -> tuple[str, set[str], str] | None:
+    """
+    Return name, lower case types and value of the content line,
+    None if the line isn't a content line.
+    Group prefix of the name is dropped, types are collected
+    from `TYPE` parameters and bare parameters of vCard 2.1 style.
+    """
+    pos: int = line.find(':')
+    if '"' in line[:pos]:
+        quoted: bool = False
+        for pos, char in enumerate(line):
+            if char == '"':
+                quoted = not quoted
+            elif char == ':' and not quoted:
+                break
+        else:
+            pos = -1
+
+    if pos < 0:
+        return None
+
+    name, *params = line[:pos].split(';')
+    types: set[str] = set()
+    for param in params:
+        key, _, param_value = param.rpartition('=')
+        if key.upper() in ('TYPE', ''):
+            types.update(
+                item.strip('"').lower() for item in param_value.split(',')
+            )
+
+    return name.rpartition('.')[2].upper(), types, line[pos + 1:]
+
+
+def _card_row(card: list[tuple[str, set[str], str]]) -> dict:
+    """
+    Return contact fields of the card properties:
+        - N: family, given and additional names are last name,
+        first name and surname, FN is the first name without N;
+        - ORG: organization name is company;
+        - TEL: first number with `cell` type is mobile, first number
+        with `work` type is work, other numbers fill the empty ones,
+        fax and pager numbers are skipped.
+    Empty values are None.
+    """
+    row: dict = {}
+    other_phones: list[str] = []
+    for name, types, value in card:
+        if name == 'N' and 'last_name' not in row:
+            last_name, first_name, surname, *_ = (
+                *_split_components(value), '', '', ''
+            )
+            row['last_name'] = last_name or None
+            row['first_name'] = first_name or None
+            row['surname'] = surname or None
+        elif name == 'FN' and 'full_name' not in row:
+            row['full_name'] = _unescape(value) or None
+        elif name == 'ORG' and 'company' not in row:
+            row['company'] = _split_components(value)[0] or None
+        elif name == 'TEL' and not types & VCARD_SKIPPED_TYPES:
+            phone: str = _unescape(value.removeprefix('tel:').split(';')[0])
+            if 'cell' in types and not row.get('mobile'):
+                row['mobile'] = phone
+            elif 'work' in types and not row.get('work'):
+                row['work'] = phone
+            else:
+                other_phones.append(phone)
+
+    full_name: str | None = row.pop('full_name', None)
+    if not any(row.get(field) for field in ('last_name', 'first_name')):
+        row['first_name'] = full_name
+
+    for field in ('mobile', 'work'):
+        if not row.get(field) and other_phones:
+            row[field] = other_phones.pop(0)
+
+    return row
+
+
+def _split_components(value: str) -> list[str]:
+    """Split structured vCard value by unescaped semicolons."""
+    if '\\' not in value:
+        return value.split(';')
+
+    components: list[str] = []
+    start: int = 0
+    pos: int = 0
+    while pos < len(value):
+        if value[pos] == '\\':
+            pos += 2
+            continue
+        if value[pos] == ';':
+            components.append(_unescape(value[start:pos]))
+            start = pos + 1
+        pos += 1
+
+    components.append(_unescape(value[start:]))
+    return components
+
+
+def _unescape(value: str) -> str:
+    """Return vCard text value with escaped chars replaced."""
+    if '\\' not in value:
+        return value
+
+    chars: list[str] = []
+    escaped: bool = False
+    for char in value:
+        if escaped:
+            chars.append('\n' if char in 'nN' else char)
+            escaped = False
+        elif char == '\\':
+            escaped = True
+        else:
+            chars.append(char)
+
+    return ''.join(chars)
@@ -99,7 +99,8 @@ class RenderManager:
 
         self.render.frame = Frame(
             FrameLabel.MAIN_HEADER,
-            [*FrameLabel.MAIN_FOOTER.values()]
+            [*FrameLabel.MAIN_FOOTER.values()],
+            self._pending_status()
         )
         self.render.contact_list(empty_msg='No Contacts')
 
@@ -115,7 +116,8 @@ class RenderManager:
 
         self.render.frame = Frame(
             FrameLabel.FIND_HEADER,
-            [*FrameLabel.FIND_FOOTER.values()]
+            [*FrameLabel.FIND_FOOTER.values()],
+            self._pending_status()
         )
         self.render.contact_list(empty_msg='No Results')
 
@@ -148,6 +150,14 @@ class RenderManager:
         )
         self.render.create_edit_contact(short_view=True)
 
+    def _pending_status(self) -> str | None:
+        """Return pending writes indicator if there are any."""
+        if not isinstance(self.render.data, dict):
+            return None
+
+        pending: int = self.render.data.get('pending', 0)
+        return FrameLabel.PENDING_WRITES.format(pending) if pending else None
+
     def _render_help_message(self) -> None:
         self.render.frame = Frame(FrameLabel.HELP_HEADER)
         self.render._render_window()
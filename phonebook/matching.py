@@ -0,0 +1,95 @@
+"""
+Substring matching of contacts.
+
+Every record is compiled once into a search text:
+case-folded non-empty field values separated by a newline.
+A query is case-folded once and matched against the search text
+with a single containment test, so a match never crosses
+the bound of two fields.
+
+Duplicates are detected by fingerprints: a fixed-width hash
+of the case-folded values of the fields selected by a bit mask.
+The natural key of a contact is the fingerprint of all its fields.
+"""
+from hashlib import blake2b
+from typing import Iterable
+
+from .models import FIELDS, AnyContact
+
+
+NAME_FIELDS: tuple = ('first_name', 'last_name', 'surname', 'company')
+
+FIELD_SEPARATOR: str = '\n'
+
+ALL_FIELDS_MASK: int = (1 << len(FIELDS)) - 1
+
+
+def search_text(values: Iterable[str | None]) -> str:
+    """Return search text of field values."""
+    return FIELD_SEPARATOR.join(
+        value.casefold() for value in values if value
+    )
+
+
+def record_text(contact: AnyContact) -> str:
+    """Return search text of the contact."""
+    return search_text(getattr(contact, field) for field in FIELDS)
+
+
+def name_tokens(contact: AnyContact) -> set[str]:
+    """Return case-folded words of the name and company fields."""
+    return {
+        token
+        for field in NAME_FIELDS
+        for token in (getattr(contact, field) or '').casefold().split()
+    }
+
+
+def field_mask(contact: AnyContact) -> int:
+    """Return bit mask of the fields with a value (not None)."""
+    return sum(
+        1 << i for i, field in enumerate(FIELDS)
+        if getattr(contact, field) is not None
+    )
+
+
+def fingerprint(contact: AnyContact, mask: int | None = None) -> str:
+    """
+    Return case-folded fingerprint of the contact fields
+    selected by mask, all fields with a value by default.
+    Missing values of selected fields are taken as empty strings.
+    """
+    if mask is None:
+        mask = field_mask(contact)
+
+    canonical: str = '\x1f'.join(
+        f'{i}={(getattr(contact, field) or "").casefold()}'
+        for i, field in enumerate(FIELDS)
+        if mask >> i & 1
+    )
+    return blake2b(canonical.encode(), digest_size=16).hexdigest()
+
+
+def natural_key(contact: AnyContact) -> str:
+    """
+    Return natural key of the contact: fingerprint of all fields,
+    missing values are taken as empty strings.
+    """
+    return fingerprint(contact, ALL_FIELDS_MASK)
+
+
+class Matcher:
+    """Precompiled substring query."""
+
+    __slots__ = ('pattern',)
+
+    def __init__(self, pattern: str) -> None:
+        self.pattern: str = pattern.casefold()
+
+    def __call__(self, text: str) -> bool:
+        """Checking that search text contains the query."""
+        return self.pattern in text
+
+    def match(self, contact: AnyContact) -> bool:
+        """Checking that any contact field contains the query."""
+        return self.pattern in record_text(contact)
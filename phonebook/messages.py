@@ -1,11 +1,40 @@
 from typing import Callable
 
-from .constants import FIRST, LAST, Button
+import colorama
+
+from .constants import FIRST, LAST, FUZZY_PREFIX, PREFIX_LIMIT, Button
+from .indexes import PrefixIndex
 from .ioworkers import console
 from .managers import render
 from .models import TOTAL_FIELDS
 
 
+class ReportState:
+    """Operation report state."""
+
+    DECLINE: str = ''.join(
+        (
+            colorama.Fore.RED,
+            'CHANGES DECLINED',
+            colorama.Fore.RESET,
+        )
+    )
+    ACCEPT: str = ''.join(
+        (
+            colorama.Fore.GREEN,
+            'CHANGES ACCEPTED',
+            colorama.Fore.RESET,
+        )
+    )
+    DONOTHING: str = ''.join(
+        (
+            colorama.Fore.YELLOW,
+            'NO CHANGES APPLIED',
+            colorama.Fore.RESET,
+        )
+    )
+
+
 def _get_numbered_fields(fileds_names: tuple, mode: str) -> str:
     numbered_fields: list = []
     for number, field in zip(range(1, TOTAL_FIELDS + 1), fileds_names):
@@ -88,3 +117,36 @@ def request_action(allowed_options: dict) -> str:
 def print_report(state: str) -> None:
     """Print database interaction report."""
     console.write(state)
+
+
+def search_hint(prefix_index: PrefixIndex, text: str) -> str:
+    """
+    Return live search hint for the last word of the text:
+    name completions and the number of matching contacts.
+    For fuzzy query return similar names instead of completions.
+    """
+    is_fuzzy: bool = text.startswith(FUZZY_PREFIX)
+    query: str = text.removeprefix(FUZZY_PREFIX)
+    words: list[str] = query.split()
+    if not words or query[-1].isspace():
+        return ''
+
+    if is_fuzzy:
+        similar: list[str] = [
+            f'{token} ({distance})'
+            for distance, token in prefix_index.similar(words[-1])
+        ]
+        return (
+            f'  Similar: {", ".join(similar[:PREFIX_LIMIT]) or "-"}\n'
+            f'  Contacts: {len(prefix_index.find_similar(query))}'
+        )
+
+    prefix: str = words[-1]
+    limit: int = PREFIX_LIMIT * 20
+    completions: list[str] = prefix_index.complete(prefix)
+    found: int = len(prefix_index.find(prefix, limit))
+
+    return (
+        f'  Suggestions: {", ".join(completions) or "-"}\n'
+        f'  Contacts: {found}{"+" if found >= limit else ""}'
+    )
@@ -0,0 +1,122 @@
+import csv
+import json
+import os
+from collections import Counter
+from pathlib import Path
+from typing import Iterable
+
+from .constants import CONTACTS_FILE, MIRROR_COMPACT_THRESHOLD
+from .models import FIELDS, AnyContact
+
+
+class CsvMirror:
+    """
+    Incremental text file mirror of the contacts DB.
+
+    Inserted contacts are appended to the csv file.
+    Updated and removed contacts are written as tombstones
+    to the patch log next to it. Compaction applies the log
+    to the csv file once it grows over the threshold
+    and when the application quits.
+    """
+
+    def __init__(
+        self,
+        filename: str | Path = CONTACTS_FILE,
+        *,
+        threshold: int = MIRROR_COMPACT_THRESHOLD
+    ) -> None:
+        self.filename = Path(filename)
+        self.log_filename = self.filename.with_suffix('.log')
+        self.threshold = threshold
+
+    @property
+    def exists(self) -> bool:
+        """Checking if the mirror file exists."""
+        return self.filename.is_file()
+
+    @property
+    def pending(self) -> int:
+        """Number of tombstones waiting for compaction."""
+        if not self.log_filename.is_file():
+            return 0
+
+        with open(self.log_filename, 'r', encoding='utf-8') as log:
+            return sum(1 for _ in log)
+
+    def append(self, contacts: Iterable[AnyContact]) -> None:
+        """Append contacts to the end of the mirror file."""
+        write_header: bool = (
+            not self.exists or not self.filename.stat().st_size
+        )
+        with open(self.filename, 'a', encoding='utf-8', newline='') as f:
+            writer = csv.writer(f)
+            if write_header:
+                writer.writerow(FIELDS)
+
+            writer.writerows(_row(contact) for contact in contacts)
+
+    def discard(self, contacts: Iterable[AnyContact]) -> None:
+        """
+        Write tombstones for contacts to the patch log.
+        Compact the mirror if the log reaches the threshold.
+        """
+        with open(self.log_filename, 'a', encoding='utf-8') as log:
+            for contact in contacts:
+                log.write(json.dumps(_row(contact), ensure_ascii=False))
+                log.write('\n')
+
+        if self.pending >= self.threshold:
+            self.compact()
+
+    def compact(self) -> None:
+        """Apply the patch log to the mirror file and clear the log."""
+        if not self.log_filename.is_file():
+            return
+
+        with open(self.log_filename, 'r', encoding='utf-8') as log:
+            tombstones: Counter = Counter(
+                tuple(json.loads(line)) for line in log
+            )
+
+        if self.exists:
+            temp: Path = self.filename.with_suffix('.tmp')
+            with (
+                open(self.filename, 'r', encoding='utf-8', newline='') as src,
+                open(temp, 'w', encoding='utf-8', newline='') as dst
+            ):
+                reader = csv.reader(src)
+                writer = csv.writer(dst)
+                writer.writerow(next(reader, FIELDS))
+
+                for row in reader:
+                    key: tuple = tuple(row)
+                    if tombstones[key]:
+                        tombstones[key] -= 1
+                        continue
+                    writer.writerow(row)
+
+            os.replace(temp, self.filename)
+
+        os.remove(self.log_filename)
+
+    def rebuild(self, contacts: Iterable[AnyContact]) -> None:
+        """Write the mirror file from scratch and clear the patch log."""
+        temp: Path = self.filename.with_suffix('.tmp')
+        with open(temp, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(FIELDS)
+            writer.writerows(_row(contact) for contact in contacts)
+
+        os.replace(temp, self.filename)
+
+        if self.log_filename.is_file():
+            os.remove(self.log_filename)
+
+
+def _row(contact: AnyContact) -> list[str]:
+    """Return contact fields as csv row."""
+    return [
+        '' if value is None else str(value)
+        for value in (getattr(contact, field) for field in FIELDS)
+    ]
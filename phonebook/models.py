@@ -7,7 +7,7 @@ from .utils import concat_dict_values
 class ContactBaseModel(BaseModel):
     """Base Contact model."""
 
-    _id: int | None = None
+    _id: str | None = None
     first_name: str | None = None
     last_name: str | None = None
     surname: str | None = None
@@ -26,7 +26,7 @@ class ContactBaseModel(BaseModel):
 
             return all(
                 [
-                    other.get(key, '').lower() == this[key].lower()
+                    other.get(key, '').casefold() == this[key].casefold()
                     for key in this
                 ]
             )
@@ -34,8 +34,13 @@ class ContactBaseModel(BaseModel):
         return super().__eq__(other)
 
 
-class Contact(ContactBaseModel):
-    """Contact model."""
+FIELDS: tuple = tuple(ContactBaseModel.model_fields)
+
+
+class ContactViewMixin:
+    """Text views shared by the Contact model and ContactRecord."""
+
+    __slots__ = ()
 
     @property
     def card_view(self) -> str:
@@ -75,10 +80,13 @@ class Contact(ContactBaseModel):
         if self.last_name and self.company:
             return ' '.join([self.last_name, self.company])
 
-        model_as_dict: dict[str, str] = self.model_dump()
-        for field in model_as_dict:
-            if model_as_dict[field]:
-                return model_as_dict[field]
+        for field in FIELDS:
+            if getattr(self, field):
+                return getattr(self, field)
+
+
+class Contact(ContactViewMixin, ContactBaseModel):
+    """Contact model."""
 
     @property
     def is_empty(self) -> bool:
@@ -87,4 +95,123 @@ class Contact(ContactBaseModel):
         )
 
 
+class ContactRecord(ContactViewMixin):
+    """
+    Compact read-only contact for storage, listing, search and export.
+    Holds the contact ID, the field values and the bit mask
+    of the fields set in the Contact model, so conversion
+    to the model and back is lossless.
+    Use `to_contact` to get the model for editing.
+    """
+
+    __slots__ = ('_id', '_fields_set', *FIELDS)
+
+    def __init__(
+        self,
+        contact_id: str | None = None,
+        values: tuple = (),
+        fields_set: int | None = None
+    ) -> None:
+        """
+        Args:
+            - **contact_id**: contact ID;
+            - **values**: field values in the Contact fields order,
+            missing values are None;
+            - **fields_set**: bit mask of the set fields,
+            fields with a value by default.
+        """
+        values = (*values, *(None,) * (len(FIELDS) - len(values)))
+        (
+            self.first_name,
+            self.last_name,
+            self.surname,
+            self.company,
+            self.mobile,
+            self.work,
+        ) = values
+        self._id = contact_id
+        self._fields_set: int = (
+            fields_set if fields_set is not None
+            else sum(
+                1 << i for i, value in enumerate(values) if value is not None
+            )
+        )
+
+    @classmethod
+    def from_contact(cls, contact: Contact) -> 'ContactRecord':
+        """Return record of the Contact model."""
+        fields_set: set[str] = contact.model_fields_set
+        return cls(
+            contact._id,
+            tuple(getattr(contact, field) for field in FIELDS),
+            sum(
+                1 << i for i, field in enumerate(FIELDS)
+                if field in fields_set
+            )
+        )
+
+    @classmethod
+    def from_tuple(cls, data: tuple) -> 'ContactRecord':
+        """Return record from the `astuple` result."""
+        contact_id, fields_set, *values = data
+        return cls(contact_id, values, fields_set)
+
+    def astuple(self) -> tuple:
+        """Return ID, set fields mask and values as a plain tuple."""
+        return (self._id, self._fields_set, *self.values)
+
+    @property
+    def values(self) -> tuple:
+        """Field values in the Contact fields order."""
+        return (
+            self.first_name,
+            self.last_name,
+            self.surname,
+            self.company,
+            self.mobile,
+            self.work,
+        )
+
+    def dump(self, *, exclude_unset: bool = False) -> dict:
+        """
+        Return fields with values like `Contact.model_dump`.
+
+        Args:
+            - **exclude_unset**: key argument - boolean flag
+            to skip fields that were not set.
+        """
+        return {
+            field: value
+            for i, (field, value) in enumerate(zip(FIELDS, self.values))
+            if not exclude_unset or self._fields_set >> i & 1
+        }
+
+    def to_contact(self) -> Contact:
+        """Return Contact model for editing."""
+        contact: Contact = Contact.model_construct(
+            {
+                field for i, field in enumerate(FIELDS)
+                if self._fields_set >> i & 1
+            },
+            **self.dump()
+        )
+        contact._id = self._id
+        return contact
+
+    def __repr__(self) -> str:
+        values: str = ', '.join(
+            f'{field}={value!r}' for field, value in self.dump().items()
+        )
+        return f'{self.__class__.__name__}(_id={self._id!r}, {values})'
+
+
+AnyContact = Contact | ContactRecord
+
 TOTAL_FIELDS: int = len(Contact.model_fields)
+
+
+def to_record(contact: AnyContact) -> ContactRecord:
+    """Return record of the contact, records are returned as is."""
+    if isinstance(contact, ContactRecord):
+        return contact
+    return ContactRecord.from_contact(contact)
@@ -0,0 +1,51 @@
+"""
+Ordering of contacts by name.
+
+Contacts are ordered by a collation key computed once per contact:
+case-folded last name, first name and company, the contact ID
+breaks ties. The same key orders the collation table of the search
+index (see `indexes` module) and the rows of the snapshot.
+
+The contact list of the menu is paged straight from the collation
+index, so writes never update an in-memory list. `ContactList`
+only holds search results: it's sorted once on creation
+and sliced into pages.
+"""
+from typing import Iterable, Iterator
+
+from .models import AnyContact
+
+
+COLLATION_FIELDS: tuple = ('last_name', 'first_name', 'company')
+
+
+def collation_key(contact: AnyContact) -> tuple[str, ...]:
+    """Return sort key of the contact."""
+    return (
+        *(
+            (getattr(contact, field) or '').casefold()
+            for field in COLLATION_FIELDS
+        ),
+        contact._id or '',
+    )
+
+
+class ContactList:
+    """Read-only contacts sorted by collation key."""
+
+    def __init__(self, contacts: Iterable[AnyContact] = ()) -> None:
+        entries: dict[tuple, AnyContact] = {
+            collation_key(contact): contact for contact in contacts
+        }
+        self._contacts: list[AnyContact] = [
+            entries[key] for key in sorted(entries)
+        ]
+
+    def __len__(self) -> int:
+        return len(self._contacts)
+
+    def __iter__(self) -> Iterator[AnyContact]:
+        return iter(self._contacts)
+
+    def __getitem__(self, index: int | slice) -> AnyContact | list[AnyContact]:
+        return self._contacts[index]
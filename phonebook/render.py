@@ -3,15 +3,17 @@ from .constants import (
     FRAME_SIZE,
     FIRST,
     LAST,
-    FIRST_FIELD,
-    LAST_FIELD,
     Button
 )
 from .ioworkers import console
-from .models import Contact
+from .models import TOTAL_FIELDS, Contact
+from .stats import timed
 from .utils import get_eges
 
 
+FIRST_FIELD, *_, LAST_FIELD = range(1, TOTAL_FIELDS + 1)
+
+
 class FrameLabel:
     """Labels for frames."""
 
@@ -52,6 +54,7 @@ class FrameLabel:
         f'[{Button.EDIT}] edit',
         f'[{Button.CANCEL}] cancel',
     )
+    PENDING_WRITES: str = 'Pending writes: {}'
 
 
 class Frame:
@@ -59,15 +62,18 @@ class Frame:
     Frame render.
     Gets a list titles and available options
     for rendering  the frame header and footer.
+    Status is rendered under the footer.
     """
 
     def __init__(
         self,
         titles: list[str] | str | None = None,
-        options: list[str] | str | None = None
+        options: list[str] | str | None = None,
+        status: str | None = None
     ) -> None:
         self.headers: list[str] | str | None = titles
         self.footers: list[str] | str | None = options
+        self.status: str | None = status
 
     def render_header(self) -> None:
         """Render frame header."""
@@ -93,6 +99,8 @@ class Frame:
 
         console.write('\n')
         console.write(footer.center(FRAME_SIZE, FRAME_DESIGN))
+        if self.status:
+            console.write(self.status.rjust(FRAME_SIZE, ' '))
         console.write('\n')
 
 
@@ -118,6 +126,7 @@ class Render:
         console.write(to_render)
         self.frame.render_footer()
 
+    @timed('render.contact_list')
     def contact_list(self, empty_msg: str = '') -> None:
         to_render: list = []
         contacts: list[Contact] = self.data.get('contacts')
@@ -143,6 +152,7 @@ class Render:
 
         self._render_window('\n'.join(to_render))
 
+    @timed('render.create_edit_contact')
     def create_edit_contact(self, short_view: bool = False) -> None:
         to_render: list = []
         contact: Contact = self.data.get('contact')
@@ -188,6 +198,7 @@ class RenderButtons:
         self.buttons = buttons
         self.hide_button = hide_button
 
+    @timed('render.page_changer')
     def page_changer(
         self,
         current_page: int,
@@ -220,6 +231,7 @@ class RenderButtons:
                 {'prev': f'[{Button.PREV}] prev', 'next': self.hide_button}
             )
 
+    @timed('render.save_contact')
     def save_contact(self, contact: Contact) -> None:
         """
         Hides or show the save button depending on
@@ -231,6 +243,7 @@ class RenderButtons:
 
         self.buttons['save'] = f'[{Button.SAVE}] save'
 
+    @timed('render.select_contact')
     def select_contact(self, contacts: list[Contact]) -> None:
         """
         Hides or show the contact selection button depending on
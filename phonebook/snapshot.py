@@ -0,0 +1,357 @@
+"""
+Read-only memory-mapped columnar snapshot of contacts.
+
+Snapshot file layout, version 1:
+    * header:
+        - magic, version, byte order, number of rows;
+        - stamp of the storage the snapshot was written from;
+        - directory: position and size of every section.
+    * sections:
+        - set fields mask and present values mask, 1 byte per row;
+        - for the ID, every field and the search text:
+        offsets array (N + 1 unsigned 4-byte ints, native byte order)
+        and UTF-8 data of all rows.
+
+Rows are sorted by name (see `ordering.collation_key`),
+so a page of the contact list is a range of rows.
+Search texts (see `matching.record_text`) are terminated by NUL,
+substring search scans the mapped search column with `mmap.find`
+and maps a hit to its row by binary search in the offsets.
+Offsets are used as zero-copy views of the mapped file.
+
+Every write of the Phonebook marks the snapshot stale
+with a marker file next to it, stale snapshot is not read.
+The snapshot is written again after writes calm down,
+see `Debouncer`.
+"""
+import mmap
+import os
+import struct
+import sys
+import threading
+from array import array
+from bisect import bisect_right
+from pathlib import Path
+from typing import Callable, Iterable
+
+from .backends import Session
+from .constants import SNAPSHOT_PATH
+from .matching import Matcher, record_text
+from .models import FIELDS, ContactRecord
+from .ordering import collation_key
+
+
+MAGIC: bytes = b'PBSNAP'
+
+VERSION: int = 1
+
+BYTE_ORDERS: tuple = ('little', 'big')
+
+COLUMNS: tuple = ('_id', *FIELDS, 'search')
+
+HEADER: struct.Struct = struct.Struct('<6sHBIH')
+
+SECTION: struct.Struct = struct.Struct('<QQ')
+
+TERMINATOR: bytes = b'\0'
+
+
+class SnapshotView:
+    """Rows of the mapped snapshot file."""
+
+    def __init__(self, buffer: mmap.mmap) -> None:
+        magic, version, byte_order, rows, stamp_size = HEADER.unpack_from(
+            buffer
+        )
+        if (
+            magic != MAGIC
+            or version != VERSION
+            or BYTE_ORDERS[byte_order] != sys.byteorder
+        ):
+            raise ValueError('Unsupported snapshot file')
+
+        self.buffer = buffer
+        self.rows: int = rows
+        position: int = HEADER.size + stamp_size
+        self.stamp: str = buffer[HEADER.size:position].decode()
+
+        directory: list[tuple[int, int]] = [
+            SECTION.unpack_from(buffer, position + i * SECTION.size)
+            for i in range(2 + 2 * len(COLUMNS))
+        ]
+        memory: memoryview = memoryview(buffer)
+        self._views: list[memoryview] = [
+            memory[begin:begin + size] for begin, size in directory
+        ]
+        self._fields_set: memoryview = self._views[0]
+        self._present: memoryview = self._views[1]
+        self._offsets: list[memoryview] = [
+            offsets.cast('I') for offsets in self._views[2::2]
+        ]
+        self._data: list[int] = [begin for begin, _ in directory[3::2]]
+        memory.release()
+
+    def record(self, row: int) -> ContactRecord:
+        """Return contact record of the row."""
+        present: int = self._present[row]
+        values: list[str | None] = [
+            self._value(column, row) if present >> column & 1 else None
+            for column in range(len(COLUMNS) - 1)
+        ]
+        return ContactRecord(values[0], values[1:], self._fields_set[row])
+
+    def page(self, offset: int, limit: int) -> list[ContactRecord]:
+        """Return records of rows in the range."""
+        return [
+            self.record(row)
+            for row in range(offset, min(offset + limit, self.rows))
+        ]
+
+    def find_all(self, pattern: str) -> list[ContactRecord]:
+        """
+        Return records with search text containing the pattern,
+        all records for an empty pattern.
+        """
+        needle: bytes = Matcher(pattern).pattern.encode()
+        if not needle:
+            return self.page(0, self.rows)
+
+        offsets: memoryview = self._offsets[-1]
+        begin: int = self._data[-1]
+        end: int = begin + offsets[self.rows]
+
+        found: list[ContactRecord] = []
+        position: int = self.buffer.find(needle, begin, end)
+        while position != -1 and position < end:
+            row: int = bisect_right(offsets, position - begin) - 1
+            found.append(self.record(row))
+            position = self.buffer.find(
+                needle, begin + offsets[row + 1], end
+            )
+        return found
+
+    def release(self) -> None:
+        """Release views of the buffer so it can be closed."""
+        for view in (*self._offsets, *self._views):
+            view.release()
+
+    def _value(self, column: int, row: int) -> str:
+        """Return value of the column in the row."""
+        offsets: memoryview = self._offsets[column]
+        begin: int = self._data[column]
+        return self.buffer[
+            begin + offsets[row]:begin + offsets[row + 1]
+        ].decode()
+
+
+class Snapshot(Session):
+    """
+    Memory-mapped snapshot file.
+    Use as a context manager to keep the file mapped
+    for many reads.
+    """
+
+    def __init__(self, filename: str | Path = SNAPSHOT_PATH) -> None:
+        super().__init__(filename)
+        self.stale_filename = Path(filename).with_suffix('.stale')
+
+    def _open(self) -> SnapshotView:
+        with open(self.filename, 'rb') as file:
+            buffer: mmap.mmap = mmap.mmap(
+                file.fileno(), 0, access=mmap.ACCESS_READ
+            )
+        return SnapshotView(buffer)
+
+    def _close(self, db: SnapshotView) -> None:
+        db.release()
+        db.buffer.close()
+
+    def commit(self) -> None:
+        pass
+
+    @property
+    def exists(self) -> bool:
+        """Checking if the snapshot file exists."""
+        return os.path.isfile(self.filename)
+
+    def is_fresh(self, storage_uri: str) -> bool:
+        """
+        Checking that snapshot was written from the storage
+        and the storage wasn't changed since then.
+        """
+        if not self.exists or os.path.exists(self.stale_filename):
+            return False
+
+        try:
+            with self._session() as db:
+                return db.stamp == storage_uri
+        except (OSError, ValueError, struct.error):
+            return False
+
+    def mark_stale(self) -> None:
+        """Mark snapshot as outdated by the changed storage."""
+        with open(self.stale_filename, 'w') as marker:
+            marker.write(os.urandom(8).hex())
+
+    def stale_token(self) -> str | None:
+        """Return content of the stale marker if any."""
+        try:
+            with open(self.stale_filename) as marker:
+                return marker.read()
+        except FileNotFoundError:
+            return None
+
+    def write(
+        self,
+        contacts: Iterable[ContactRecord],
+        storage_uri: str,
+        *,
+        token: str | None
+    ) -> bool:
+        """
+        Write snapshot of the contacts.
+        Snapshot stays stale and False is returned
+        if the storage was changed since the token was read:
+        every write of the storage replaces the stale token
+        (see `mark_stale`), even if there's no snapshot yet.
+
+        Args:
+            - **contacts**: all contacts of the storage;
+            - **storage_uri**: backend name and path of the storage;
+            - **token**: key argument - stale token read
+            before the contacts were loaded, see `stale_token`.
+        """
+        temp: Path = Path(self.filename).with_suffix('.tmp')
+        _write_file(temp, contacts, storage_uri)
+
+        if self.stale_token() != token:
+            os.remove(temp)
+            return False
+
+        os.replace(temp, self.filename)
+        if token is not None:
+            self._clear_stale(token)
+        return True
+
+    def __len__(self) -> int:
+        with self._session() as db:
+            return db.rows
+
+    def page(self, offset: int, limit: int) -> list[ContactRecord]:
+        """
+        Return contacts sorted by name.
+
+        Args:
+            - **offset**: number of contacts to skip;
+            - **limit**: maximum number of contacts.
+        """
+        with self._session() as db:
+            return db.page(offset, limit)
+
+    def find_all(self, pattern: str) -> list[ContactRecord]:
+        """Return contacts with any field containing pattern."""
+        with self._session() as db:
+            return db.find_all(pattern)
+
+    def _clear_stale(self, token: str) -> None:
+        """
+        Remove the stale marker if it still has the token.
+        The marker is moved aside first, so a write marking
+        the snapshot stale meanwhile isn't lost.
+        """
+        claimed: Path = Path(self.stale_filename).with_suffix('.claimed')
+        try:
+            os.replace(self.stale_filename, claimed)
+        except FileNotFoundError:
+            return
+
+        with open(claimed) as marker:
+            is_same: bool = marker.read() == token
+
+        if is_same:
+            os.remove(claimed)
+        else:
+            os.replace(claimed, self.stale_filename)
+
+
+class Debouncer:
+    """
+    Delayed call that is postponed by every new schedule,
+    so it runs once after the calls calm down.
+    Calls run in a daemon thread.
+    """
+
+    def __init__(self, delay: float) -> None:
+        self.delay = delay
+        self._timer: threading.Timer | None = None
+        self._lock = threading.Lock()
+
+    def schedule(self, func: Callable[[], object]) -> None:
+        """Run func after delay unless scheduled again."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(self.delay, func)
+            self._timer.daemon = True
+            self._timer.start()
+
+
+def _write_file(
+    filename: Path,
+    contacts: Iterable[ContactRecord],
+    storage_uri: str
+) -> None:
+    """Write snapshot file of the contacts sorted by name."""
+    records: list[ContactRecord] = sorted(contacts, key=collation_key)
+    columns: list[tuple[array, bytearray]] = [
+        (array('I', [0]), bytearray()) for _ in COLUMNS
+    ]
+    fields_set: bytearray = bytearray()
+    present: bytearray = bytearray()
+
+    for record in records:
+        values: tuple = (record._id, *record.values)
+        mask: int = 0
+        for column, value in enumerate(values):
+            offsets, data = columns[column]
+            if value is not None:
+                mask |= 1 << column
+                data += value.encode()
+            offsets.append(len(data))
+
+        offsets, data = columns[-1]
+        data += record_text(record).encode() + TERMINATOR
+        offsets.append(len(data))
+
+        present.append(mask)
+        fields_set.append(record._fields_set)
+
+    sections: list[bytes] = [fields_set, present]
+    for offsets, data in columns:
+        sections += [offsets.tobytes(), data]
+
+    stamp: bytes = storage_uri.encode()
+    position: int = HEADER.size + len(stamp) + SECTION.size * len(sections)
+    directory: bytearray = bytearray()
+    for section in sections:
+        position += -position % 8
+        directory += SECTION.pack(position, len(section))
+        position += len(section)
+
+    with open(filename, 'wb') as file:
+        file.write(
+            HEADER.pack(
+                MAGIC,
+                VERSION,
+                BYTE_ORDERS.index(sys.byteorder),
+                len(records),
+                len(stamp)
+            )
+        )
+        file.write(stamp)
+        file.write(directory)
+        for section in sections:
+            file.write(bytes(-file.tell() % 8))
+            file.write(section)
+        file.flush()
+        os.fsync(file.fileno())
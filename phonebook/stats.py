@@ -0,0 +1,165 @@
+"""
+Opt-in instrumentation of the Phonebook hot paths.
+
+Instrumentation is disabled by default and turned on
+with the `--stats` or `--stats-file` command line keys:
+    * timings:
+        - functions decorated with `timed` record the number
+        of calls, total time and a sample of latencies
+        for percentiles;
+        - sample is a reservoir of `STATS_SAMPLE_SIZE` latencies
+        per name, so memory doesn't grow with the session.
+    * counters:
+        - `stats.count` adds up records scanned, cache hits etc.
+
+Disabled instrumentation costs a single attribute check per call.
+Report is printed or written to a JSON file on exit.
+"""
+import atexit
+import json
+import random
+import time
+from functools import wraps
+from pathlib import Path
+from typing import Callable
+
+from .constants import STATS_SAMPLE_SIZE
+from .ioworkers import console
+
+
+PERCENTILES: tuple = (50, 90, 99)
+
+
+class Stats:
+    """Timings and counters of instrumented calls."""
+
+    def __init__(self, sample_size: int = STATS_SAMPLE_SIZE) -> None:
+        self.enabled: bool = False
+        self.sample_size = sample_size
+        self._calls: dict[str, int] = {}
+        self._totals: dict[str, float] = {}
+        self._samples: dict[str, list[float]] = {}
+        self._counters: dict[str, int] = {}
+        self._random: random.Random = random.Random(0)
+
+    def add_timing(self, name: str, seconds: float) -> None:
+        """Record latency of a call."""
+        calls: int = self._calls.get(name, 0) + 1
+        self._calls[name] = calls
+        self._totals[name] = self._totals.get(name, 0.0) + seconds
+
+        sample: list[float] = self._samples.setdefault(name, [])
+        if len(sample) < self.sample_size:
+            sample.append(seconds)
+            return
+
+        position: int = self._random.randrange(calls)
+        if position < self.sample_size:
+            sample[position] = seconds
+
+    def count(self, name: str, value: int = 1) -> None:
+        """Add value to the counter if instrumentation is enabled."""
+        if self.enabled:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def report(self) -> dict:
+        """Return timings in milliseconds and counters."""
+        timings: dict[str, dict] = {}
+        for name in sorted(self._calls):
+            sample: list[float] = sorted(self._samples[name])
+            timing: dict = {
+                'calls': self._calls[name],
+                'total_ms': self._totals[name] * 1e3,
+                'mean_ms': self._totals[name] / self._calls[name] * 1e3,
+            }
+            for percentile in PERCENTILES:
+                position: int = min(
+                    len(sample) - 1, len(sample) * percentile // 100
+                )
+                timing[f'p{percentile}_ms'] = sample[position] * 1e3
+            timing['max_ms'] = sample[-1] * 1e3
+            timings[name] = timing
+
+        return {
+            'timings': timings,
+            'counters': dict(sorted(self._counters.items())),
+        }
+
+    def clear(self) -> None:
+        """Drop all recorded timings and counters."""
+        self._calls.clear()
+        self._totals.clear()
+        self._samples.clear()
+        self._counters.clear()
+
+
+stats: Stats = Stats()
+
+
+def timed(name: str) -> Callable:
+    """
+    Decorator recording latencies of the function calls
+    under the name if instrumentation is enabled.
+    """
+    def decorator(func: Callable) -> Callable:
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not stats.enabled:
+                return func(*args, **kwargs)
+
+            started: float = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                stats.add_timing(name, time.perf_counter() - started)
+
+        return wrapper
+
+    return decorator
+
+
+def enable(filename: str | Path | None = None) -> None:
+    """
+    Turn instrumentation on and dump report on exit.
+
+    Args:
+        - **filename**: JSON file for the report,
+        report is printed if not passed.
+    """
+    stats.enabled = True
+    atexit.register(dump, filename)
+
+
+def dump(filename: str | Path | None = None) -> None:
+    """Print report or write it to JSON file."""
+    report: dict = stats.report()
+    if filename is not None:
+        with open(filename, 'w', encoding='utf-8') as file:
+            json.dump(report, file, indent=2)
+        return
+
+    console.write(format_report(report))
+
+
+def format_report(report: dict) -> str:
+    """Return report as text table."""
+    columns: tuple = (
+        'calls', 'total_ms', 'mean_ms',
+        *(f'p{percentile}_ms' for percentile in PERCENTILES), 'max_ms',
+    )
+    lines: list[str] = [
+        f'{"timing":<28}' + ''.join(f'{column:>11}' for column in columns)
+    ]
+    for name, timing in report['timings'].items():
+        lines.append(
+            f'{name:<28}{timing["calls"]:>11}'
+            + ''.join(f'{timing[column]:>11.2f}' for column in columns[1:])
+        )
+
+    if report['counters']:
+        lines.append('')
+        lines.append(f'{"counter":<28}{"value":>11}')
+        for name, value in report['counters'].items():
+            lines.append(f'{name:<28}{value:>11}')
+
+    return '\n'.join(lines)
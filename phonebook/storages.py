@@ -1,207 +1,1174 @@
-import csv
-import json
-import shelve
+import atexit
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager, nullcontext
+from hashlib import blake2b
+from itertools import islice
 from pathlib import Path
-from tqdm import tqdm
+from typing import TYPE_CHECKING, Callable, Collection, Iterable, Iterator
 
-from .constants import CONTACTS_FILE, DB_PATH
-from .models import Contact
-from .utils import concat_dict_values, contains
+from .backends import StorageBackend, get_storage, migrate
+from .codec import MAX_LENGTH
+from .constants import (
+    CONTACT_CACHE_SIZE,
+    CONTACT_ID_SIZE,
+    CONTACTS_FILE,
+    FUZZY_DISTANCE,
+    ORDER_BY_NAME,
+    SNAPSHOT_DEBOUNCE,
+    UPLOAD_BATCH_SIZE,
+    USE_SNAPSHOT,
+)
+from .exporters import export
+from .indexes import ContactIndex, DuplicateIndex, PrefixIndex, has_phone
+from .ioworkers import console
+from .journal import REMOVE, SAVE, Journal
+from .loaders import get_load_handler
+from .matching import Matcher, field_mask, natural_key
+from .mirror import CsvMirror
+from .models import (
+    FIELDS,
+    AnyContact,
+    Contact,
+    ContactRecord,
+    to_record,
+)
+from .ordering import collation_key
+from .snapshot import Debouncer, Snapshot
+from .stats import stats, timed
+from .writer import WriteBehind
+from .validators import _validate_phone_number
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future
+
+
+HEX_DIGITS: str = '0123456789abcdef'
+
+
+class ContactCache:
+    """
+    Bounded LRU cache of loaded contacts by ID.
+    Safe to use from the writer thread.
+    """
+
+    def __init__(self, maxsize: int = CONTACT_CACHE_SIZE) -> None:
+        self.maxsize = maxsize
+        self._contacts: OrderedDict[str, ContactRecord] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, contact_id: str) -> ContactRecord | None:
+        """Return cached contact and mark it as recently used."""
+        with self._lock:
+            contact: ContactRecord | None = self._contacts.get(contact_id)
+            if contact is not None:
+                self._contacts.move_to_end(contact_id)
+            return contact
+
+    def put(self, contact: ContactRecord) -> None:
+        """Cache contact, evict the least recently used one if full."""
+        with self._lock:
+            self._contacts[contact._id] = contact
+            self._contacts.move_to_end(contact._id)
+            if len(self._contacts) > self.maxsize:
+                self._contacts.popitem(last=False)
+
+    def discard(self, contact_id: str) -> None:
+        """Drop contact from cache."""
+        with self._lock:
+            self._contacts.pop(contact_id, None)
+
+    def clear(self) -> None:
+        """Drop all contacts from cache."""
+        with self._lock:
+            self._contacts.clear()
 
 
 class BasePhoneBook:
-    """Base model of the Phonebook."""
+    """
+    Base model of the Phonebook.
+    Loaded contacts are cached in LRU cache shared by all instances,
+    every write through the Phonebook invalidates it.
+    Every write also marks the snapshot stale,
+    enabled snapshot is written again after writes calm down.
+    Writes of all instances made in `transaction` are journaled
+    and applied together on commit.
+    Contacts have surrogate IDs: a saved contact keeps its ID
+    on edits, a new one takes the ID of the saved contact
+    with the same natural key or gets a new ID made from
+    its natural key, so the same contacts always get the same IDs.
+    With `write_behind` started writes of all instances are written
+    to DB and search index by the writer thread, reads apply
+    not written writes to what DB and search index return.
+    """
 
-    def __init__(self, contact: Contact | None = None) -> None:
-        self._contact = contact
+    _cache: ContactCache = ContactCache()
+    _refresh: Debouncer = Debouncer(SNAPSHOT_DEBOUNCE)
+    _pending: list[tuple[str, object]] | None = None
+    _writer: WriteBehind | None = None
 
-    def save(
+    def __init__(
         self,
-        filename: str | Path = DB_PATH,
+        contact: Contact | None = None,
         *,
-        flush: bool = True
+        storage: StorageBackend | None = None
     ) -> None:
+        self._contact = contact
+        self._storage: StorageBackend = storage or get_storage()
+        self._index: ContactIndex = ContactIndex()
+        self._mirror: CsvMirror = CsvMirror()
+        self._snapshot: Snapshot = Snapshot()
+        self._journal: Journal = Journal()
+
+    @timed('phonebook.save')
+    def save(self, *, flush: bool = True) -> None:
         """
         Saving Contact object in DB.
-        Flush contacts from DB to text file if `flush` True.
+        Apply the change to text file mirror if `flush` True.
+        In a transaction the change is applied on commit.
 
         Args:
-            - **filename**: name of file or path to file;
             - **flush**: key argument - boolean flag
-            for flush contacts from DB to text file.
+            for apply the change to text file mirror.
         """
-        with shelve.open(filename) as db:
-            self._contact._id = self.__generate_id()
-            db[self._contact._id] = self._contact
+        self._contact._id = self.__generate_id()
+        if self._pending is not None:
+            self._pending.append((SAVE, to_record(self._contact)))
+            return
+
+        if self._writer is not None:
+            self._submit([(SAVE, to_record(self._contact))])
+            return
+
+        replaced: ContactRecord | None = self._storage.save(self._contact)
+        self._cache.discard(self._contact._id)
+        self._index.add([self._contact])
+        self._changed()
 
         if flush:
-            self.flush()
+            if replaced is not None:
+                self._mirror.discard([replaced])
+            self._mirror_append([self._contact])
 
+    @timed('phonebook.load')
     def load(
         self,
-        filename: str | Path = DB_PATH,
         *,
         contact_id: str = None,
         multiple: bool = True
-    ) -> Contact | list:
+    ) -> ContactRecord | list:
         """
         Fetch contacts list from DB.
-        Return single Contact object if multiple flag is False
+        Return single contact record if multiple flag is False
         and passed contact ID (if exists in DB).
 
         Args:
-            - **filename**: name of file or path to file;
             - **contact_id**: key argument - contact ID;
             - **multiple**: key argument - boolean flag
             to fetch all contacts in list.
         """
-        data: list = []
-        with shelve.open(filename) as db:
-            if not multiple:
-                return db.get(contact_id)
+        if not multiple:
+            return self._storage.find(contact_id)
 
-            for key in db:
-                data.append(db[key])
+        contacts: list[ContactRecord] = list(self._storage.load())
+        stats.count('records.loaded', len(contacts))
+        return contacts
 
-        return data
-
-    def flush(
-        self,
-        filename: str | Path = CONTACTS_FILE,
-        *,
-        removed: bool = False
-    ) -> None:
+    @timed('phonebook.flush')
+    def flush(self, filename: str | Path = CONTACTS_FILE) -> None:
         """
-        Flush contacts from DB to text file.
+        Rebuild text file mirror from DB.
         Default path to file taken from constants module.
 
         Args:
-            - **filename**: name of file or path to file;
-            - **removed**: key argument - boolean flag
-            doesn't flush removed contact in to file.
-        """
-        contacts: list[Contact] = self.load()
-        with open(filename, 'w', encoding='utf-8') as f:
-            rows: list[dict] = [
-                contact.model_dump() for contact in contacts
-            ]
-
-            if not removed:
-                row: dict = self._contact.model_dump()
-                if row not in rows:
-                    rows.append(row)
-            else:
-                row: dict = Contact().model_dump()
-
-            writer = csv.DictWriter(f, row.keys())
-            writer.writeheader()
-            writer.writerows(rows)
+            - **filename**: name of file or path to file.
+        """
+        CsvMirror(filename).rebuild(self._storage.load())
+
+    def compact_mirror(self) -> None:
+        """
+        Apply tombstones of edited and removed contacts
+        to text file mirror, see `CsvMirror.compact`.
+        """
+        self._mirror.compact()
+
+    def _mirror_append(self, contacts: list[AnyContact]) -> None:
+        """Append contacts to text file mirror, rebuild it if missing."""
+        if self._mirror.exists:
+            self._mirror.append(contacts)
+        else:
+            self.flush()
 
+    @timed('phonebook.remove')
     def remove(
         self,
-        filename: str | Path = DB_PATH,
         *,
         contact_id: str = None,
         flush: bool = True
     ) -> None:
         """
         Remove contact from DB.
+        In a transaction the change is applied on commit.
 
         Args:
-            - **filename**: name of file or path to file;
             - **contact_id**: key argument - contact ID;
             - **flush**: key argument - boolean flag
-            for flush contacts from DB to text file.
+            for apply the change to text file mirror.
+        """
+        key = self._contact._id if not contact_id else contact_id
+        if self._pending is not None:
+            self._pending.append((REMOVE, key))
+            return
+
+        if self._writer is not None:
+            self._submit([(REMOVE, key)])
+            return
+
+        removed: ContactRecord | None = self._storage.remove(key)
+        self._cache.discard(key)
+        self._index.discard([key])
+        self._changed()
+
+        if flush and removed is not None:
+            self._mirror.discard([removed])
+
+    @contextmanager
+    def transaction(self, *, flush: bool = True) -> Iterator[None]:
+        """
+        Apply saves and removes of all Phonebook instances
+        made in the block together on exit: they are written
+        to the journal first, then to DB, search index
+        and text file mirror of this instance in a single session each.
+        Nothing is applied if the block raises.
+        Reads in the block don't see its pending writes.
+        Nested transactions are part of the outer one.
+
+        Args:
+            - **flush**: key argument - boolean flag
+            for apply the changes to text file mirror.
+        """
+        if BasePhoneBook._pending is not None:
+            yield
+            return
+
+        BasePhoneBook._pending = []
+        try:
+            yield
+            operations: list[tuple[str, object]] = BasePhoneBook._pending
+        finally:
+            BasePhoneBook._pending = None
+
+        if operations and self._writer is not None:
+            self._submit(operations)
+        elif operations:
+            self._commit(operations, flush=flush)
+
+    def write_behind(self) -> WriteBehind:
+        """
+        Start the writer thread: from now on saves and removes
+        of all instances are written to DB, search index,
+        text file mirror and snapshot in background.
+        Reads see not written changes.
+        Pending changes are written on exit.
+        Return the writer, see `stop_write_behind`.
+        """
+        if BasePhoneBook._writer is None:
+            storage: StorageBackend = type(self._storage)(
+                self._storage.filename
+            )
+            writer_book: BasePhoneBook = type(self)(storage=storage)
+            BasePhoneBook._writer = WriteBehind(
+                lambda operations: writer_book._commit(
+                    operations, flush=True
+                )
+            )
+            atexit.register(self.stop_write_behind)
+
+        return BasePhoneBook._writer
+
+    def stop_write_behind(self) -> None:
+        """
+        Write all pending changes to disk and stop the writer thread,
+        writes are applied at once again.
+        """
+        writer: WriteBehind | None = BasePhoneBook._writer
+        if writer is None:
+            return
+
+        BasePhoneBook._writer = None
+        writer.close()
+
+    def pending_writes(self) -> int:
+        """Return the number of changes not written to DB yet."""
+        return self._writer.pending if self._writer is not None else 0
+
+    def _submit(self, operations: list[tuple[str, object]]) -> None:
+        """
+        Queue operations for writing. Search index is updated
+        by the writer after DB, so it never has contacts
+        that a crash leaves out of DB.
+        """
+        self._writer.submit(operations)
+
+    def _written(self, contact_id: str) -> tuple[str, object] | None:
+        """Return the last not written operation of the contact."""
+        if self._writer is None:
+            return None
+        return self._writer.get(contact_id)
+
+    def _not_written(self) -> dict[str, tuple[str, object]]:
+        """Return the last not written operation of every contact."""
+        if self._writer is None:
+            return {}
+        return self._writer.operations()
+
+    def _overlay(
+        self,
+        contact_ids: Iterable[str],
+        operations: dict[str, tuple[str, object]],
+        matches: Callable[[ContactRecord], bool]
+    ) -> list[str]:
         """
-        with shelve.open(filename) as db:
-            key = self._contact._id if not contact_id else contact_id
-            if key in db:
-                del db[key]
+        Apply not written operations to IDs found in search index:
+        IDs of changed contacts are replaced with IDs of saved
+        contacts that match.
 
+        Args:
+            - **contact_ids**: sorted IDs found in search index;
+            - **operations**: not written operations by contact ID;
+            - **matches**: check of a saved contact.
+        """
+        if not operations:
+            return list(contact_ids)
+
+        return sorted([
+            *(
+                contact_id for contact_id in contact_ids
+                if contact_id not in operations
+            ),
+            *(
+                contact_id
+                for contact_id, (operation, value) in operations.items()
+                if operation == SAVE and matches(value)
+            ),
+        ])
+
+    def recover(self) -> int:
+        """
+        Apply transaction committed to the journal before a crash
+        and rebuild text file mirror.
+        Return the number of applied operations.
+        """
+        operations: list[tuple[str, object]] | None = self._journal.read()
+        if operations is not None:
+            self._apply(operations, flush=False)
+            self.flush()
+
+        self._journal.clear()
+        return len(operations or ())
+
+    @timed('phonebook.commit')
+    def _commit(
+        self,
+        operations: list[tuple[str, object]],
+        *,
+        flush: bool
+    ) -> None:
+        """Journal operations, apply them and clear the journal."""
+        self._journal.write(operations)
+        self._apply(operations, flush=flush)
+        self._journal.clear()
+
+    def _apply(
+        self,
+        operations: list[tuple[str, object]],
+        *,
+        flush: bool
+    ) -> None:
+        """
+        Apply operations to DB and search index in a single session
+        each and to text file mirror with a single append.
+        Saved contacts are put to the cache, so reads of them
+        don't wait for DB.
+        Applying the same operations again gives the same result.
+        """
+        saved: list[ContactRecord] = []
+        replaced: list[ContactRecord] = []
+        with self._storage:
+            for operation, value in operations:
+                if operation == SAVE:
+                    old: ContactRecord | None = self._storage.save(value)
+                    saved.append(value)
+                else:
+                    old = self._storage.remove(value)
+                if old is not None:
+                    replaced.append(old)
+            self._storage.commit()
+
+        with self._index:
+            for operation, value in operations:
+                if operation == SAVE:
+                    self._cache.put(value)
+                    self._index.add([value])
+                else:
+                    self._cache.discard(value)
+                    self._index.discard([value])
+
+        self._changed()
         if flush:
-            self.flush(removed=True)
+            if replaced:
+                self._mirror.discard(replaced)
+            if saved:
+                self._mirror_append(saved)
 
-    def upload_from(self, filename: str | Path) -> None:
+    def upload_from(
+        self,
+        filename: str | Path,
+        *,
+        batch_size: int = UPLOAD_BATCH_SIZE,
+        workers: int = 1
+    ) -> None:
         """
-        Loading contacts data from file.
+        Loading contacts data from file
+        with the loader registered for its extension.
 
         Args:
-            - **filename**: name of file or path to file.
+            - **filename**: name of file or path to file;
+            - **batch_size**: key argument - number of rows
+            written to DB per commit;
+            - **workers**: key argument - number of processes
+            that parse and validate rows.
         """
-        ext: str = Path(filename).suffix
-        load_handlers: dict = {
-            '.csv': self.__loader_csv,
-            '.json': self.__loader_json,
-        }
-        load_handlers[ext](filename)
-
-    def __loader_csv(self, filename: str | Path) -> None:
-        """Loader data from csv file."""
-        with open(filename, 'r', encoding='utf-8') as file:
-            for row in tqdm(list(csv.DictReader(file))):
-                self._contact: Contact = _set_contact_fields(row)
-                self.save(flush=False)
-
-    def __loader_json(self, filename: str | Path) -> None:
-        with open(filename, 'rb') as file:
-            for entry in tqdm(json.load(file)):
-                self._contact: Contact = _set_contact_fields(entry)
-                self.save(flush=False)
+        started: float = time.perf_counter()
+        saved, rejected, duplicates = self.bulk_save(
+            get_load_handler(filename)(filename),
+            batch_size=batch_size,
+            workers=workers
+        )
+        elapsed: float = time.perf_counter() - started
+
+        total: int = saved + rejected + duplicates
+        rate: float = total / elapsed if elapsed else 0.0
+        console.write(
+            f'Uploaded {saved} rows, rejected {rejected} rows, '
+            f'skipped {duplicates} duplicates '
+            f'in {elapsed:.2f}s ({rate:.0f} rows/sec)'
+        )
+
+    def bulk_save(
+        self,
+        rows: Iterable[dict],
+        *,
+        batch_size: int = UPLOAD_BATCH_SIZE,
+        workers: int = 1,
+        flush: bool = True
+    ) -> tuple[int, int, int]:
+        """
+        Saving many contacts in DB in a single session.
+        DB is opened once and committed once per batch,
+        contacts are flushed to text file once at the end,
+        also if reading rows fails after some batches are saved.
+        Rows equal to already saved contacts are skipped.
+        Return the number of saved, rejected and duplicate rows.
+
+        Args:
+            - **rows**: iterable of dicts with contact fields;
+            - **batch_size**: key argument - number of rows
+            written to DB per commit;
+            - **workers**: key argument - number of processes
+            that parse and validate rows;
+            - **flush**: key argument - boolean flag
+            for flush contacts from DB to text file.
+        """
+        saved: int = 0
+        rejected: int = 0
+        duplicates: int = 0
+
+        if not self._index.is_built_for(self._storage.uri):
+            self.reindex()
+
+        masks: set[int] = self._index.masks()
+        self._cache.clear()
+        try:
+            with self._storage, self._index:
+                for contacts, invalid in iter_parsed_batches(
+                    rows, batch_size, workers
+                ):
+                    batch: DuplicateIndex = DuplicateIndex()
+                    unique: dict[str, ContactRecord] = {}
+                    for contact in contacts:
+                        if (
+                            contact in batch
+                            or self._index.find_duplicate(contact, masks)
+                        ):
+                            duplicates += 1
+                            continue
+
+                        if contact._id in unique or contact._id in self._index:
+                            contact._id = self._free_id(contact, unique)
+                        batch.add(contact)
+                        unique[contact._id] = contact
+
+                    self._storage.save_many(unique.values())
+                    self._storage.commit()
+                    self._index.add(unique.values())
+                    self._index.commit()
+                    masks.update(map(field_mask, unique.values()))
+                    saved += len(unique)
+                    rejected += invalid
+        finally:
+            self._contact = None
+            self._changed()
+            if flush:
+                self.flush()
+
+        return saved, rejected, duplicates
+
+    def build_snapshot(self) -> int:
+        """
+        Write snapshot of all contacts in DB.
+        Return the number of written contacts,
+        0 if DB was changed during writing.
+        """
+        token: str | None = self._snapshot.stale_token()
+        contacts: list[ContactRecord] = list(self._storage.load())
+        if not self._snapshot.write(
+            contacts, self._storage.uri, token=token
+        ):
+            return 0
+
+        return len(contacts)
+
+    def refresh_snapshot(self) -> None:
+        """
+        Write snapshot again after writes calm down.
+        Snapshot is written in a background thread
+        with its own storage session.
+        """
+        storage: StorageBackend = type(self._storage)(self._storage.filename)
+        self._refresh.schedule(type(self)(storage=storage)._write_snapshot)
+
+    def _write_snapshot(self) -> None:
+        """
+        Write snapshot in background.
+        Snapshot stays stale if writing failed,
+        reads fall back to DB and search index.
+        The failure is counted and reported to stderr.
+        """
+        try:
+            self.build_snapshot()
+        except OSError as exc:
+            stats.count('snapshot.errors')
+            sys.stderr.write(f'Snapshot not written: {exc}\n')
+            console.screen.invalidate()
+
+    def _changed(self) -> None:
+        """
+        Mark snapshot stale after a write to DB.
+        The marker is written even if there's no snapshot yet,
+        so a snapshot being written misses no writes.
+        """
+        self._snapshot.mark_stale()
+
+        if USE_SNAPSHOT:
+            self.refresh_snapshot()
+
+    def snapshot_is_fresh(self) -> bool:
+        """Checking that snapshot has all changes of DB."""
+        return self._snapshot.is_fresh(self._storage.uri)
+
+    def _use_snapshot(self) -> bool:
+        """
+        Checking that reads can be served from the snapshot:
+        it's fresh and there are no pending writes.
+        """
+        return (
+            USE_SNAPSHOT
+            and not self.pending_writes()
+            and self.snapshot_is_fresh()
+        )
 
     def __generate_id(self) -> str:
-        """Generate contact ID."""
-        return concat_dict_values(
-            self._contact.model_dump(exclude_unset=True)
+        """
+        Return ID of the contact: its own ID if it was saved,
+        ID of the saved contact with the same natural key
+        or a new ID.
+        """
+        if self._contact._id:
+            return self._contact._id
+
+        if not self._index.is_built_for(self._storage.uri):
+            self.reindex()
+
+        operations: dict[str, tuple[str, object]] = self._not_written()
+        key: str = natural_key(self._contact)
+        for contact_id, (operation, value) in operations.items():
+            if operation == SAVE and natural_key(value) == key:
+                return contact_id
+
+        return (
+            self._index.find_key(self._contact, operations)
+            or self._free_id(
+                self._contact,
+                {
+                    *operations,
+                    *(
+                        value._id if operation == SAVE else value
+                        for operation, value in self._pending or ()
+                    ),
+                }
+            )
         )
 
+    def _free_id(
+        self,
+        contact: AnyContact,
+        taken: Collection[str] = ()
+    ) -> str:
+        """
+        Return the first ID of the contact (see `new_id`)
+        that isn't indexed and isn't taken.
+
+        Args:
+            - **contact**: contact to identify;
+            - **taken**: IDs given to not indexed contacts.
+        """
+        attempt: int = 0
+        contact_id: str = new_id(contact)
+        while contact_id in taken or contact_id in self._index:
+            attempt += 1
+            contact_id = new_id(contact, attempt)
+        return contact_id
+
     def __str__(self) -> str:
         pass
 
 
 class PhoneBook(BasePhoneBook):
-    """Model of the Phonebook."""
+    """
+    Model of the Phonebook.
+    The contacts list sorted by name is paged with bookmarks:
+    the page number, first and last keys of the last read page
+    are shared by all instances, see `iter_page`.
+    """
+
+    _bookmark: tuple[int, tuple, tuple] | None = None
+
+    def __init__(
+        self,
+        contact: Contact | None = None,
+        *,
+        storage: StorageBackend | None = None
+    ) -> None:
+        super().__init__(contact, storage=storage)
+
+    def find(self, contact_id: str) -> ContactRecord | None:
+        """Find contact by ID and return its record."""
+        found: list[ContactRecord] = self._find_many([contact_id])
+        return found[0] if found else None
+
+    @timed('phonebook.find_all')
+    def find_all(self, pattern: str) -> list[ContactRecord]:
+        """
+        Find contacts by pattern.
+        Matches are found in the search index,
+        only matched contacts are loaded from DB.
+        Fresh snapshot is scanned instead if enabled.
+        """
+        if self._use_snapshot():
+            return self._snapshot.find_all(pattern)
+
+        if not self._index.is_built_for(self._storage.uri):
+            self.reindex()
+
+        operations: dict[str, tuple[str, object]] = self._not_written()
+        return self._find_many(self._overlay(
+            self._index.search(pattern),
+            operations,
+            Matcher(pattern).match
+        ))
+
+    def iter_contacts(
+        self,
+        pattern: str | None = None
+    ) -> Iterator[ContactRecord]:
+        """
+        Stream contacts from DB one by one in a single session.
+        Only contacts containing pattern are loaded if it's passed,
+        they are found in the search index.
+
+        Args:
+            - **pattern**: substring to search.
+        """
+        if pattern is None:
+            yield from self._storage.load()
+            return
+
+        if not self._index.is_built_for(self._storage.uri):
+            self.reindex()
+
+        with self._storage:
+            for contact_id in self._index.search(pattern):
+                contact: ContactRecord | None = self._storage.find(contact_id)
+                if contact is not None:
+                    yield contact
+
+    def export_to(
+        self,
+        filename: str | Path,
+        *,
+        file_format: str | None = None,
+        fields: Iterable[str] | None = None,
+        pattern: str | None = None
+    ) -> int:
+        """
+        Export contacts to file, see `exporters` module.
+        Return the number of exported contacts.
+
+        Args:
+            - **filename**: name of file or path to file,
+            gzip-compressed if it ends with `.gz`;
+            - **file_format**: key argument - one of `EXPORT_FORMATS`,
+            guessed from the file name if None;
+            - **fields**: key argument - contact fields to export,
+            all fields if None;
+            - **pattern**: key argument - export only contacts
+            containing the substring.
+        """
+        started: float = time.perf_counter()
+        total: int = export(
+            self.iter_contacts(pattern),
+            filename,
+            file_format=file_format,
+            fields=fields or FIELDS
+        )
+        elapsed: float = time.perf_counter() - started
+
+        console.write(
+            f'Exported {total} contacts to {filename} in {elapsed:.2f}s'
+        )
+        return total
 
-    def __init__(self, contact: Contact | None = None) -> None:
-        super().__init__(contact)
+    def find_by_phone(
+        self,
+        number: str,
+        *,
+        suffix: int | None = None
+    ) -> list[ContactRecord]:
+        """
+        Find contacts by mobile or work phone number.
+        Numbers are compared as digits only, whatever the formatting.
+
+        Args:
+            - **number**: phone number in any format;
+            - **suffix**: key argument - compare only
+            the last `suffix` digits of the number.
+        """
+        if not self._index.is_built_for(self._storage.uri):
+            self.reindex()
 
-    def find(self, contact_id: str) -> Contact | None:
-        """Find Contact object by ID and return it."""
-        return self.load(contact_id=contact_id, multiple=False)
+        operations: dict[str, tuple[str, object]] = self._not_written()
+        return self._find_many(self._overlay(
+            self._index.find_phone(number, suffix=suffix),
+            operations,
+            lambda contact: has_phone(contact, number, suffix)
+        ))
 
-    def find_all(
+    def find_similar(
         self,
-        pattern: str,
+        text: str,
         *,
-        filename: str | Path = DB_PATH
-    ) -> list[Contact]:
-        """Find contacts by pattern."""
-        with shelve.open(filename) as db:
-            matches: list = [
-                db[key] for key in db
-                if contains([*db[key].model_dump().values()], pattern)
-            ]
-        return matches
+        max_distance: int = FUZZY_DISTANCE,
+        prefix_index: PrefixIndex | None = None
+    ) -> list[ContactRecord]:
+        """
+        Find contacts by name and company words with typos,
+        ranked by edit distance.
+
+        Args:
+            - **text**: words to search;
+            - **max_distance**: key argument - maximum number
+            of edits per word;
+            - **prefix_index**: key argument - already built
+            prefix index, built from search index if not passed.
+        """
+        if prefix_index is None:
+            prefix_index = self.prefix_index()
+
+        return self._find_many(
+            prefix_index.find_similar(text, max_distance)
+        )
+
+    def has_duplicate(self) -> bool:
+        """Checking that DB has a contact equal to the contact."""
+        if not self._index.is_built_for(self._storage.uri):
+            self.reindex()
+
+        operations: dict[str, tuple[str, object]] = self._not_written()
+        saved: DuplicateIndex = DuplicateIndex(
+            value for operation, value in operations.values()
+            if operation == SAVE
+        )
+        return self._contact in saved or self._index.find_duplicate(
+            self._contact, self._index.masks(), operations
+        ) is not None
+
+    def prefix_index(self) -> PrefixIndex:
+        """Return in-memory prefix index of name tokens."""
+        if not self._index.is_built_for(self._storage.uri):
+            self.reindex()
+
+        operations: dict[str, tuple[str, object]] = self._not_written()
+        prefix_index: PrefixIndex = PrefixIndex(
+            (token, contact_id)
+            for token, contact_id in self._index.name_tokens()
+            if contact_id not in operations
+        )
+        for operation, value in operations.values():
+            if operation == SAVE:
+                prefix_index.add(value)
+        return prefix_index
+
+    def _find_many(self, contact_ids: list[str]) -> list[ContactRecord]:
+        """
+        Load contacts by IDs, not written changes are applied,
+        missing in cache ones are loaded in a single DB session.
+        """
+        found: dict[str, ContactRecord] = {}
+        removed: set[str] = set()
+        for contact_id in contact_ids:
+            written: tuple[str, object] | None = self._written(contact_id)
+            if written is not None:
+                operation, value = written
+                if operation == SAVE:
+                    found[contact_id] = value
+                else:
+                    removed.add(contact_id)
+
+        hits: int = 0
+        for contact_id in contact_ids:
+            if contact_id in found or contact_id in removed:
+                continue
+
+            contact: ContactRecord | None = self._cache.get(contact_id)
+            if contact is not None:
+                found[contact_id] = contact
+                hits += 1
+
+        missing: list[str] = [
+            contact_id for contact_id in contact_ids
+            if contact_id not in found and contact_id not in removed
+        ]
+        stats.count('cache.hits', hits)
+        stats.count('storage.reads', len(missing))
+        if missing:
+            with self._storage:
+                for contact_id in missing:
+                    contact = self._storage.find(contact_id)
+                    if contact is not None:
+                        found[contact_id] = contact
+                        self._cache.put(contact)
 
+        return [
+            found[contact_id] for contact_id in contact_ids
+            if contact_id in found
+        ]
+
+    def reindex(self) -> None:
+        """Rebuild search indexes from DB."""
+        self._index.rebuild(self._storage.load(), self._storage.uri)
+
+    def iter_page(
+        self,
+        page: int,
+        per_page: int,
+        order: str | None = None
+    ) -> list[ContactRecord]:
+        """
+        Return contacts of the page, pages start from 1.
+        Only contacts of the page are loaded from DB.
+        Pages sorted by name next to the last read one
+        are sought from its bookmark in search index.
+
+        Args:
+            - **page**: page number;
+            - **per_page**: number of contacts per page;
+            - **order**: `ORDER_BY_NAME` to sort contacts by name
+            with the snapshot or the search index,
+            storage order if None.
+        """
+        if order is None:
+            return self._storage.iter_page(page, per_page)
+
+        if order != ORDER_BY_NAME:
+            raise ValueError(f'Unknown contacts order: {order}')
+
+        if self._use_snapshot():
+            PhoneBook._bookmark = None
+            return self._snapshot.page((page - 1) * per_page, per_page)
+
+        if not self._index.is_built_for(self._storage.uri):
+            self.reindex()
+
+        keys: list[tuple[str, ...]] = self._page_keys(page, per_page)
+        PhoneBook._bookmark = (page, keys[0], keys[-1]) if keys else None
+        return self._find_many([key[-1] for key in keys])
+
+    def _page_keys(self, page: int, per_page: int) -> list[tuple[str, ...]]:
+        """
+        Return collation keys of the page from search index
+        with not written operations applied.
+        The page is found from the bookmark of the last read page:
+        the same page starts at its first key, the next one
+        after its last key and the previous one before its first key.
+        Other pages are found by position.
+
+        Args:
+            - **page**: page number;
+            - **per_page**: number of contacts per page.
+        """
+        operations: dict[str, tuple[str, object]] = self._not_written()
+        saved: list[tuple[str, ...]] = sorted(
+            collation_key(value) for operation, value in operations.values()
+            if operation == SAVE
+        )
+        bookmark: tuple | None = self._bookmark
+        if page == 1:
+            return sorted([
+                *self._index.after(None, per_page, operations),
+                *saved,
+            ])[:per_page]
+
+        if bookmark is not None and bookmark[0] in (page, page - 1):
+            key: tuple[str, ...] = bookmark[1 if bookmark[0] == page else 2]
+            inclusive: bool = bookmark[0] == page
+            return sorted([
+                *self._index.after(
+                    key, per_page, operations, inclusive=inclusive
+                ),
+                *(
+                    saved_key for saved_key in saved
+                    if saved_key > key or (inclusive and saved_key == key)
+                ),
+            ])[:per_page]
+
+        if bookmark is not None and bookmark[0] == page + 1:
+            keys: list[tuple[str, ...]] = sorted([
+                *self._index.before(bookmark[1], per_page, operations),
+                *(saved_key for saved_key in saved if saved_key < bookmark[1]),
+            ])[-per_page:]
+            if len(keys) == per_page:
+                return keys
+
+        offset: int = (page - 1) * per_page
+        if not saved:
+            return self._index.collation_page(offset, per_page, operations)
+
+        return sorted([
+            *self._index.collation_page(0, offset + per_page, operations),
+            *saved,
+        ])[offset:offset + per_page]
+
+    def count(self) -> int:
+        """Return the number of contacts in DB."""
+        if self._use_snapshot():
+            return len(self._snapshot)
+
+        return len(self._storage)
+
+    def migrate_from(self, backend: str) -> int:
+        """
+        Copy all contacts from another storage backend.
+        Return the number of copied contacts.
+
+        Args:
+            - **backend**: name of the source backend.
+        """
+        total: int = migrate(get_storage(backend), self._storage)
+        self._cache.clear()
+        self._changed()
+        self.reindex()
+        self.flush()
+        return total
+
+    def upgrade_db(self) -> tuple[int, int]:
+        """
+        Rewrite contacts stored in a format of earlier versions
+        in the current one and replace IDs of earlier versions,
+        made of the contact fields, with surrogate IDs.
+        Return the number of rewritten contacts and replaced IDs.
+        """
+        upgraded: int = self._storage.upgrade()
+        self._cache.clear()
+        if upgraded:
+            self._changed()
+        return upgraded, self._replace_legacy_ids()
+
+    def _replace_legacy_ids(
+        self,
+        batch_size: int = UPLOAD_BATCH_SIZE
+    ) -> int:
+        """
+        Give contacts with IDs of earlier versions new IDs.
+        Every batch is a transaction, so an interrupted upgrade
+        loses no contacts and is continued by the next run.
+        Return the number of replaced IDs.
+
+        Args:
+            - **batch_size**: number of contacts per transaction.
+        """
+        legacy: list[ContactRecord] = [
+            contact for contact in self._storage.load()
+            if not is_contact_id(contact._id)
+        ]
+        if legacy and not self._index.is_built_for(self._storage.uri):
+            self.reindex()
+
+        for begin in range(0, len(legacy), batch_size):
+            with self.transaction(flush=False):
+                for contact in legacy[begin:begin + batch_size]:
+                    self.remove(contact_id=contact._id, flush=False)
+                    contact._id = self._free_id(
+                        contact,
+                        {
+                            value._id for operation, value in self._pending
+                            if operation == SAVE
+                        }
+                    )
+                    type(self)(contact, storage=self._storage).save(
+                        flush=False
+                    )
+
+        return len(legacy)
+
+    @timed('phonebook.update')
     def update(self) -> None:
-        """Update Contact data in DB."""
-        old_contact: Contact | None = self.find(self._contact._id)
+        """
+        Update Contact data in DB.
+        Contact keeps its ID and is overwritten in place
+        in a single transaction and a single DB session,
+        DB isn't opened if writes are written behind.
+        """
+        session = nullcontext() if self._writer else self._storage
+        with session, self.transaction():
+            old_contact: ContactRecord | None = self.find(self._contact._id)
 
-        if not old_contact:
-            raise KeyError(
-                f'Contact with ID: {self._contact._id} doesn\'t exists'
-            )
+            if not old_contact:
+                raise KeyError(
+                    f'Contact with ID: {self._contact._id} doesn\'t exists'
+                )
 
-        self.remove(contact_id=old_contact._id, flush=False)
-        self.save()
+            self.save()
 
 
-def _set_contact_fields(data: dict) -> Contact:
-    """Returns the Contact model with the fields filled in."""
-    return Contact(
-        first_name=data.get('first_name'),
-        last_name=data.get('last_name'),
-        surname=data.get('surname'),
-        company=data.get('company'),
-        mobile=data.get('mobile'),
-        work=data.get('work')
+def _set_contact_fields(data: dict) -> ContactRecord:
+    """Returns the contact record with all fields set."""
+    return ContactRecord(
+        values=tuple(data.get(field) for field in FIELDS),
+        fields_set=(1 << len(FIELDS)) - 1
     )
+
+
+def new_id(contact: AnyContact, attempt: int = 0) -> str:
+    """
+    Return contact ID of fixed width: hash of the natural key
+    of the contact and the number of the attempt,
+    the next attempt is made if the ID is already taken.
+    """
+    key: str = natural_key(contact)
+    if attempt:
+        key = f'{key}:{attempt}'
+    return blake2b(key.encode(), digest_size=CONTACT_ID_SIZE).hexdigest()
+
+
+def is_contact_id(key: str) -> bool:
+    """
+    Checking that key is a surrogate contact ID,
+    not an ID of earlier versions made of the contact fields.
+    """
+    return len(key) == 2 * CONTACT_ID_SIZE and not key.strip(HEX_DIGITS)
+
+
+def parse_rows(rows: list[dict]) -> tuple[list[ContactRecord], int]:
+    """
+    Build and validate contact records from rows.
+    Return contacts with new IDs and the number of rejected rows.
+    Rows that aren't dicts, rows with non-string values,
+    values longer than `MAX_LENGTH` (see `codec` module)
+    or invalid phone numbers are rejected.
+
+    Args:
+        - **rows**: list of dicts with contact fields,
+        other values are rejected.
+    """
+    contacts: list[ContactRecord] = []
+    rejected: int = 0
+    for row in rows:
+        if not isinstance(row, dict) or any(
+            not isinstance(row.get(field), str | None)
+            or len(row.get(field) or '') > MAX_LENGTH
+            for field in FIELDS
+        ):
+            rejected += 1
+            continue
+
+        try:
+            _validate_phone_number(row.get('mobile'))
+            _validate_phone_number(row.get('work'))
+        except ValueError:
+            rejected += 1
+            continue
+
+        contact: ContactRecord = _set_contact_fields(row)
+        contact._id = new_id(contact)
+        contacts.append(contact)
+
+    return contacts, rejected
+
+
+def iter_parsed_batches(
+    rows: Iterable[dict],
+    batch_size: int,
+    workers: int = 1
+) -> Iterator[tuple[list[ContactRecord], int]]:
+    """
+    Split rows into batches and parse them with `parse_rows`.
+    With more than one worker batches are parsed in a process pool,
+    results are yielded in input order.
+
+    Args:
+        - **rows**: iterable of dicts with contact fields;
+        - **batch_size**: number of rows per batch;
+        - **workers**: number of processes, all CPUs if 0.
+    """
+    if batch_size < 1:
+        raise ValueError(f'Batch size must be at least 1, got {batch_size}')
+    if workers < 0:
+        raise ValueError(f'Workers must be at least 0, got {workers}')
+
+    rows = iter(rows)
+    batches: Iterator[list[dict]] = iter(
+        lambda: list(islice(rows, batch_size)), []
+    )
+
+    if workers == 1:
+        yield from map(parse_rows, batches)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    workers = workers or os.cpu_count()
+    with ProcessPoolExecutor(workers) as executor:
+        window: int = 2 * workers
+        pending: deque['Future'] = deque()
+
+        for batch in batches:
+            pending.append(executor.submit(parse_rows, batch))
+            if len(pending) >= window:
+                yield pending.popleft().result()
+
+        while pending:
+            yield pending.popleft().result()
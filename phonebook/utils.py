@@ -1,4 +1,4 @@
-from typing import Any, Iterable
+from typing import Iterable
 
 
 def concat_dict_values(data: dict) -> str:
@@ -8,65 +8,6 @@ def concat_dict_values(data: dict) -> str:
     )
 
 
-def contains(
-    elements: list[str],
-    target: str,
-    *,
-    _sort: bool = False,
-    _unique: bool = False
-) -> bool:
-    """
-    Checking that elements contain a target value using binary search.
-
-    Args:
-        - **elements**: list with str objects inside;
-        - **target**: value to be found in str;
-        - **_sort**: key argument - boolean flag,
-        make sorted list if it's False (default);
-        - **_unique**: key argument - boolean flag,
-        remove duplicates from list if it's False (default).
-    """
-    def binary_search(
-        elements: list[str],
-        target: str,
-        left: int,
-        right: int
-    ) -> bool:
-        if left > right:
-            return False
-
-        middle: int = (left + right) // 2
-
-        element: str = elements[middle].lower()
-
-        if target in element:
-            return True
-
-        if target > element:
-            return binary_search(elements, target, middle + 1, right)
-
-        return binary_search(elements, target, left, middle - 1)
-
-    if not _unique:
-        elements: list = [element for element in elements if element]
-
-    if not _sort:
-        elements.sort()
-
-    return binary_search(elements, target, 0, len(elements) - 1)
-
-
-def remove_item(items: list, value: Any) -> list:
-    """
-    Return a new list without old value.
-
-    Args:
-        - **items**: list object;
-        - **value**: any type that can be compared.
-    """
-    return [item for item in items if item != value]
-
-
 def get_paginate_bound(**data: dict) -> tuple[int, int]:
     """Return slice boundaries."""
     current_page: int = data.get('page')
@@ -82,12 +23,12 @@ def get_paginate_bound(**data: dict) -> tuple[int, int]:
     return 0, per_page
 
 
-def calc_total_pages(items: list, per_page: int) -> int:
+def calc_total_pages(total: int, per_page: int) -> int:
     """
     Return the total number of pages
     based on total items and page size.
     """
-    return (len(items) + per_page - 1) // per_page
+    return (total + per_page - 1) // per_page
 
 
 def get_eges(length: int) -> tuple[int, int]:
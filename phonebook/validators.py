@@ -3,6 +3,9 @@ import re
 from .ioworkers import console
 
 
+RU_MOBILE_TRUNK_PREFIX: str = '89'
+
+
 def _validate_phone_number(value: str) -> str:
     """Validate phone number."""
     pattern = r'^([+]?[\s0-9]+)?(\d{3}|[(]?[0-9]+[)])?([-]?[\s]?[0-9])+$'
@@ -12,6 +15,28 @@ def _validate_phone_number(value: str) -> str:
     return value
 
 
+def normalize_phone(value: str | None) -> str:
+    """
+    Return phone number as digits only.
+    Russian trunk prefix 8 of mobile numbers written without
+    a country code (`8 9xx ...`, 11 digits) is replaced with 7,
+    so `+7 (999) 123-45-67` and `89991234567` are the same number.
+    Numbers of other countries are kept as is.
+    """
+    if not value:
+        return ''
+
+    digits: str = re.sub(r'\D', '', value)
+    if (
+        len(digits) == 11
+        and digits.startswith(RU_MOBILE_TRUNK_PREFIX)
+        and not value.lstrip().startswith('+')
+    ):
+        digits = '7' + digits[1:]
+
+    return digits
+
+
 def validate_field(value: str) -> str:
     """Validate Contact field value."""
     while True:
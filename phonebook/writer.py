@@ -0,0 +1,150 @@
+"""
+Write-behind queue of the Phonebook.
+
+The interactive application doesn't wait for DB writes:
+    * submit:
+        - saves and removes are put in the queue and the call returns,
+        the queue keeps only the last operation of every contact,
+        so consecutive edits of a contact are written once;
+    * writer thread:
+        - takes up to `WRITE_BEHIND_BATCH_SIZE` queued operations
+        and applies them to DB, search index and text file mirror
+        as a single journaled transaction (see `journal` module),
+        so a read waiting for DB waits for one batch at most;
+    * reads:
+        - queued and in-flight operations are applied to the results
+        of DB and search index reads, so the application sees
+        its writes at once (see `PhoneBook._find_many`);
+    * close:
+        - waits until every queued operation is written
+        and stops the thread.
+
+Search index is updated only after DB, so both have the same
+contacts after a crash: queued operations are lost together,
+operations of an interrupted transaction stay in the journal
+and are applied on the next start.
+An error of the writer thread is raised by the next `flush`
+or `close`.
+"""
+import threading
+from itertools import islice
+from typing import Callable
+
+from .constants import WRITE_BEHIND_BATCH_SIZE
+from .journal import SAVE
+
+
+class WriteBehind:
+    """Queue of Phonebook operations served by a writer thread."""
+
+    def __init__(
+        self,
+        apply: Callable[[list[tuple[str, object]]], None],
+        batch_size: int = WRITE_BEHIND_BATCH_SIZE
+    ) -> None:
+        """
+        Args:
+            - **apply**: function writing a list of operations,
+            pairs of `SAVE` and a record or `REMOVE` and a contact ID;
+            - **batch_size**: maximum number of operations
+            written together.
+        """
+        self._apply = apply
+        self.batch_size = batch_size
+        self._queued: dict[str, tuple[str, object]] = {}
+        self._in_flight: dict[str, tuple[str, object]] = {}
+        self._error: BaseException | None = None
+        self._closed: bool = False
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(
+            target=self._run, name='phonebook-writer', daemon=True
+        )
+        self._thread.start()
+
+    @property
+    def pending(self) -> int:
+        """Number of operations not written yet."""
+        with self._condition:
+            return len(self._queued) + len(self._in_flight)
+
+    def submit(self, operations: list[tuple[str, object]]) -> None:
+        """Queue operations, replacing queued ones of the same contacts."""
+        with self._condition:
+            if self._closed:
+                raise RuntimeError('Writer is closed')
+
+            for operation in operations:
+                contact_id: str = _contact_id(operation)
+                self._queued.pop(contact_id, None)
+                self._queued[contact_id] = operation
+            self._condition.notify_all()
+
+    def get(self, contact_id: str) -> tuple[str, object] | None:
+        """Return the last not written operation of the contact."""
+        with self._condition:
+            return (
+                self._queued.get(contact_id)
+                or self._in_flight.get(contact_id)
+            )
+
+    def operations(self) -> dict[str, tuple[str, object]]:
+        """Return the last not written operation of every contact."""
+        with self._condition:
+            return {**self._in_flight, **self._queued}
+
+    def flush(self) -> None:
+        """Wait until all queued operations are written."""
+        with self._condition:
+            self._condition.wait_for(
+                lambda: not self._queued and not self._in_flight
+            )
+            self._raise_error()
+
+    def close(self) -> None:
+        """Write all queued operations and stop the writer thread."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+        self._thread.join()
+        with self._condition:
+            self._raise_error()
+
+    def _run(self) -> None:
+        """Apply queued operations until the writer is closed."""
+        while True:
+            with self._condition:
+                self._condition.wait_for(
+                    lambda: self._queued or self._closed
+                )
+                if not self._queued:
+                    return
+
+                self._in_flight = dict(
+                    islice(self._queued.items(), self.batch_size)
+                )
+                for contact_id in self._in_flight:
+                    del self._queued[contact_id]
+                operations: list = [*self._in_flight.values()]
+
+            try:
+                self._apply(operations)
+            except BaseException as exc:
+                with self._condition:
+                    self._error = self._error or exc
+
+            with self._condition:
+                self._in_flight = {}
+                self._condition.notify_all()
+
+    def _raise_error(self) -> None:
+        """Raise and forget the error of the writer thread."""
+        error, self._error = self._error, None
+        if error is not None:
+            raise error
+
+
+def _contact_id(operation: tuple[str, object]) -> str:
+    """Return ID of the contact the operation writes."""
+    name, value = operation
+    return value._id if name == SAVE else value